@@ -0,0 +1,48 @@
+"""Intraday re-routing on a generated 500-stop plan: a few stops added and cancelled,
+re-solved from the last routes, against a cold solve of the same stops."""
+
+import time
+
+import numpy as np
+
+from routing import IncrementalRouter, generate_vrp
+
+# -------------------------------
+# Plan of the day and changes
+# -------------------------------
+num_stops = 500
+num_depots = 2
+speed = 10.0            # m/s, as generate_vrp
+initial_time_limit = 10
+resolve_time_limit = 0.5
+num_changes = 5         # stops added then cancelled at each step
+num_steps = 3
+
+if __name__ == "__main__":
+    problem, locations = generate_vrp(num_stops, num_depots=num_depots, speed=speed)
+    router = IncrementalRouter(problem, locations, time_scale=1 / speed)
+    solution = router.solve(initial_time_limit)
+    print(f"Initial plan: cost {solution.cost} ({solution.status_name}, {solution.wall_time:.1f}s)")
+
+    rng = np.random.default_rng(1)
+    for step in range(num_steps):
+        opening = rng.integers(3600, 5 * 3600, size=num_changes)
+        added = router.add_stops(rng.uniform(0, 10_000, size=(num_changes, 2)),
+                                 demands=rng.integers(1, 11, size=num_changes),
+                                 time_windows=np.column_stack([opening, opening + 2 * 3600]),
+                                 service_times=np.full(num_changes, 300))
+        stops = problem.stops[router.active[problem.stops]]
+        cancelled = rng.choice(stops, size=num_changes, replace=False).tolist()
+        router.remove_stops(cancelled)
+
+        start = time.perf_counter()
+        solution = router.resolve(resolve_time_limit)
+        warm_time = time.perf_counter() - start
+        print(f"Step {step + 1}: +{added} -{cancelled}")
+        print(f"  warm start: cost {solution.cost} in {warm_time:.2f}s "
+              f"(patched routes {solution.history[0][1] if solution.history else None})")
+
+    # Same stops from scratch, same time
+    start = time.perf_counter()
+    solution = router.solve(resolve_time_limit)
+    print(f"Cold solve:   cost {solution.cost} in {time.perf_counter() - start:.2f}s")
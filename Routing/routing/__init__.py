@@ -0,0 +1,53 @@
+"""Routing front-end over the OR-Tools routing solver, on precomputed NumPy matrices.
+
+    from routing import distance_matrix, solve_tsp
+
+    matrix = distance_matrix(locations)          # (n, n) int64, computed once
+    solution = solve_tsp(matrix, time_limit=10)
+    solution.routes, solution.cost
+
+Capacitated vehicles, time windows and several depots: `VrpProblem` and `solve_vrp`;
+thousands of stops: `solve_clustered` (cluster first, route second, clusters in parallel);
+stops added or cancelled during the day: `IncrementalRouter` (warm start from the last routes).
+Large location sets go through `MatrixStore` (tiled, memory-mapped int32 matrices cached on disk);
+registering a matrix with the solver still costs about 50 bytes per entry (see `register_matrix`).
+"""
+
+from .benchmark import cost_at, generate_vrp, run_vrp_benchmark
+from .cluster import CLUSTER_METHODS, cluster_routes, kmeans_clusters, solve_clustered, sweep_clusters
+from .incremental import IncrementalRouter
+from .matrix import METRICS, distance_matrix, pairwise_distances
+from .solver import RoutingSolution, register_matrix, route_cost, search_parameters, solution_routes
+from .store import STORE_VERSION, MatrixStore, locations_key, submatrix
+from .tsp import solve_tsp, solve_tsp_locations
+from .vrp import VrpModel, VrpProblem, VrpSolution, solve_vrp
+
+__all__ = [
+    "CLUSTER_METHODS",
+    "IncrementalRouter",
+    "METRICS",
+    "MatrixStore",
+    "RoutingSolution",
+    "STORE_VERSION",
+    "VrpModel",
+    "VrpProblem",
+    "VrpSolution",
+    "cluster_routes",
+    "cost_at",
+    "distance_matrix",
+    "generate_vrp",
+    "kmeans_clusters",
+    "locations_key",
+    "pairwise_distances",
+    "register_matrix",
+    "route_cost",
+    "run_vrp_benchmark",
+    "search_parameters",
+    "solution_routes",
+    "solve_clustered",
+    "solve_tsp",
+    "solve_tsp_locations",
+    "solve_vrp",
+    "submatrix",
+    "sweep_clusters",
+]
@@ -0,0 +1,115 @@
+"""Synthetic VRP instances and a benchmark of route cost against wall time.
+
+    problem, locations = generate_vrp(num_stops=500, num_vehicles=50, num_depots=2)
+    for record in run_vrp_benchmark([100, 500, 2000], time_limit=60):
+        print(record["num_stops"], record["cost"], record["costs_at"])
+
+Every record holds the instance size, the model build time, the time to the
+first solution, the final cost, the dropped stops and the cost reached at a
+few checkpoints of the search (`checkpoints`, in seconds), read from the
+improving solutions recorded during the solve.
+"""
+
+import time
+
+import numpy as np
+
+from .matrix import distance_matrix
+from .solver import search_parameters
+from .vrp import VrpModel, VrpProblem
+
+# Seconds at which the best cost so far is reported
+CHECKPOINTS = (1, 2, 5, 10, 30, 60)
+
+
+# ------------------------
+#    Instance generator
+# ------------------------
+
+def generate_vrp(num_stops=100, num_vehicles=None, num_depots=1, seed=0, size=10_000, speed=10.0,
+                 horizon=8 * 3600, window_length=2 * 3600, service_time=300, max_demand=10, capacity_slack=1.2,
+                 drop_penalty=None):
+    """Random VRPTW instance: uniform stops in a `size` x `size` square (metres), depots near the centre.
+
+    Demands are uniform in [1, max_demand]; the vehicles share `capacity_slack`
+    times the total demand. Every stop has a window of `window_length` seconds
+    somewhere in the day, reachable from its depot; travel times are the
+    distances over `speed` (m/s). Returns (VrpProblem, locations), the depots
+    being the first `num_depots` nodes.
+    """
+    rng = np.random.default_rng(seed)
+    num_vehicles = num_vehicles or max(num_stops // 10, 1)
+    depots = size / 2 + rng.normal(0, size / 10, size=(num_depots, 2))
+    locations = np.vstack([depots, rng.uniform(0, size, size=(num_stops, 2))])
+    matrix = distance_matrix(locations)
+    time_matrix = (matrix / speed).astype(np.int64)
+
+    demands = rng.integers(1, max_demand + 1, size=len(locations))
+    demands[:num_depots] = 0
+    capacity = int(np.ceil(demands.sum() * capacity_slack / num_vehicles))
+
+    service_times = np.full(len(locations), service_time)
+    service_times[:num_depots] = 0
+    # Earliest opening: the direct trip from the nearest depot; latest closing: enough time to get back
+    reach = time_matrix[:num_depots, num_depots:].min(axis=0)
+    latest = horizon - reach - service_time - window_length
+    opening = reach + (rng.random(num_stops) * np.maximum(latest - reach, 0)).astype(np.int64)
+    time_windows = np.zeros((len(locations), 2), dtype=np.int64)
+    time_windows[:, 1] = horizon
+    time_windows[num_depots:, 0] = opening
+    time_windows[num_depots:, 1] = np.minimum(opening + window_length, horizon)
+
+    problem = VrpProblem(matrix, demands, np.full(num_vehicles, capacity), time_matrix=time_matrix,
+                         time_windows=time_windows, service_times=service_times, depots=np.arange(num_depots),
+                         horizon=horizon, drop_penalty=drop_penalty)
+    return problem, locations
+
+
+# ------------------------
+#    Benchmark runner
+# ------------------------
+
+def cost_at(history, seconds):
+    """Best cost reached after `seconds` in a [(seconds, cost)] history, None before the first solution."""
+    cost = None
+    for elapsed, value in history:
+        if elapsed > seconds:
+            break
+        cost = value
+    return cost
+
+
+def benchmark_vrp(problem, first_solution_strategy="PATH_CHEAPEST_ARC",
+                  local_search_metaheuristic="GUIDED_LOCAL_SEARCH", time_limit=60.0, checkpoints=CHECKPOINTS):
+    """Builds and solves one instance; returns its record."""
+    start = time.perf_counter()
+    model = VrpModel(problem)
+    build_time = time.perf_counter() - start
+    solution = model.solve(search_parameters(first_solution_strategy, local_search_metaheuristic, time_limit))
+    history = solution.history
+    return {
+        "num_stops": len(problem.stops),
+        "num_vehicles": problem.num_vehicles,
+        "num_depots": len(problem.depot_nodes),
+        "first_solution_strategy": first_solution_strategy,
+        "local_search_metaheuristic": local_search_metaheuristic,
+        "time_limit": time_limit,
+        "status": solution.status_name,
+        "build_time": build_time,
+        "wall_time": solution.wall_time,
+        "first_solution_time": history[0][0] if history else None,
+        "first_cost": history[0][1] if history else None,
+        "cost": solution.cost,
+        "dropped": len(solution.dropped),
+        "costs_at": {seconds: cost_at(history, seconds) for seconds in checkpoints if seconds <= time_limit},
+        "history": history,
+    }
+
+
+def run_vrp_benchmark(sizes=(100, 200, 500, 1000, 2000), num_depots=2, time_limit=60.0, seed=0,
+                      first_solution_strategy="PATH_CHEAPEST_ARC", local_search_metaheuristic="GUIDED_LOCAL_SEARCH",
+                      **instance):
+    """Yields one record per instance size (number of stops); `instance` goes to `generate_vrp`."""
+    for num_stops in sizes:
+        problem, _ = generate_vrp(num_stops, num_depots=num_depots, seed=seed, **instance)
+        yield benchmark_vrp(problem, first_solution_strategy, local_search_metaheuristic, time_limit)
@@ -0,0 +1,200 @@
+"""Cluster first, route second: large VRPs split into small ones solved in parallel.
+
+    solution = solve_clustered(problem, locations, num_clusters=8, cluster_time_limit=5, improve_time_limit=10)
+
+The stops are partitioned (k-means on the locations, or a sweep around the
+depots by angle), every cluster gets a share of the vehicles in proportion to
+its demand, and the clusters are solved as independent `VrpProblem`s in a
+process pool. The stitched routes then seed a short search on the whole
+problem (`ReadAssignmentFromRoutes`), which can move stops across clusters.
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .matrix import pairwise_distances
+from .solver import search_parameters
+from .store import submatrix
+from .vrp import VrpModel, VrpProblem
+
+CLUSTER_METHODS = ("kmeans", "sweep")
+
+
+# ------------------------
+#    Partition of the stops
+# ------------------------
+
+def kmeans_clusters(locations, num_clusters, seed=0, max_iterations=100):
+    """Labels (n,) of a k-means (Lloyd) partition of the locations, seeded by k-means++.
+
+    Labels are consecutive from 0: fewer clusters than asked if some end up
+    empty (duplicate locations).
+    """
+    locations = np.asarray(locations, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    num_clusters = min(num_clusters, len(locations))
+    centroids = [locations[rng.integers(len(locations))]]
+    for _ in range(1, num_clusters):
+        nearest = pairwise_distances(locations, targets=np.array(centroids)).min(axis=1) ** 2
+        # Every location already on a centre (duplicates): uniform draw
+        weights = nearest / nearest.sum() if nearest.sum() > 0 else None
+        centroids.append(locations[rng.choice(len(locations), p=weights)])
+    centroids = np.array(centroids)
+
+    labels = None
+    for _ in range(max_iterations):
+        distances = pairwise_distances(locations, targets=centroids)
+        new_labels = distances.argmin(axis=1)
+        if labels is not None and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for c in range(num_clusters):
+            members = labels == c
+            # An empty cluster takes the location farthest from its centroid
+            centroids[c] = (locations[members].mean(axis=0) if members.any()
+                            else locations[distances[np.arange(len(locations)), labels].argmax()])
+    return np.unique(labels, return_inverse=True)[1]
+
+
+def sweep_clusters(locations, center, num_clusters, weights=None):
+    """Labels (n,) of consecutive angular sectors around `center`, of about equal total `weights` (demand)."""
+    offsets = np.asarray(locations, dtype=np.float64) - np.asarray(center, dtype=np.float64)
+    order = np.argsort(np.arctan2(offsets[:, 1], offsets[:, 0]), kind="stable")
+    weights = np.ones(len(offsets)) if weights is None else np.asarray(weights, dtype=np.float64)
+    cumulative = np.cumsum(weights[order])
+    sectors = np.minimum((cumulative - weights[order]) * num_clusters // cumulative[-1], num_clusters - 1)
+    labels = np.empty(len(offsets), dtype=np.int64)
+    labels[order] = sectors.astype(np.int64)
+    return labels
+
+
+def _vehicle_shares(problem, labels, num_clusters):
+    """Vehicles (global indices) of every cluster: about proportional to its demand, at least one each,
+    the vehicles whose depot is the nearest to the cluster first."""
+    stops = problem.stops
+    demand = np.array([problem.demands[stops[labels == c]].sum() for c in range(num_clusters)], dtype=np.float64)
+    if not demand.any():
+        demand = np.bincount(labels, minlength=num_clusters).astype(np.float64)
+    share = demand / demand.sum() * (problem.num_vehicles - num_clusters)
+    counts = 1 + np.floor(share).astype(np.int64)
+    # Largest remainders get the vehicles left
+    for c in np.argsort(-(share - np.floor(share)), kind="stable")[:problem.num_vehicles - counts.sum()]:
+        counts[c] += 1
+
+    free = list(range(problem.num_vehicles))
+    vehicles = [None] * num_clusters
+    for c in np.argsort(-demand, kind="stable"):
+        members = stops[labels == c]
+        depot_distance = np.asarray(problem.matrix[np.ix_(problem.starts[free], members)]).mean(axis=1)
+        chosen = [free[i] for i in np.argsort(depot_distance, kind="stable")[:counts[c]]]
+        vehicles[c] = sorted(chosen)
+        free = [v for v in free if v not in chosen]
+    return vehicles
+
+
+# ------------------------
+#    Cluster solves
+# ------------------------
+
+def _subproblem(problem, members, vehicles):
+    """(VrpProblem, nodes) of the stops `members` served by `vehicles`; nodes[i] is the global node of local i."""
+    p = problem
+    depots = np.union1d(p.starts[vehicles], p.ends[vehicles])
+    nodes = np.concatenate([depots, members])
+    local = {int(node): i for i, node in enumerate(nodes)}
+    starts = [local[int(node)] for node in p.starts[vehicles]]
+    ends = [local[int(node)] for node in p.ends[vehicles]]
+    sub = VrpProblem(
+        submatrix(p.matrix, nodes), p.demands[nodes], p.capacities[vehicles],
+        time_matrix=None if p.time_matrix is None else submatrix(p.time_matrix, nodes),
+        time_windows=None if p.time_windows is None else p.time_windows[nodes],
+        service_times=p.service_times[nodes], depots=np.column_stack([starts, ends]),
+        max_wait=p.max_wait, horizon=p.horizon, drop_penalty=p.drop_penalty)
+    return sub, nodes
+
+
+def _solve_cluster(sub, nodes, first_solution_strategy, local_search_metaheuristic, time_limit):
+    """Solves one cluster (in a worker process); returns its routes in global nodes, or None."""
+    parameters = search_parameters(first_solution_strategy, local_search_metaheuristic, time_limit)
+    solution = VrpModel(sub).solve(parameters)
+    if not solution.found:
+        return None
+    return [nodes[route].tolist() for route in solution.routes]
+
+
+def cluster_routes(problem, labels, first_solution_strategy="PATH_CHEAPEST_ARC",
+                   local_search_metaheuristic="GUIDED_LOCAL_SEARCH", time_limit=5.0, max_workers=None):
+    """Solves every non-empty cluster of `labels` (one per stop of `problem.stops`) in a process pool.
+
+    Returns the stitched routes, one per vehicle of `problem` (depots
+    included), and the clusters without solution. The stops of a cluster
+    without solution are in no route. Every cluster needs a vehicle: raises
+    ValueError if there are more (non-empty) clusters than vehicles.
+    """
+    # Empty clusters (labels without any stop) are dropped, so that every cluster has stops
+    labels = np.unique(labels, return_inverse=True)[1]
+    num_clusters = int(labels.max()) + 1
+    if num_clusters > problem.num_vehicles:
+        raise ValueError(f"{num_clusters} clusters for {problem.num_vehicles} vehicles, at most one per vehicle")
+    vehicles = _vehicle_shares(problem, labels, num_clusters)
+    routes = [[int(problem.starts[v]), int(problem.ends[v])] for v in range(problem.num_vehicles)]
+    failed = []
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        futures = {}
+        for c in range(num_clusters):
+            sub, nodes = _subproblem(problem, problem.stops[labels == c], vehicles[c])
+            futures[c] = executor.submit(_solve_cluster, sub, nodes, first_solution_strategy,
+                                         local_search_metaheuristic, time_limit)
+        for c, future in futures.items():
+            cluster = future.result()
+            if cluster is None:
+                failed.append(c)
+                continue
+            for vehicle, route in zip(vehicles[c], cluster):
+                routes[vehicle] = route
+    return routes, failed
+
+
+def solve_clustered(problem, locations, num_clusters=None, method="kmeans", cluster_time_limit=5.0,
+                    improve_time_limit=10.0, first_solution_strategy="PATH_CHEAPEST_ARC",
+                    local_search_metaheuristic="GUIDED_LOCAL_SEARCH", max_workers=None, seed=0):
+    """Cluster first, route second; returns the `VrpSolution` of the global improvement pass.
+
+    `locations` (n, 2) are the coordinates of all the nodes. `num_clusters`
+    defaults to the number of CPUs (never more than the vehicles). The
+    solution also carries `labels` (cluster of every stop of `problem.stops`),
+    `stitched_routes`, `failed_clusters` and `cluster_time`; its `wall_time`
+    covers the whole run. If the stitched routes are not a valid start (a
+    cluster without solution and no drop penalty), the pass starts from
+    `first_solution_strategy` instead.
+    """
+    if method not in CLUSTER_METHODS:
+        raise ValueError(f"Unknown method {method!r}, expected one of {CLUSTER_METHODS}")
+    start = time.perf_counter()
+    locations = np.asarray(locations, dtype=np.float64)
+    num_clusters = min(num_clusters or os.cpu_count() or 1, problem.num_vehicles, len(problem.stops))
+    stop_locations = locations[problem.stops]
+    if method == "kmeans":
+        labels = kmeans_clusters(stop_locations, num_clusters, seed)
+    else:
+        center = locations[problem.depot_nodes].mean(axis=0)
+        labels = sweep_clusters(stop_locations, center, num_clusters, problem.demands[problem.stops])
+
+    stitched, failed = cluster_routes(problem, labels, first_solution_strategy, local_search_metaheuristic,
+                                      cluster_time_limit, max_workers)
+    cluster_time = time.perf_counter() - start
+
+    model = VrpModel(problem)
+    parameters = search_parameters(first_solution_strategy, local_search_metaheuristic, improve_time_limit)
+    solution = model.solve(parameters, stitched)
+    solution.labels = labels
+    solution.stitched_routes = stitched
+    solution.failed_clusters = failed
+    solution.cluster_time = cluster_time
+    solution.wall_time = time.perf_counter() - start
+    return solution
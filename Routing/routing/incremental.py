@@ -0,0 +1,245 @@
+"""Incremental re-routing: stops added or cancelled during the day, re-solved from the last routes.
+
+    router = IncrementalRouter(problem, locations, time_scale=0.1)
+    router.solve(time_limit=30)                           # cold solve, once
+    new = router.add_stops([[1200, 5300]], demands=[4], time_windows=[[3600, 10800]], service_times=[300])
+    router.remove_stops([17, 42])
+    solution = router.resolve(time_limit=0.5)             # warm start from the last routes
+
+Node ids are stable: the nodes of the initial problem keep their index, added
+stops get the next ones, cancelled stops stay in the model but are forced out
+of the routes. Adding a stop writes its row and column into matrices grown by
+blocks (spare capacity, no copy on most insertions) and appends them to the
+transit rows kept as Python lists, so that the next model registers them as
+they are: the matrices are never converted again. A RoutingModel cannot take
+new nodes nor new arc values, so `resolve` builds one from those rows, drops
+the cancelled stops from the last routes, inserts the new ones at their
+cheapest feasible position (capacity, time windows and waiting) and starts the
+local search from there (`ReadAssignmentFromRoutes`), instead of a first
+solution strategy on the whole problem.
+"""
+
+import numpy as np
+
+from .matrix import pairwise_distances
+from .solver import search_parameters
+from .vrp import VrpModel, transit_rows
+
+
+class IncrementalRouter:
+    """A `VrpProblem` that changes between solves, and its last solution (in stable node ids).
+
+    locations:   (n, 2) coordinates of the nodes of `problem`, to compute the
+                 matrix rows of added stops (same `metric` and `scale` as the matrix)
+    time_scale:  travel time per matrix unit, for a problem with a `time_matrix`
+                 (e.g. 1 / speed); the time rows are the distance rows times it, truncated
+    """
+
+    def __init__(self, problem, locations=None, metric="euclidean", scale=1.0, time_scale=None,
+                 first_solution_strategy="PATH_CHEAPEST_ARC", local_search_metaheuristic="GUIDED_LOCAL_SEARCH"):
+        self.problem = problem
+        self.locations = None if locations is None else np.asarray(locations, dtype=np.float64)
+        self.metric = metric
+        self.scale = scale
+        self.time_scale = time_scale
+        self.first_solution_strategy = first_solution_strategy
+        self.local_search_metaheuristic = local_search_metaheuristic
+        self.active = np.ones(problem.num_nodes, dtype=bool)
+        self.solution = None
+        n = problem.num_nodes
+        # Matrices with spare rows and columns; the problem sees their top left (n, n) block
+        self._matrix = np.asarray(problem.matrix, dtype=np.int64).copy()
+        self._time_matrix = None if problem.time_matrix is None else np.asarray(problem.time_matrix, np.int64).copy()
+        problem.matrix = self._matrix[:n, :n]
+        if self._time_matrix is not None:
+            problem.time_matrix = self._time_matrix[:n, :n]
+        self._cost_rows, self._time_rows = transit_rows(problem)
+
+    @property
+    def routes(self):
+        """Last routes (stable node ids, depots included), None before the first solve."""
+        return None if self.solution is None else self.solution.routes
+
+    # ------------------------
+    #    Changes of the node set
+    # ------------------------
+
+    def _distance_rows(self, locations):
+        """(k, n + k) distances from the new locations to every node, the new ones included."""
+        distances = pairwise_distances(locations, self.metric, targets=np.vstack([self.locations, locations]))
+        if self.scale != 1.0:
+            distances *= self.scale
+        return distances.astype(np.int64)
+
+    @staticmethod
+    def _grow(buffer, n, rows, columns):
+        """Writes k rows and columns after the first n ones of `buffer`; returns the buffer (doubled when full).
+
+        rows (k, n + k), columns (n + k, k).
+        """
+        k = len(rows)
+        if n + k > len(buffer):
+            size = max(n + k, 2 * len(buffer))
+            grown = np.empty((size, size), dtype=np.int64)
+            grown[:n, :n] = buffer[:n, :n]
+            buffer = grown
+        buffer[n:n + k, :n + k] = rows
+        buffer[:n + k, n:n + k] = columns
+        return buffer
+
+    def add_stops(self, locations=None, demands=None, time_windows=None, service_times=None, rows=None,
+                  columns=None, time_rows=None, time_columns=None):
+        """Adds k stops; returns their node ids.
+
+        The matrix rows come from `locations` (symmetric metric), or are
+        given: `rows` (k, n + k) from the new stops to every node and
+        `columns` (n + k, k) to them, likewise `time_rows`/`time_columns`.
+        Time windows are needed if the problem has some.
+        """
+        p = self.problem
+        if rows is None:
+            if self.locations is None:
+                raise ValueError("Either the router locations or the matrix rows of the new stops are needed")
+            locations = np.asarray(locations, dtype=np.float64).reshape(-1, 2)
+            rows = self._distance_rows(locations)
+            columns = rows.T
+            self.locations = np.vstack([self.locations, locations])
+        elif self.locations is not None:
+            raise ValueError("Router with locations: the new stops need locations, not matrix rows")
+        rows = np.asarray(rows, dtype=np.int64)
+        columns = rows.T if columns is None else np.asarray(columns, dtype=np.int64)
+        k = len(rows)
+        if p.time_matrix is not None and time_rows is None:
+            if self.time_scale is None:
+                raise ValueError("The problem has a time matrix: give time_rows or a router time_scale")
+            time_rows = (rows * self.time_scale).astype(np.int64)
+            time_columns = (columns * self.time_scale).astype(np.int64)
+        if p.time_windows is not None and time_windows is None:
+            raise ValueError("The problem has time windows: the new stops need theirs")
+
+        n = p.num_nodes
+        self._matrix = self._grow(self._matrix, n, rows, columns)
+        p.matrix = self._matrix[:n + k, :n + k]
+        if p.time_matrix is not None:
+            time_rows = np.asarray(time_rows, dtype=np.int64)
+            time_columns = time_rows.T if time_columns is None else np.asarray(time_columns, dtype=np.int64)
+            self._time_matrix = self._grow(self._time_matrix, n, time_rows, time_columns)
+            p.time_matrix = self._time_matrix[:n + k, :n + k]
+        p.demands = np.concatenate([p.demands, np.zeros(k, dtype=np.int64) if demands is None else demands])
+        p.service_times = np.concatenate([p.service_times,
+                                          np.zeros(k, dtype=np.int64) if service_times is None else service_times])
+        if p.time_windows is not None:
+            p.time_windows = np.vstack([p.time_windows, np.asarray(time_windows, dtype=np.int64).reshape(k, 2)])
+        self.active = np.concatenate([self.active, np.ones(k, dtype=bool)])
+        self._extend_rows(n, k)
+        return list(range(n, n + k))
+
+    def _extend_rows(self, n, k):
+        """Appends the k new columns to the n transit rows and the k new rows (O(n k), not O(n^2))."""
+        p = self.problem
+        for row, values in zip(self._cost_rows, p.matrix[:n, n:].tolist()):
+            row.extend(values)
+        self._cost_rows.extend(p.matrix[n:].tolist())
+        if self._time_rows is not None:
+            travel = p.matrix if p.time_matrix is None else p.time_matrix
+            service = p.service_times[:, np.newaxis]
+            for row, values in zip(self._time_rows, (travel[:n, n:] + service[:n]).tolist()):
+                row.extend(values)
+            self._time_rows.extend((travel[n:] + service[n:]).tolist())
+
+    def remove_stops(self, nodes):
+        """Cancels stops: they leave the next model and the routes (their ids are never reused)."""
+        nodes = np.asarray(nodes, dtype=np.intp)
+        if np.isin(nodes, self.problem.depot_nodes).any():
+            raise ValueError("Depots cannot be removed")
+        self.active[nodes] = False
+
+    # ------------------------
+    #    Solves
+    # ------------------------
+
+    def _solve(self, initial_routes, time_limit, local_search_metaheuristic):
+        model = VrpModel(self.problem, self._cost_rows, self._time_rows, np.flatnonzero(~self.active))
+        parameters = search_parameters(self.first_solution_strategy, local_search_metaheuristic, time_limit)
+        solution = model.solve(parameters, initial_routes)
+        if solution.found:
+            self.solution = solution
+        return solution
+
+    def solve(self, time_limit=10.0):
+        """Cold solve of the active nodes, from the first solution strategy; returns the `VrpSolution`."""
+        return self._solve(None, time_limit, self.local_search_metaheuristic)
+
+    def resolve(self, time_limit=0.5, local_search_metaheuristic=None):
+        """Re-solves after changes, from the last routes patched; returns the `VrpSolution`.
+
+        The default search is the solver's own (a descent, no metaheuristic). It
+        would stop at its first local optimum, but from a few hundred stops on it
+        does not get there in seconds: `time_limit` is what bounds the re-solve,
+        which returns the best routes found by then (status
+        ROUTING_PARTIAL_SUCCESS_LOCAL_OPTIMUM_NOT_REACHED). Without a last
+        solution, or if the patched routes are not feasible (a new stop fits
+        nowhere and cannot be dropped), it is a cold solve.
+        """
+        if self.solution is None:
+            return self.solve(time_limit)
+        return self._solve(self.patched_routes(), time_limit, local_search_metaheuristic)
+
+    # ------------------------
+    #    Warm start
+    # ------------------------
+
+    def patched_routes(self):
+        """Last routes without the cancelled stops, the new stops at their cheapest feasible insertion."""
+        routes = [[node for node in route if self.active[node]] for route in self.solution.routes]
+        routed = np.zeros(self.problem.num_nodes, dtype=bool)
+        for route in routes:
+            routed[route] = True
+        for node in np.flatnonzero(self.active & ~routed):
+            if node in self.problem.depot_nodes:
+                continue
+            best = self._cheapest_insertion(routes, int(node))
+            if best is not None:
+                vehicle, position = best
+                routes[vehicle].insert(position, int(node))
+        return routes
+
+    def _cheapest_insertion(self, routes, node):
+        """(vehicle, position) of the cheapest insertion of `node` keeping the capacity and the time windows."""
+        p = self.problem
+        best, best_cost = None, None
+        for vehicle, route in enumerate(routes):
+            if p.demands[route].sum() + p.demands[node] > p.capacities[vehicle]:
+                continue
+            route = np.asarray(route)
+            deltas = p.matrix[route[:-1], node] + p.matrix[node, route[1:]] - p.matrix[route[:-1], route[1:]]
+            for position in np.argsort(deltas, kind="stable"):
+                if best_cost is not None and deltas[position] >= best_cost:
+                    break
+                candidate = np.insert(route, position + 1, node)
+                if self._feasible_times(candidate):
+                    best, best_cost = (vehicle, int(position) + 1), deltas[position]
+                    break
+        return best
+
+    def _feasible_times(self, route):
+        """Whether the route can meet every time window, with the waiting limits of the model.
+
+        The times the vehicle can be at each node form an interval: from the
+        depot window, then every arc adds its transit plus up to `max_wait`
+        of waiting, clipped to the window of the next node.
+        """
+        p = self.problem
+        if p.time_windows is None:
+            return True
+        travel = p.matrix if p.time_matrix is None else p.time_matrix
+        windows = p.time_windows
+        max_wait = p.horizon if p.max_wait is None else p.max_wait
+        earliest, latest = windows[route[0]]
+        for previous, node in zip(route[:-1], route[1:]):
+            transit = p.service_times[previous] + travel[previous, node]
+            earliest = max(earliest + transit, windows[node, 0])
+            latest = min(latest + transit + max_wait, windows[node, 1], p.horizon)
+            if earliest > latest:
+                return False
+        return True
@@ -0,0 +1,43 @@
+"""Distance matrices computed once with NumPy broadcasting (no per-arc Python code)."""
+
+import numpy as np
+
+METRICS = ("euclidean", "manhattan", "haversine")
+
+# Mean Earth radius (m), for "haversine" on (latitude, longitude) in degrees
+EARTH_RADIUS = 6_371_008.8
+
+
+def pairwise_distances(locations, metric="euclidean", targets=None):
+    """Float distances from every location to every target (the locations themselves by default).
+
+    `locations` and `targets` are (n, 2) array-likes of coordinates; with
+    "haversine" they are (latitude, longitude) in degrees and distances are
+    great-circle meters.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric {metric!r}, expected one of {METRICS}")
+    locations = np.asarray(locations, dtype=np.float64)
+    targets = locations if targets is None else np.asarray(targets, dtype=np.float64)
+    if metric == "haversine":
+        lat1, lon1 = np.radians(locations).T[:, :, np.newaxis]
+        lat2, lon2 = np.radians(targets).T[:, np.newaxis, :]
+        h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.minimum(h, 1.0)))
+    # (n, 1, 2) - (1, m, 2) -> (n, m, 2)
+    delta = locations[:, np.newaxis, :] - targets[np.newaxis, :, :]
+    if metric == "manhattan":
+        return np.abs(delta).sum(axis=-1)
+    return np.hypot(delta[..., 0], delta[..., 1])
+
+
+def distance_matrix(locations, metric="euclidean", scale=1.0, dtype=np.int64):
+    """Integer distance matrix of the locations, as the routing solver needs.
+
+    Distances are multiplied by `scale` and truncated, as `int(math.hypot(...))`
+    in the notebook (use a scale > 1 to keep decimals).
+    """
+    distances = pairwise_distances(locations, metric)
+    if scale != 1.0:
+        distances *= scale
+    return distances.astype(dtype)
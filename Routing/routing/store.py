@@ -0,0 +1,122 @@
+"""Tiled, memory-mapped int32 distance matrices, cached on disk by location set.
+
+The matrix is computed tile by tile (never more than `tile_size` x `tile_size`
+floats in memory) straight into an .npy file opened as a memory map, so a 10k
+location matrix takes 400 MB on disk and only the rows used are paged in.
+The file name is a hash of the locations, the metric and the scale, so the
+next run on the same location set reuses it at once.
+
+    store = MatrixStore()
+    matrix = store.matrix(locations, metric="haversine")     # np.memmap, int32
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+from .matrix import METRICS, pairwise_distances
+
+# Bumped whenever the stored matrices change for the same inputs
+STORE_VERSION = 1
+
+DEFAULT_STORE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "routing", "matrices")
+
+INT32_MAX = np.iinfo(np.int32).max
+
+
+def locations_key(locations, metric="euclidean", scale=1.0):
+    """sha256 of the coordinates (as float64), the metric and the scale."""
+    locations = np.ascontiguousarray(locations, dtype=np.float64)
+    digest = hashlib.sha256()
+    digest.update(f"{STORE_VERSION}:{metric}:{scale!r}:{locations.shape}".encode())
+    digest.update(locations.tobytes())
+    return digest.hexdigest()
+
+
+def _distance_tile(locations, rows, columns, metric, scale):
+    tile = pairwise_distances(locations[rows], metric, targets=locations[columns])
+    if scale != 1.0:
+        tile *= scale
+    # Truncated like `distance_matrix`; distances beyond int32 are capped
+    return np.minimum(tile, INT32_MAX).astype(np.int32)
+
+
+class MatrixStore:
+    """Directory of distance matrices (.npy, int32), evicted least recently used beyond `max_entries`.
+
+    The last access of an entry is the modification time of its file.
+    """
+
+    def __init__(self, directory=DEFAULT_STORE_DIR, tile_size=1024, max_entries=16):
+        self.directory = directory
+        self.tile_size = tile_size
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key, suffix=""):
+        return os.path.join(self.directory, f"{key}{suffix}.npy")
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def _open(self, path):
+        os.utime(path)
+        return np.load(path, mmap_mode="r")
+
+    def _tiles(self, num_locations):
+        step = self.tile_size
+        for start in range(0, num_locations, step):
+            yield slice(start, min(start + step, num_locations))
+
+    def matrix(self, locations, metric="euclidean", scale=1.0):
+        """The (n, n) int32 matrix of the locations as a read-only memory map, computed on a miss."""
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}, expected one of {METRICS}")
+        locations = np.asarray(locations, dtype=np.float64)
+        key = locations_key(locations, metric, scale)
+        path = self._path(key)
+        if os.path.exists(path):
+            return self._open(path)
+        n = len(locations)
+        # Written under a temporary name first, so that a reader never sees half a matrix
+        temporary = self._path(key, ".tmp")
+        matrix = np.lib.format.open_memmap(temporary, mode="w+", dtype=np.int32, shape=(n, n))
+        for rows in self._tiles(n):
+            for columns in self._tiles(n):
+                matrix[rows, columns] = _distance_tile(locations, rows, columns, metric, scale)
+        matrix.flush()
+        del matrix
+        os.replace(temporary, path)
+        self.evict()
+        return self._open(path)
+
+    def keys(self):
+        """Keys of the matrices, least recently used first."""
+        entries = []
+        for name in os.listdir(self.directory):
+            key = name[:-len(".npy")]
+            if name.endswith(".npy") and "." not in key:
+                entries.append((os.path.getmtime(os.path.join(self.directory, name)), key))
+        return [key for _, key in sorted(entries)]
+
+    def _remove(self, key):
+        for name in os.listdir(self.directory):
+            if name.startswith(key):
+                os.remove(os.path.join(self.directory, name))
+
+    def evict(self):
+        """Removes the least recently used matrices beyond `max_entries`."""
+        keys = self.keys()
+        for key in keys[:max(len(keys) - self.max_entries, 0)]:
+            self._remove(key)
+
+    def clear(self):
+        for key in self.keys():
+            self._remove(key)
+
+
+def submatrix(matrix, nodes):
+    """Dense int64 matrix between `nodes` (e.g. one cluster), read from a possibly memory-mapped matrix."""
+    nodes = np.asarray(nodes, dtype=np.intp)
+    return np.asarray(matrix[np.ix_(nodes, nodes)], dtype=np.int64)
@@ -0,0 +1,40 @@
+"""TSP front-end of the notebook examples, on a precomputed distance matrix."""
+
+import time
+
+import numpy as np
+from ortools.constraint_solver import pywrapcp
+
+from .matrix import distance_matrix
+from .solver import RoutingSolution, register_matrix, route_cost, search_parameters, solution_routes
+
+
+def solve_tsp(matrix, depot=0, num_vehicles=1, first_solution_strategy="PATH_CHEAPEST_ARC",
+              local_search_metaheuristic=None, time_limit=None):
+    """Solves the (multi-vehicle) TSP of a (nodes, nodes) integer matrix; returns a `RoutingSolution`.
+
+    The matrix is registered once as a native transit matrix (no Python
+    distance callback); see `register_matrix` for its memory cost. An ndarray
+    (e.g. a `MatrixStore` memory map) is used as is, not copied to int64.
+    """
+    if not isinstance(matrix, np.ndarray):
+        matrix = np.asarray(matrix, dtype=np.int64)
+    manager = pywrapcp.RoutingIndexManager(len(matrix), num_vehicles, depot)
+    routing = pywrapcp.RoutingModel(manager)
+    transit = register_matrix(routing, matrix)
+    routing.SetArcCostEvaluatorOfAllVehicles(transit)
+
+    parameters = search_parameters(first_solution_strategy, local_search_metaheuristic, time_limit)
+    start = time.perf_counter()
+    solution = routing.SolveWithParameters(parameters)
+    wall_time = time.perf_counter() - start
+    if not solution:
+        return RoutingSolution(None, None, routing.status(), wall_time)
+    routes = solution_routes(manager, routing, solution)
+    cost = sum(route_cost(matrix, route) for route in routes)
+    return RoutingSolution(routes, cost, routing.status(), wall_time)
+
+
+def solve_tsp_locations(locations, metric="euclidean", scale=1.0, **kwargs):
+    """`solve_tsp` on the distance matrix of (n, 2) coordinates (see `distance_matrix`)."""
+    return solve_tsp(distance_matrix(locations, metric, scale), **kwargs)
@@ -0,0 +1,234 @@
+"""Capacitated VRP with time windows and several depots, on precomputed matrices.
+
+    problem = VrpProblem(matrix, demands, capacities, time_windows=windows, depots=[0, 1])
+    solution = solve_vrp(problem, time_limit=30)
+    solution.routes, solution.cost, solution.dropped
+
+Every input is an array (one value per node or per vehicle); the solver gets
+them as native transit matrices and vectors, so no Python callback runs during
+the search. The time transit of an arc is the travel time plus the service
+time at its origin.
+"""
+
+import time
+
+import numpy as np
+from ortools.constraint_solver import pywrapcp
+
+from .solver import RoutingSolution, register_matrix, route_cost, search_parameters, solution_routes
+
+CAPACITY = "Capacity"
+TIME = "Time"
+
+
+class VrpProblem:
+    """Nodes, vehicles and their constraints, as NumPy arrays.
+
+    matrix:         (n, n) arc costs (distances), int
+    demands:        (n,) load picked up at every node (0 at the depots)
+    capacities:     (vehicles,) capacity of every vehicle
+    time_matrix:    (n, n) travel times (the distances by default)
+    time_windows:   (n, 2) earliest and latest arrival, or None
+    service_times:  (n,) time spent at every node (0 by default)
+    depots:         start/end node of every vehicle; one node (shared), a
+                    list of depot nodes (vehicles spread over them in turn),
+                    or a (vehicles, 2) array of (start, end) nodes
+    max_wait:       allowed waiting time at a node before its window opens
+    horizon:        end of the day (the largest time window end by default)
+    drop_penalty:   cost of leaving a node unserved (None: every node must be served)
+    """
+
+    def __init__(self, matrix, demands=None, capacities=None, time_matrix=None, time_windows=None,
+                 service_times=None, depots=0, num_vehicles=None, max_wait=None, horizon=None, drop_penalty=None):
+        self.matrix = matrix
+        n = len(matrix)
+        self.demands = np.zeros(n, dtype=np.int64) if demands is None else np.asarray(demands, dtype=np.int64)
+        if capacities is None:
+            num_vehicles = num_vehicles or 1
+            capacities = np.full(num_vehicles, max(int(self.demands.sum()), 1))
+        self.capacities = np.asarray(capacities, dtype=np.int64)
+        self.num_vehicles = len(self.capacities)
+        self.time_matrix = time_matrix
+        self.time_windows = None if time_windows is None else np.asarray(time_windows, dtype=np.int64)
+        self.service_times = (np.zeros(n, dtype=np.int64) if service_times is None
+                              else np.asarray(service_times, dtype=np.int64))
+        self.starts, self.ends = self._vehicle_depots(depots)
+        self.max_wait = max_wait
+        if horizon is None and self.time_windows is not None:
+            horizon = int(self.time_windows[:, 1].max())
+        self.horizon = horizon
+        self.drop_penalty = drop_penalty
+
+    def _vehicle_depots(self, depots):
+        depots = np.asarray(depots, dtype=np.int64)
+        if depots.ndim == 0:
+            starts = np.full(self.num_vehicles, int(depots))
+            return starts, starts.copy()
+        if depots.ndim == 1:
+            starts = depots[np.arange(self.num_vehicles) % len(depots)]
+            return starts, starts.copy()
+        return depots[:, 0].copy(), depots[:, 1].copy()
+
+    @property
+    def num_nodes(self):
+        return len(self.matrix)
+
+    @property
+    def depot_nodes(self):
+        return np.union1d(self.starts, self.ends)
+
+    @property
+    def stops(self):
+        """Nodes to visit (every node but the depots)."""
+        return np.setdiff1d(np.arange(self.num_nodes), self.depot_nodes)
+
+
+def time_transit(problem):
+    """(n, n) transit of the time dimension: travel time plus the service time at the origin of the arc."""
+    travel = problem.matrix if problem.time_matrix is None else problem.time_matrix
+    # Service time at the origin of every arc, added once to the whole matrix
+    return np.asarray(travel, dtype=np.int64) + problem.service_times[:, np.newaxis]
+
+
+def transit_rows(problem):
+    """(cost rows, time rows) of `VrpModel` as Python lists (time rows None without time windows)."""
+    cost_rows = [np.asarray(row, dtype=np.int64).tolist() for row in problem.matrix]
+    time_rows = None if problem.time_windows is None else time_transit(problem).tolist()
+    return cost_rows, time_rows
+
+
+class VrpSolution(RoutingSolution):
+    """`RoutingSolution` plus the load and arrival times along every route and the dropped nodes."""
+
+    def __init__(self, routes, cost, status, wall_time, loads=None, arrivals=None, dropped=None, history=None):
+        super().__init__(routes, cost, status, wall_time)
+        self.loads = loads
+        self.arrivals = arrivals
+        self.dropped = dropped if dropped is not None else []
+        # [(seconds, objective)] of the improving solutions
+        self.history = history if history is not None else []
+
+
+class VrpModel:
+    """RoutingIndexManager + RoutingModel of a `VrpProblem`, with its dimensions registered."""
+
+    def __init__(self, problem, cost_rows=None, time_rows=None, inactive=()):
+        """`cost_rows` and `time_rows` are the transit matrices already as Python rows (lists of ints),
+        registered as they are; the time rows include the service time at their origin (see
+        `transit_rows`). `inactive` nodes are kept out of the routes.
+        """
+        p = self.problem = problem
+        self.inactive = {int(node) for node in inactive}
+        self.manager = pywrapcp.RoutingIndexManager(p.num_nodes, p.num_vehicles, p.starts.tolist(),
+                                                    p.ends.tolist())
+        routing = self.routing = pywrapcp.RoutingModel(self.manager)
+        cost = register_matrix(routing, p.matrix) if cost_rows is None else routing.RegisterTransitMatrix(cost_rows)
+        routing.SetArcCostEvaluatorOfAllVehicles(cost)
+
+        self.capacity = None
+        if p.demands.any():
+            demand = routing.RegisterUnaryTransitVector(p.demands.tolist())
+            routing.AddDimensionWithVehicleCapacity(demand, 0, p.capacities.tolist(), True, CAPACITY)
+            self.capacity = routing.GetDimensionOrDie(CAPACITY)
+
+        self.time = None
+        if p.time_windows is not None:
+            self._add_time_dimension(time_rows)
+
+        for node in p.stops.tolist():
+            index = self.manager.NodeToIndex(node)
+            if node in self.inactive:
+                # Optional at no cost, then forced out
+                routing.AddDisjunction([index], 0)
+                routing.ActiveVar(index).SetValue(0)
+            elif p.drop_penalty is not None:
+                routing.AddDisjunction([index], int(p.drop_penalty))
+
+    def _add_time_dimension(self, time_rows=None):
+        p, routing, manager = self.problem, self.routing, self.manager
+        if time_rows is None:
+            transit = register_matrix(routing, time_transit(p))
+        else:
+            transit = routing.RegisterTransitMatrix(time_rows)
+        max_wait = p.horizon if p.max_wait is None else p.max_wait
+        routing.AddDimension(transit, int(max_wait), int(p.horizon), False, TIME)
+        self.time = routing.GetDimensionOrDie(TIME)
+        windows = p.time_windows.tolist()
+        for node in p.stops.tolist():
+            self.time.CumulVar(manager.NodeToIndex(node)).SetRange(*windows[node])
+        for vehicle in range(p.num_vehicles):
+            self.time.CumulVar(routing.Start(vehicle)).SetRange(*windows[int(p.starts[vehicle])])
+            self.time.CumulVar(routing.End(vehicle)).SetRange(*windows[int(p.ends[vehicle])])
+            # Shortest days first: start as late and come back as early as possible
+            routing.AddVariableMaximizedByFinalizer(self.time.CumulVar(routing.Start(vehicle)))
+            routing.AddVariableMinimizedByFinalizer(self.time.CumulVar(routing.End(vehicle)))
+
+    def initial_assignment(self, routes, parameters=None):
+        """Assignment from node routes (one list per vehicle, depots excluded), or None if invalid."""
+        depots = set(self.problem.depot_nodes.tolist())
+        routes = [[int(node) for node in route if node not in depots] for route in routes]
+        self.routing.CloseModelWithParameters(parameters or search_parameters())
+        return self.routing.ReadAssignmentFromRoutes(routes, True)
+
+    def solve(self, parameters, initial_routes=None):
+        """Solves from `initial_routes` if given and valid, else from the first solution strategy.
+
+        Returns a `VrpSolution`.
+        """
+        routing = self.routing
+        history = []
+        start = time.perf_counter()
+
+        def record():
+            # Guided local search also goes through worse solutions; only the improvements are kept
+            cost = routing.CostVar().Value()
+            if not history or cost < history[-1][1]:
+                history.append((time.perf_counter() - start, cost))
+
+        routing.AddAtSolutionCallback(record)
+        initial = None if initial_routes is None else self.initial_assignment(initial_routes, parameters)
+        if initial:
+            solution = routing.SolveFromAssignmentWithParameters(initial, parameters)
+        else:
+            solution = routing.SolveWithParameters(parameters)
+        wall_time = time.perf_counter() - start
+        if not solution:
+            return VrpSolution(None, None, routing.status(), wall_time, history=history)
+        return self._solution(solution, wall_time, history)
+
+    def _solution(self, solution, wall_time, history):
+        p, routing, manager = self.problem, self.routing, self.manager
+        routes = solution_routes(manager, routing, solution)
+        loads, arrivals = [], []
+        for route in routes:
+            loads.append(np.cumsum(p.demands[route]).tolist())
+        if self.time is not None:
+            for vehicle in range(p.num_vehicles):
+                index, times = routing.Start(vehicle), []
+                while True:
+                    times.append(solution.Min(self.time.CumulVar(index)))
+                    if routing.IsEnd(index):
+                        break
+                    index = solution.Value(routing.NextVar(index))
+                arrivals.append(times)
+        visited = np.zeros(p.num_nodes, dtype=bool)
+        for route in routes:
+            visited[route] = True
+        visited[list(self.inactive)] = True
+        dropped = np.setdiff1d(p.stops, np.flatnonzero(visited)).tolist()
+        cost = sum(route_cost(p.matrix, route) for route in routes)
+        return VrpSolution(routes, cost, routing.status(), wall_time, loads, arrivals or None, dropped, history)
+
+
+def solve_vrp(problem, first_solution_strategy="PATH_CHEAPEST_ARC", local_search_metaheuristic="GUIDED_LOCAL_SEARCH",
+              time_limit=10.0, initial_routes=None, log_search=False):
+    """Builds and solves a `VrpProblem`; returns a `VrpSolution`.
+
+    Guided local search needs a time limit (it never stops by itself).
+    `initial_routes` (node lists per vehicle) seed the search instead of the
+    first solution strategy, unless they break a constraint.
+    """
+    model = VrpModel(problem)
+    parameters = search_parameters(first_solution_strategy, local_search_metaheuristic, time_limit,
+                                   log_search=log_search)
+    return model.solve(parameters, initial_routes)
@@ -0,0 +1,15 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# The library is imported from the Routing directory, as by the scripts
+ROUTING_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROUTING_DIR))
+
+
+@pytest.fixture
+def locations():
+    """12 random points of a 1000 x 1000 square."""
+    return np.random.default_rng(0).integers(0, 1000, size=(12, 2))
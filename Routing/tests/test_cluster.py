@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from routing import cluster_routes, generate_vrp, kmeans_clusters, solve_clustered, sweep_clusters
+from routing.cluster import _vehicle_shares
+
+
+def test_kmeans_clusters():
+    rng = np.random.default_rng(0)
+    blobs = np.vstack([rng.normal(center, 10, size=(20, 2)) for center in ([0, 0], [1000, 0], [0, 1000])])
+    labels = kmeans_clusters(blobs, 3)
+    assert sorted(np.bincount(labels).tolist()) == [20, 20, 20]
+    assert all(len(set(labels[i:i + 20].tolist())) == 1 for i in (0, 20, 40))
+    # Duplicate locations: fewer clusters, consecutive labels
+    labels = kmeans_clusters([[0, 0]] * 5 + [[10, 10]] * 5, 4)
+    assert sorted(set(labels.tolist())) == [0, 1]
+
+
+def test_sweep_clusters():
+    angles = np.linspace(0, 2 * np.pi, 8, endpoint=False) + 0.1
+    locations = np.column_stack([np.cos(angles), np.sin(angles)]) * 100
+    labels = sweep_clusters(locations, [0, 0], 4)
+    assert np.bincount(labels).tolist() == [2, 2, 2, 2]
+    # Consecutive sectors
+    order = np.argsort(np.arctan2(locations[:, 1], locations[:, 0]))
+    assert (np.diff(labels[order]) >= 0).all()
+    # By weight: a sector starts where the previous ones reach their share of the total
+    weights = [6, 1, 1, 1, 1, 1, 1, 1]
+    assert sweep_clusters(locations, [0, 0], 2, weights)[order].tolist() == [0, 0, 0, 0, 0, 1, 1, 1]
+
+
+def test_vehicle_shares():
+    problem, _ = generate_vrp(num_stops=30, num_vehicles=7, num_depots=2, seed=1)
+    labels = np.repeat([0, 1, 2], 10)
+    vehicles = _vehicle_shares(problem, labels, 3)
+    assert sorted(v for cluster in vehicles for v in cluster) == list(range(7))
+    assert all(vehicles)
+
+
+def test_more_clusters_than_vehicles():
+    problem, _ = generate_vrp(num_stops=10, num_vehicles=4, seed=1, capacity_slack=2.0)
+    with pytest.raises(ValueError):
+        cluster_routes(problem, np.arange(10) % 5)
+    # Empty clusters do not count
+    routes, failed = cluster_routes(problem, np.arange(10) % 2 * 5, time_limit=1.0, max_workers=1)
+    assert not failed
+    assert sorted(node for route in routes for node in route[1:-1]) == list(range(1, 11))
+
+
+@pytest.mark.parametrize("method", ["kmeans", "sweep"])
+def test_solve_clustered(method):
+    problem, locations = generate_vrp(num_stops=40, num_vehicles=8, num_depots=2, seed=1)
+    solution = solve_clustered(problem, locations, num_clusters=20, method=method, cluster_time_limit=1.0,
+                               improve_time_limit=1.0, max_workers=2)
+    # No more clusters than vehicles
+    assert solution.labels.max() < 8
+    assert solution.found and not solution.dropped
+    assert sorted(node for route in solution.routes for node in route[1:-1]) == list(range(2, 42))
+    with pytest.raises(ValueError):
+        solve_clustered(problem, locations, method="grid")
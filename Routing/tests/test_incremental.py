@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from routing import IncrementalRouter, VrpProblem, distance_matrix, generate_vrp
+from routing.vrp import transit_rows
+
+
+@pytest.fixture
+def router():
+    problem, locations = generate_vrp(num_stops=30, num_vehicles=6, seed=1, capacity_slack=2.0)
+    router = IncrementalRouter(problem, locations, time_scale=0.1)
+    assert router.solve(time_limit=1.0).found
+    return router
+
+
+def served(routes):
+    return sorted(node for route in routes for node in route[1:-1])
+
+
+def test_grow():
+    buffer = np.arange(9, dtype=np.int64).reshape(3, 3)
+    rows = np.array([[10, 11, 12, 13]])
+    grown = IncrementalRouter._grow(buffer, 3, rows, rows.T)
+    # Doubled, the old block copied
+    assert grown.shape == (6, 6)
+    assert (grown[:3, :3] == buffer).all()
+    assert grown[3, :4].tolist() == grown[:4, 3].tolist() == [10, 11, 12, 13]
+    # Spare room: written in place
+    rows = np.array([[20, 21, 22, 23, 24]])
+    assert IncrementalRouter._grow(grown, 4, rows, rows.T) is grown
+    assert grown[4, :5].tolist() == [20, 21, 22, 23, 24]
+
+
+def test_add_stops(router):
+    p = router.problem
+    before = [route[:] for route in router.routes]
+    new = router.add_stops([[5000, 5000], [100, 200]], demands=[3, 4], time_windows=[[0, 28800], [3600, 20000]],
+                           service_times=[300, 300])
+    # Stable ids: the old nodes keep theirs
+    assert new == [31, 32]
+    assert router.routes == before
+    assert p.num_nodes == 33 and p.demands[31:].tolist() == [3, 4]
+    assert (p.matrix == distance_matrix(router.locations)).all()
+    assert (p.time_matrix == (distance_matrix(router.locations) * 0.1).astype(np.int64)).all()
+    # The transit rows kept as lists are those of the grown problem
+    assert (router._cost_rows, router._time_rows) == transit_rows(p)
+
+    buffer = router._matrix
+    assert len(buffer) == 62
+    router.add_stops([[7000, 3000]], demands=[1], time_windows=[[0, 28800]])
+    assert router._matrix is buffer
+    assert (router._cost_rows, router._time_rows) == transit_rows(p)
+
+    solution = router.resolve()
+    assert solution.found
+    assert served(solution.routes) == list(range(1, 34))
+
+
+def test_remove_stops(router):
+    router.remove_stops([3, 17])
+    patched = router.patched_routes()
+    assert 3 not in served(patched) and 17 not in served(patched)
+    solution = router.resolve(time_limit=0.5)
+    # Forced out, not dropped
+    assert served(solution.routes) == [n for n in range(1, 31) if n not in (3, 17)]
+    assert solution.dropped == []
+    with pytest.raises(ValueError):
+        router.remove_stops([0])
+
+
+def test_add_stops_errors(router):
+    with pytest.raises(ValueError):
+        router.add_stops(rows=np.zeros((1, 32)))
+    with pytest.raises(ValueError):
+        router.add_stops([[0, 0]], demands=[1])
+
+    problem = VrpProblem(np.zeros((3, 3), dtype=np.int64), time_matrix=np.zeros((3, 3), dtype=np.int64),
+                         time_windows=[[0, 100]] * 3)
+    with pytest.raises(ValueError):
+        IncrementalRouter(problem).add_stops([[0, 0]], time_windows=[[0, 100]])
+    with pytest.raises(ValueError):
+        IncrementalRouter(problem).add_stops(rows=np.zeros((1, 4)), time_windows=[[0, 100]])
+    # Given rows, transposed for the columns
+    router = IncrementalRouter(problem)
+    assert router.add_stops(rows=[[1, 2, 3, 0]], time_rows=[[1, 1, 1, 0]], time_windows=[[0, 100]]) == [3]
+    assert problem.matrix[:, 3].tolist() == [1, 2, 3, 0]
+
+
+def test_feasible_times():
+    windows = [[0, 30000]] * 5 + [[20000, 21000], [3000, 3000]]
+    matrix = np.full((7, 7), 100, dtype=np.int64)
+    problem = VrpProblem(matrix, time_windows=windows)
+    router = IncrementalRouter(problem)
+    assert router._feasible_times([0, 6, 5, 0])
+    assert not router._feasible_times([0, 5, 6, 0])
+    # Node 5 opens long after node 6: waiting is needed
+    problem.max_wait = 0
+    assert not router._feasible_times([0, 6, 5, 0])
+    assert router._feasible_times([0, 1, 6, 0])
@@ -0,0 +1,82 @@
+import itertools
+import math
+
+import numpy as np
+import pytest
+from ortools.constraint_solver import pywrapcp
+
+from routing import (distance_matrix, pairwise_distances, register_matrix, route_cost, search_parameters,
+                     solution_routes, solve_tsp, solve_tsp_locations)
+
+
+def test_pairwise_distances(locations):
+    euclidean = pairwise_distances(locations)
+    assert euclidean.shape == (12, 12)
+    assert euclidean[0, 1] == pytest.approx(math.dist(locations[0], locations[1]))
+    assert np.allclose(euclidean, euclidean.T) and not euclidean.diagonal().any()
+    manhattan = pairwise_distances(locations, "manhattan", targets=locations[:3])
+    assert manhattan.shape == (12, 3)
+    assert manhattan[5, 2] == abs(locations[5] - locations[2]).sum()
+    # Paris - Lyon, about 392 km
+    paris_lyon = pairwise_distances([[48.8566, 2.3522]], "haversine", targets=[[45.764, 4.8357]])
+    assert paris_lyon[0, 0] == pytest.approx(392_000, rel=0.01)
+    with pytest.raises(ValueError):
+        pairwise_distances(locations, "chebyshev")
+
+
+def test_distance_matrix(locations):
+    matrix = distance_matrix(locations)
+    assert matrix.dtype == np.int64
+    assert matrix[3, 7] == int(math.hypot(*(locations[3] - locations[7])))
+    scaled = distance_matrix(locations, scale=100.0, dtype=np.int32)
+    assert scaled.dtype == np.int32
+    assert scaled[3, 7] == int(math.hypot(*(locations[3] - locations[7])) * 100)
+
+
+def test_register_matrix(locations):
+    matrix = distance_matrix(locations).astype(np.int32)
+    manager = pywrapcp.RoutingIndexManager(len(matrix), 1, 0)
+    routing = pywrapcp.RoutingModel(manager)
+    transit = register_matrix(routing, matrix)
+    routing.SetArcCostEvaluatorOfAllVehicles(transit)
+    solution = routing.SolveWithParameters(search_parameters())
+    route, = solution_routes(manager, routing, solution)
+    assert route[0] == route[-1] == 0
+    assert sorted(route[:-1]) == list(range(12))
+    # The solver read the matrix values
+    assert solution.ObjectiveValue() == route_cost(matrix, route)
+
+
+def test_search_parameters():
+    parameters = search_parameters("SAVINGS", "GUIDED_LOCAL_SEARCH", time_limit=1.5, solution_limit=10,
+                                   log_search=True)
+    assert parameters.time_limit.ToMilliseconds() == 1500
+    assert parameters.solution_limit == 10
+    assert parameters.log_search
+    with pytest.raises(AttributeError):
+        search_parameters("CHEAPEST")
+
+
+def test_route_cost():
+    matrix = np.arange(16).reshape(4, 4)
+    assert route_cost(matrix, [0, 2, 3, 0]) == 2 + 11 + 12
+    assert route_cost(matrix, [0]) == 0
+
+
+def test_solve_tsp(locations):
+    matrix = distance_matrix(locations[:8])
+    solution = solve_tsp(matrix, local_search_metaheuristic="GUIDED_LOCAL_SEARCH", time_limit=1)
+    assert solution.found and solution.status_name.startswith("ROUTING_")
+    route, = solution.routes
+    assert sorted(route[:-1]) == list(range(8))
+    optimum = min(route_cost(matrix, (0,) + tour + (0,)) for tour in itertools.permutations(range(1, 8)))
+    assert solution.cost == optimum
+
+
+def test_solve_tsp_vehicles(locations):
+    solution = solve_tsp_locations(locations, num_vehicles=2, depot=3)
+    assert len(solution.routes) == 2
+    assert all(route[0] == route[-1] == 3 for route in solution.routes)
+    assert sorted(node for route in solution.routes for node in route[1:-1]) == [n for n in range(12) if n != 3]
+    # A list of lists is accepted too
+    assert solve_tsp(distance_matrix(locations).tolist()).cost == solve_tsp(distance_matrix(locations)).cost
@@ -0,0 +1,67 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+from routing import MatrixStore, distance_matrix, locations_key, submatrix
+
+
+@pytest.fixture
+def store(tmp_path):
+    # Tiles smaller than the matrices, so that they do not divide them evenly
+    return MatrixStore(str(tmp_path / "matrices"), tile_size=5, max_entries=2)
+
+
+def test_matrix(store, locations):
+    matrix = store.matrix(locations)
+    assert isinstance(matrix, np.memmap)
+    assert matrix.dtype == np.int32
+    assert (matrix == distance_matrix(locations)).all()
+    assert not matrix.flags.writeable
+    assert (store.matrix(locations, "manhattan", scale=10.0) == distance_matrix(locations, "manhattan", 10.0)).all()
+    with pytest.raises(ValueError):
+        store.matrix(locations, "chebyshev")
+
+
+def test_hit(store, locations):
+    key = locations_key(locations)
+    assert key not in store
+    store.matrix(locations)
+    assert key in store
+    # Same coordinates as floats: same entry, not recomputed
+    path = os.path.join(store.directory, f"{key}.npy")
+    os.utime(path, (0, 0))
+    assert (store.matrix(locations.astype(float)) == distance_matrix(locations)).all()
+    assert os.path.getmtime(path) > 0
+    assert store.keys() == [key]
+    assert locations_key(locations, "haversine") != key
+    assert locations_key(locations, scale=2.0) != key
+
+
+def test_capped_distances(store):
+    matrix = store.matrix([[0, 0], [3, 4]], scale=1e9)
+    assert matrix[0, 1] == np.iinfo(np.int32).max
+
+
+def test_lru_eviction(store, locations):
+    sets = [locations[:4], locations[4:8], locations[8:]]
+    now = time.time()
+    for points, age in zip(sets[:2], (100, 50)):
+        store.matrix(points)
+        os.utime(os.path.join(store.directory, f"{locations_key(points)}.npy"), (now - age, now - age))
+    # Reading the first set makes the second one the least recently used
+    store.matrix(sets[0])
+    store.matrix(sets[2])
+    assert set(store.keys()) == {locations_key(sets[0]), locations_key(sets[2])}
+    assert sorted(os.listdir(store.directory)) == sorted(f"{key}.npy" for key in store.keys())
+    store.clear()
+    assert store.keys() == [] and os.listdir(store.directory) == []
+
+
+def test_submatrix(store, locations):
+    matrix = store.matrix(locations)
+    nodes = [7, 2, 9]
+    sub = submatrix(matrix, nodes)
+    assert sub.dtype == np.int64 and not isinstance(sub, np.memmap)
+    assert (sub == distance_matrix(locations[nodes])).all()
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from routing import VrpModel, VrpProblem, cost_at, generate_vrp, route_cost, search_parameters, solve_vrp
+from routing.benchmark import benchmark_vrp
+from routing.vrp import time_transit, transit_rows
+
+
+def check_solution(problem, solution):
+    """Capacities, time windows and transit times along every route."""
+    p = problem
+    transit = time_transit(p)
+    for vehicle, route in enumerate(solution.routes):
+        assert route[0] == p.starts[vehicle] and route[-1] == p.ends[vehicle]
+        assert solution.loads[vehicle][-1] <= p.capacities[vehicle]
+        if p.time_windows is not None:
+            arrivals = solution.arrivals[vehicle]
+            for node, arrival in zip(route, arrivals):
+                assert p.time_windows[node, 0] <= arrival <= p.time_windows[node, 1]
+            for i in range(len(route) - 1):
+                wait = arrivals[i + 1] - arrivals[i] - transit[route[i], route[i + 1]]
+                assert 0 <= wait <= (p.horizon if p.max_wait is None else p.max_wait)
+    assert solution.cost == sum(route_cost(p.matrix, route) for route in solution.routes)
+
+
+def test_problem_depots():
+    matrix = np.zeros((6, 6), dtype=np.int64)
+    problem = VrpProblem(matrix, capacities=[5, 5, 5], depots=[0, 1])
+    assert problem.starts.tolist() == [0, 1, 0] and problem.ends.tolist() == [0, 1, 0]
+    assert problem.stops.tolist() == [2, 3, 4, 5]
+    problem = VrpProblem(matrix, depots=[[0, 1], [1, 1]], num_vehicles=2)
+    assert problem.depot_nodes.tolist() == [0, 1]
+    assert problem.capacities.tolist() == [1, 1]
+    assert problem.horizon is None
+
+
+def test_time_transit():
+    matrix = np.array([[0, 4, 6], [4, 0, 3], [6, 3, 0]])
+    problem = VrpProblem(matrix, time_matrix=matrix * 2, time_windows=[[0, 50], [0, 40], [0, 40]],
+                         service_times=[0, 5, 7])
+    assert problem.horizon == 50
+    assert time_transit(problem).tolist() == [[0, 8, 12], [13, 5, 11], [19, 13, 7]]
+    cost_rows, time_rows = transit_rows(problem)
+    assert cost_rows == matrix.tolist() and time_rows == time_transit(problem).tolist()
+    assert transit_rows(VrpProblem(matrix))[1] is None
+
+
+def test_solve_vrp():
+    problem, locations = generate_vrp(num_stops=30, num_vehicles=6, num_depots=2, seed=1)
+    assert locations.shape == (32, 2)
+    assert problem.depot_nodes.tolist() == [0, 1]
+    solution = solve_vrp(problem, time_limit=1.0)
+    assert solution.found and not solution.dropped
+    assert sorted(node for route in solution.routes for node in route[1:-1]) == list(range(2, 32))
+    check_solution(problem, solution)
+    # Improving solutions only
+    costs = [cost for _, cost in solution.history]
+    assert costs == sorted(costs, reverse=True) and len(set(costs)) == len(costs)
+
+
+def test_starts_as_late_as_possible():
+    matrix = np.array([[0, 10], [10, 0]])
+    problem = VrpProblem(matrix, time_windows=[[0, 5000], [1000, 1100]])
+    solution = solve_vrp(problem, "PATH_CHEAPEST_ARC", None)
+    # Leaves the depot as late as the window allows, no waiting on the road
+    assert solution.arrivals == [[1090, 1100, 1110]]
+
+
+def test_dropped_and_inactive():
+    matrix = np.ones((6, 6), dtype=np.int64) - np.eye(6, dtype=np.int64)
+    # Room for two of the four stops
+    problem = VrpProblem(matrix, demands=[0, 1, 1, 1, 1, 0], capacities=[2], depots=[[0, 5]], drop_penalty=100)
+    solution = solve_vrp(problem, time_limit=1.0)
+    assert len(solution.dropped) == 2
+    check_solution(problem, solution)
+
+    model = VrpModel(problem, inactive=[1, 2])
+    solution = model.solve(search_parameters())
+    assert sorted(solution.routes[0][1:-1]) == [3, 4]
+    # Kept out on purpose: not dropped
+    assert solution.dropped == []
+
+
+def test_initial_routes():
+    problem, _ = generate_vrp(num_stops=20, num_vehicles=3, seed=2)
+    first = solve_vrp(problem, time_limit=1.0)
+    routes = [route[1:-1] for route in first.routes]
+    model = VrpModel(problem)
+    assert model.initial_assignment(routes) is not None
+    warm = solve_vrp(problem, time_limit=1.0, initial_routes=routes)
+    assert warm.cost <= first.cost
+    check_solution(problem, warm)
+
+    # Over capacity: solved from the first solution strategy instead
+    everything = [list(range(1, 21)), [], []]
+    assert VrpModel(problem).initial_assignment(everything) is None
+    check_solution(problem, solve_vrp(problem, time_limit=1.0, initial_routes=everything))
+
+
+def test_benchmark():
+    assert cost_at([(0.5, 100), (1.5, 90), (4.0, 80)], 1) == 100
+    assert cost_at([(0.5, 100), (1.5, 90), (4.0, 80)], 5) == 80
+    assert cost_at([(1.5, 90)], 1) is None
+    problem, _ = generate_vrp(num_stops=15, num_vehicles=2, seed=3)
+    record = benchmark_vrp(problem, time_limit=1.0, checkpoints=(1, 2))
+    assert record["num_stops"] == 15 and record["num_depots"] == 1
+    assert record["first_cost"] >= record["cost"]
+    assert list(record["costs_at"]) == [1]
+
+
+@pytest.mark.parametrize("strategy", ["PATH_CHEAPEST_ARC", "SAVINGS"])
+def test_first_solution_only(strategy):
+    problem, _ = generate_vrp(num_stops=15, num_vehicles=3, seed=4)
+    solution = solve_vrp(problem, strategy, None)
+    assert solution.found
+    check_solution(problem, solution)
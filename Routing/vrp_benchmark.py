@@ -0,0 +1,43 @@
+"""Capacitated VRP with time windows on generated instances (100 to 2000 stops, two depots):
+route cost against wall time, written to vrp_benchmark.jsonl, then the same instances
+solved cluster first, route second."""
+
+import json
+
+from routing.benchmark import generate_vrp, run_vrp_benchmark
+from routing.cluster import solve_clustered
+
+# -------------------------------
+# Instance sizes (stops) and search settings
+# -------------------------------
+sizes = [100, 200, 500, 1000, 2000]
+num_depots = 2
+time_limit = 60
+first_solution_strategy = "PATH_CHEAPEST_ARC"
+local_search_metaheuristic = "GUIDED_LOCAL_SEARCH"
+
+# Cluster first, route second: clusters (None: one per CPU), time per cluster, global pass
+num_clusters = None
+cluster_time_limit = 5
+improve_time_limit = 10
+
+if __name__ == "__main__":
+    with open("vrp_benchmark.jsonl", "w", encoding="utf-8") as f:
+        for record in run_vrp_benchmark(sizes, num_depots, time_limit, first_solution_strategy=first_solution_strategy,
+                                        local_search_metaheuristic=local_search_metaheuristic):
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            print(f"{record['num_stops']:5} stops, {record['num_vehicles']:3} vehicles: {record['status']}, "
+                  f"build {record['build_time']:.2f}s, first solution {record['first_solution_time']}s "
+                  f"(cost {record['first_cost']}), final cost {record['cost']}, dropped {record['dropped']}")
+            print("       cost at " + ", ".join(f"{seconds}s: {cost}" for seconds, cost in record["costs_at"].items()))
+
+    for method in ("kmeans", "sweep"):
+        for num_stops in sizes:
+            problem, locations = generate_vrp(num_stops, num_depots=num_depots)
+            solution = solve_clustered(problem, locations, num_clusters, method, cluster_time_limit,
+                                       improve_time_limit, first_solution_strategy, local_search_metaheuristic)
+            stitched = solution.history[0][1] if solution.history else None
+            print(f"{num_stops:5} stops, {method}: {solution.status_name}, clusters {solution.cluster_time:.1f}s "
+                  f"(stitched cost {stitched}), final cost {solution.cost} in {solution.wall_time:.1f}s, "
+                  f"dropped {len(solution.dropped)}, clusters without solution {solution.failed_clusters}")
@@ -3,6 +3,8 @@ import json
 import pandas as pd
 import datetime
 
+from scheduling.ui import render_job_progress
+
 st.set_page_config(
     page_title="Outil de configuration des plannings",
     page_icon="📅",
@@ -110,3 +112,8 @@ with tab3:
         with open(file_name, "w", encoding="utf-8") as f:
             json.dump(parameters, f, ensure_ascii=False, indent=4)
         st.success(f"Paramètres exportés dans `{file_name}` ✅")
+
+    # --------------------------------------------------------------------------------------
+    # 🗓️ Génération du planning en arrière-plan
+    # --------------------------------------------------------------------------------------
+    render_job_progress(parameters)
@@ -1,5 +1,8 @@
 import streamlit as st
 import datetime
+import json
+
+from scheduling import AvailabilityStore
 
 st.set_page_config(page_title="Planning demi-journée compact", layout="wide")
 st.title("👥 Planning demi-journée compact")
@@ -10,50 +13,55 @@ today = datetime.date.today()
 dates = [today + datetime.timedelta(days=i) for i in range(28)]  # 4 semaines
 
 # --- Initialisation session_state ---
-if "availability_halfday" not in st.session_state:
-    st.session_state.availability_halfday = {
-        emp: {d.strftime("%Y-%m-%d"): {"Matin": "Travail", "Après-midi": "Travail"} for d in dates}
-        for emp in employees
-    }
+if "availability_store" not in st.session_state:
+    # Tableau (employés, jours, demi-journées) de booléens : True = Travail
+    store = AvailabilityStore(employees, dates)
+    st.session_state.availability_store = store
+    # Table de départ de la grille, construite une seule fois : les clics sont lus dans "edited_rows"
+    st.session_state.availability_frame = store.to_frame(marks=False)
 
-# --- Grille compacte ---
-st.markdown("Clique sur un carré pour basculer entre Travail (🟩) et Congé (🟥)")
+store = st.session_state.availability_store
 
-# Largeur pour réduire le scroll vertical
-for d in dates:
-    cols = st.columns(len(employees) + 1)
-    cols[0].markdown(f"**{d.strftime('%a %d/%m')}**")  # première colonne = date
+# Une case à cocher par (employé, demi-journée) : cochée = Travail
+column_config = {"Jour": st.column_config.TextColumn("Jour", disabled=True)}
+for column in store.columns:
+    emp, half = column.split(" - ")
+    column_config[column] = st.column_config.CheckboxColumn(
+        f"{emp} {'M' if half == 'Matin' else 'AM'}",
+        help=f"{emp} – {half} : coché = Travail, décoché = Congé",
+        width="small"
+    )
 
-    for i, emp in enumerate(employees):
-        state_m = st.session_state.availability_halfday[emp][d.strftime("%Y-%m-%d")]["Matin"]
-        state_a = st.session_state.availability_halfday[emp][d.strftime("%Y-%m-%d")]["Après-midi"]
 
-        col = cols[i + 1]
-        # Affichage de 2 boutons très petits côte à côte pour matin et après-midi
-        c1, c2 = col.columns(2)
+def write_back():
+    # Seules les cases cliquées depuis le dernier passage sont recopiées dans le tableau
+    store.apply_edits(st.session_state.availability_grid["edited_rows"])
 
-        def toggle(emp=emp, date=d, half="Matin"):
-            cur = st.session_state.availability_halfday[emp][date.strftime("%Y-%m-%d")][half]
-            st.session_state.availability_halfday[emp][date.strftime("%Y-%m-%d")][half] = \
-                "Congé" if cur == "Travail" else "Travail"
 
-        # Matin
-        color_m = "green" if state_m == "Travail" else "red"
-        if c1.button("", key=f"{emp}_{d}_M", on_click=toggle, args=(emp, d, "Matin")):
-            pass
+# --- Grille compacte ---
+@st.fragment
+def availability_grid():
+    # Un clic ne relance que ce fragment, pas toute la page
+    st.markdown("Coche une case pour Travail, décoche-la pour Congé")
+    st.data_editor(
+        st.session_state.availability_frame,
+        use_container_width=True,
+        hide_index=True,
+        height=min(38 + 35 * len(dates), 1000),
+        column_config=column_config,
+        num_rows="fixed",
+        key="availability_grid",
+        on_change=write_back
+    )
+    worked = store.available.sum()
+    st.caption(f"{worked} demi-journées travaillées, {store.available.size - worked} en congé")
 
-        # Après-midi
-        color_a = "green" if state_a == "Travail" else "red"
-        if c2.button("", key=f"{emp}_{d}_A", on_click=toggle, args=(emp, d, "Après-midi")):
-            pass
 
-        # Couleur des boutons via markdown hack
-        c1.markdown(f"<div style='background-color:{color_m}; width:100%; height:20px; border-radius:4px'></div>", unsafe_allow_html=True)
-        c2.markdown(f"<div style='background-color:{color_a}; width:100%; height:20px; border-radius:4px'></div>", unsafe_allow_html=True)
+availability_grid()
 
 # --- Export JSON ---
 if st.button("💾 Exporter demi-journées en JSON"):
     file_name = "disponibilites_compactes.json"
     with open(file_name, "w", encoding="utf-8") as f:
-        json.dump(st.session_state.availability_halfday, f, ensure_ascii=False, indent=4)
+        json.dump(store.to_json(), f, ensure_ascii=False, indent=4)
     st.success(f"✅ Fichier '{file_name}' exporté avec succès.")
@@ -0,0 +1,57 @@
+import json
+
+from scheduling.benchmark import run_benchmark, scaling_table
+
+# -------------------------------
+# Tailles des équipes testées : employés x semaines
+# -------------------------------
+employees = [15, 50, 100, 250, 500]
+weeks = [4, 13, 26, 52]
+
+# Activités, proportion de jours de congé, demi-journées
+num_activities = 5
+leave_density = 0.05
+shifts_per_day = 1
+
+# Résolution : temps limite par cas (s) et nombre de workers
+time_limit = 60.0
+num_workers = 8
+
+# Encodages comparés
+encodings = ["channeled", "reified"]
+sequence_encodings = ["window"]
+
+instances = [
+    {
+        "num_employees": e,
+        "num_weeks": w,
+        "num_activities": num_activities,
+        "leave_density": leave_density,
+        "shifts_per_day": shifts_per_day,
+    }
+    for e in employees
+    for w in weeks
+]
+
+if __name__ == "__main__":
+    # Un processus par cas : mémoire maximale propre à chaque cas
+    records = []
+    with open("benchmark.jsonl", "w", encoding="utf-8") as f:
+        for record in run_benchmark(instances, encodings, sequence_encodings, time_limit, num_workers):
+            records.append(record)
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            case = (f"{record['num_employees']:4} employés x {record['num_weeks']:2} semaines "
+                    f"[{record['encoding']}/{record['sequence_encoding']}]")
+            if record["status"] == "ERROR":
+                print(f"{case} : ❌ {record['error']}")
+                continue
+            memory = "?" if record["peak_rss_mb"] is None else f"{record['peak_rss_mb']:.0f} Mo"
+            print(f"{case} : {record['status']}, construction {record['build_time']:.2f}s, "
+                  f"présolve {record['presolve_time']}s, 1re solution {record['first_solution_time']}s, "
+                  f"objectif {record['objective']}, mémoire {memory}")
+
+    # Courbes de passage à l'échelle
+    for value in ("build_time", "presolve_time", "first_solution_time", "objective", "peak_rss_mb"):
+        print(f"\n{value}")
+        print(scaling_table(records, value))
@@ -0,0 +1,90 @@
+"""Roster (planning) model library shared by code.py, the notebooks and the Streamlit apps.
+
+    from scheduling import RosterModelBuilder, load_parameters
+
+    params = load_parameters("parametres_planning.json")
+    builder = RosterModelBuilder(params)
+    model = builder.build()
+"""
+
+from .availability import AvailabilityStore
+from .batch import RosterJob, generate_plannings, grid_hash, workers_per_job
+from .benchmark import generate_instance, run_benchmark, scaling_table
+from .builder import ACT_OFF, ENCODINGS, FAMILIES, SEQUENCE_ENCODINGS, RosterModelBuilder
+from .cache import CACHE_VERSION, ModelCache, params_key
+from .callbacks import (QueueSolutionCallback, SolutionConsumer, SolutionSnapshot, format_planning,
+                        solve_with_consumer)
+from .excel import PlanningWriter
+from .explain import describe_guard, explain_infeasibility
+from .freedays import place_free_shifts, place_free_shifts_batch
+from .instrument import family_records, parse_solver_log, profile_solve, write_json_lines
+from .jobs import SolveJob, submit_solve
+from .params import RosterParams, load_parameters, working_dates
+from .rolling import RollingResult, solve_rolling
+from .rules import RULE_KINDS, SequenceRule, parse_rule, parse_rules
+from .solution import (RosterSolution, load_archive, load_planning_done, save_archive, save_planning_done,
+                       save_raw)
+from .solve import (RosterResult, add_distance_cut, add_hint_from_grid, find_diverse_plannings, new_solver,
+                    solve_roster, warm_start_model)
+from .stats import activity_counts, activity_ratios, fairness, stack_plannings
+
+__all__ = [
+    "ACT_OFF",
+    "AvailabilityStore",
+    "CACHE_VERSION",
+    "ENCODINGS",
+    "FAMILIES",
+    "ModelCache",
+    "PlanningWriter",
+    "QueueSolutionCallback",
+    "RULE_KINDS",
+    "RollingResult",
+    "RosterJob",
+    "RosterModelBuilder",
+    "RosterParams",
+    "RosterResult",
+    "RosterSolution",
+    "SEQUENCE_ENCODINGS",
+    "SequenceRule",
+    "SolutionConsumer",
+    "SolutionSnapshot",
+    "SolveJob",
+    "activity_counts",
+    "activity_ratios",
+    "add_distance_cut",
+    "add_hint_from_grid",
+    "describe_guard",
+    "explain_infeasibility",
+    "fairness",
+    "family_records",
+    "find_diverse_plannings",
+    "format_planning",
+    "generate_instance",
+    "generate_plannings",
+    "grid_hash",
+    "load_archive",
+    "load_parameters",
+    "load_planning_done",
+    "new_solver",
+    "params_key",
+    "parse_rule",
+    "parse_rules",
+    "parse_solver_log",
+    "place_free_shifts",
+    "place_free_shifts_batch",
+    "profile_solve",
+    "run_benchmark",
+    "save_archive",
+    "save_planning_done",
+    "save_raw",
+    "scaling_table",
+    "solve_rolling",
+    "solve_roster",
+    "solve_with_consumer",
+    "stack_plannings",
+    "submit_solve",
+    "warm_start_model",
+    "workers_per_job",
+    "working_dates",
+    "write_json_lines",
+]
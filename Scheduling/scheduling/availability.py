@@ -0,0 +1,134 @@
+"""Half-day availability held as one (employees, days, 2) NumPy bool array (True = working).
+
+Used by the half-day editors (app8.py, app9.py) instead of nested dicts: the
+editor table, the JSON export and the model inputs are all vectorized views
+of the array, and edits are written back cell by cell.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from .params import HALF_DAYS, LEAVE, WORK
+
+DATE_FORMAT = "%Y-%m-%d"
+DAY_FORMAT = "%a %d/%m"
+WORK_MARK = "✅"
+LEAVE_MARK = "❌"
+
+
+class AvailabilityStore:
+    """Availability of `employees` on `dates`, per half-day (Matin, Après-midi)."""
+
+    def __init__(self, employees, dates, available=None):
+        self.employees = list(employees)
+        self.dates = list(dates)
+        shape = (len(self.employees), len(self.dates), len(HALF_DAYS))
+        if available is None:
+            available = np.ones(shape, dtype=bool)
+        self.available = np.array(available, dtype=bool)
+        if self.available.shape != shape:
+            raise ValueError(f"available must have shape {shape}, got {self.available.shape}")
+        # Labels computed once, not on every rerun
+        self._date_keys = [d.strftime(DATE_FORMAT) for d in self.dates]
+        self._day_labels = [d.strftime(DAY_FORMAT) for d in self.dates]
+        self._columns = [f"{employee} - {half}" for employee in self.employees for half in HALF_DAYS]
+        self._column_index = {column: divmod(i, len(HALF_DAYS)) for i, column in enumerate(self._columns)}
+
+    @property
+    def columns(self):
+        """Editor columns, "<employee> - <half-day>", employee-major."""
+        return self._columns
+
+    @property
+    def day_labels(self):
+        return self._day_labels
+
+    # -------------------
+    #    JSON export
+    # -------------------
+
+    @classmethod
+    def from_json(cls, data):
+        """Reads the app8/app9 export {employee: {"YYYY-MM-DD": {"Matin": ..., "Après-midi": ...}}}."""
+        employees = list(data)
+        date_keys = sorted({key for days in data.values() for key in days})
+        index = {key: d for d, key in enumerate(date_keys)}
+        available = np.ones((len(employees), len(date_keys), len(HALF_DAYS)), dtype=bool)
+        for e, employee in enumerate(employees):
+            for key, halves in data[employee].items():
+                for h, half in enumerate(HALF_DAYS):
+                    available[e, index[key], h] = halves.get(half, WORK) == WORK
+        return cls(employees, [date.fromisoformat(key) for key in date_keys], available)
+
+    def to_json(self):
+        """The nested dict exported by the apps (and read by `RosterParams.from_app_json`)."""
+        states = np.where(self.available, WORK, LEAVE).tolist()
+        return {
+            employee: {key: dict(zip(HALF_DAYS, halves)) for key, halves in zip(self._date_keys, days)}
+            for employee, days in zip(self.employees, states)
+        }
+
+    def shift_availability(self):
+        """(employees, days * 2) array, as `RosterParams.available` with two shifts a day."""
+        return self.available.reshape(len(self.employees), -1)
+
+    def bitmasks(self):
+        """One int per employee, bit 2 * day + half set when working."""
+        bits = self.shift_availability()
+        weights = 1 << np.arange(bits.shape[1], dtype=object)
+        return [int(weights[row].sum()) for row in bits]
+
+    # --------------
+    #    Editor
+    # --------------
+
+    def to_frame(self, marks=True):
+        """Editor table: one row per date ("Jour" first), one column per (employee, half-day).
+
+        Cells are WORK_MARK / LEAVE_MARK, or booleans (checkbox columns) with `marks=False`.
+        """
+        values = np.where(self.available, WORK_MARK, LEAVE_MARK) if marks else self.available
+        # (employees, days, halves) -> (days, employees * halves)
+        values = values.transpose(1, 0, 2).reshape(len(self.dates), -1)
+        frame = pd.DataFrame(values, columns=self._columns)
+        frame.insert(0, "Jour", self._day_labels)
+        return frame
+
+    def set(self, e, d, h, working):
+        """Sets one cell; returns True when it changed."""
+        changed = bool(self.available[e, d, h]) != bool(working)
+        self.available[e, d, h] = working
+        return changed
+
+    def toggle(self, e, d, h):
+        self.available[e, d, h] = not self.available[e, d, h]
+
+    def apply_edits(self, edited_rows):
+        """Writes back only the edited cells of an `st.data_editor` ({row: {column: mark or bool}}).
+
+        Returns the number of cells that actually changed.
+        """
+        changed = 0
+        for row, columns in edited_rows.items():
+            d = int(row)
+            for column, mark in columns.items():
+                cell = self._column_index.get(column)
+                if cell is not None:
+                    working = mark if isinstance(mark, bool) else mark == WORK_MARK
+                    changed += self.set(cell[0], d, cell[1], working)
+        return changed
+
+    def apply_frame(self, frame):
+        """Writes back a whole edited table, touching only the cells that differ.
+
+        Returns the (employee, day, half) indices of the changed cells.
+        """
+        values = frame[self._columns].to_numpy()
+        if values.dtype != bool:
+            values = values == WORK_MARK
+        new = values.reshape(len(self.dates), len(self.employees), len(HALF_DAYS)).transpose(1, 0, 2)
+        changed = np.argwhere(new != self.available)
+        self.available[tuple(changed.T)] = new[tuple(changed.T)]
+        return changed
@@ -0,0 +1,120 @@
+"""Batch generation of alternative plannings for several teams across a process pool."""
+
+import hashlib
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .builder import RosterModelBuilder
+from .params import RosterParams, load_parameters
+from .solve import find_diverse_plannings
+
+
+class RosterJob:
+    """One (team, seed, parameter-set) job.
+
+    `solver_parameters` are CpSolver parameters applied on top of the defaults
+    (e.g. {"linearization_level": 0}); `num_plannings` > 1 asks the job for
+    several distinct plannings (see `find_diverse_plannings`).
+    """
+
+    def __init__(self, team, params, seed=0, solver_parameters=None, name="default", num_plannings=1,
+                 min_distance=1, encoding="channeled"):
+        self.team = team
+        self.params = params
+        self.seed = seed
+        self.solver_parameters = solver_parameters or {}
+        self.name = name
+        self.num_plannings = num_plannings
+        self.min_distance = min_distance
+        self.encoding = encoding
+
+    def to_payload(self):
+        """Picklable form sent to the worker processes."""
+        params = self.params.to_dict() if isinstance(self.params, RosterParams) else self.params
+        return {
+            "team": self.team,
+            "params": params,
+            "seed": self.seed,
+            "solver_parameters": self.solver_parameters,
+            "name": self.name,
+            "num_plannings": self.num_plannings,
+            "min_distance": self.min_distance,
+            "encoding": self.encoding,
+        }
+
+
+def grid_hash(grid):
+    """Hash of an assignment grid, used to deduplicate plannings."""
+    return hashlib.sha1(grid.tobytes() + str(grid.shape).encode()).hexdigest()
+
+
+def workers_per_job(max_processes, total_workers=None):
+    """Splits the CPU budget so that processes x search workers does not oversubscribe the box."""
+    total_workers = total_workers or os.cpu_count() or 1
+    return max(1, total_workers // max_processes)
+
+
+def _run_job(payload, num_workers, time_limit):
+    """Worker entry point: builds the model and returns the plannings found."""
+    builder = RosterModelBuilder(load_parameters(payload["params"]), encoding=payload["encoding"])
+    builder.build()
+    plannings = find_diverse_plannings(
+        builder, payload["num_plannings"], payload["min_distance"], time_limit, num_workers,
+        random_seed=payload["seed"], solver_parameters=payload["solver_parameters"],
+    )
+    return payload, plannings
+
+
+def generate_plannings(jobs, max_processes=None, total_workers=None, time_limit=30.0):
+    """Runs the jobs in a process pool and yields the plannings as they finish.
+
+    Yields dicts {"team", "seed", "name", "grid", "hash"}; a planning already
+    returned for the same team (same grid hash) is not yielded again. A job
+    that fails yields one dict with "grid" and "hash" None and the exception
+    under "error", and the other jobs go on. Jobs are submitted as processes
+    free up: closing the generator early waits for the running jobs only.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return
+    max_processes = max_processes or min(len(jobs), os.cpu_count() or 1)
+    num_workers = workers_per_job(max_processes, total_workers)
+    seen = set()
+    pending = iter(jobs)
+    running = {}
+    executor = ProcessPoolExecutor(max_workers=max_processes)
+
+    def submit_next():
+        job = next(pending, None)
+        if job is not None:
+            running[executor.submit(_run_job, job.to_payload(), num_workers, time_limit)] = job
+
+    try:
+        # No more jobs in flight than processes, so that closing early only waits for the running ones
+        for _ in range(max_processes):
+            submit_next()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = running.pop(future)
+                submit_next()
+                try:
+                    payload, plannings = future.result()
+                except Exception as error:
+                    yield {"team": job.team, "seed": job.seed, "name": job.name, "grid": None, "hash": None,
+                           "error": error}
+                    continue
+                for grid in plannings:
+                    key = (payload["team"], grid_hash(grid))
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    yield {
+                        "team": payload["team"],
+                        "seed": payload["seed"],
+                        "name": payload["name"],
+                        "grid": grid,
+                        "hash": key[1],
+                    }
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,202 @@
+"""Synthetic roster instances and a benchmark runner, to see how the model scales.
+
+    params = generate_instance(num_employees=100, num_weeks=13, leave_density=0.1)
+    for record in run_benchmark([{"num_employees": 15}, {"num_employees": 100}], time_limit=60):
+        print(record)
+
+Every record holds the instance size, the encodings, the model size, the build
+time, the presolve time, the time to the first solution, the best objective and
+the peak RSS. With `isolate=True` (default) each case runs in a fresh process,
+so that the peak RSS is the one of that case and a crash (out of memory) is
+reported instead of stopping the run.
+"""
+
+import math
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from ortools.sat.python import cp_model
+
+from .builder import ENCODINGS, RosterModelBuilder
+from .instrument import capture_log, parse_solver_log
+from .params import RosterParams, working_dates
+from .solve import new_solver
+
+ACTIVITY_NAMES = ["Tél", "Rens", "Dérog", "Récla", "Imp"]
+
+# Share of the available employees required on each activity (the first one is the phone)
+MIN_FRACTIONS = [0.3, 0.15, 0.05, 0.05, 0.05]
+
+
+# ------------------------
+#    Instance generator
+# ------------------------
+
+def _leave_days(rng, num_employees, num_days, leave_density, mean_block=3):
+    """(employees, days) availability with blocks of leave covering about `leave_density` of the days."""
+    available = np.ones((num_employees, num_days), dtype=bool)
+    if leave_density <= 0:
+        return available
+    starts = np.argwhere(rng.random((num_employees, num_days)) < leave_density / mean_block)
+    lengths = rng.integers(1, 2 * mean_block, size=len(starts))
+    for (e, d), length in zip(starts, lengths):
+        available[e, d:d + length] = False
+    return available
+
+
+def _staffing_tables(headcounts, min_fractions, max_fractions, weekdays):
+    """nb_min_staff / nb_max_staff style tables {weekday: {headcount: [per activity]}}."""
+    mins = {h: [math.floor(h * f) for f in min_fractions] for h in headcounts}
+    maxs = {h: [math.ceil(h * f) for f in max_fractions] for h in headcounts}
+    return {day: dict(mins) for day in weekdays}, {day: dict(maxs) for day in weekdays}
+
+
+def generate_instance(num_employees=15, num_weeks=4, num_activities=5, leave_density=0.05, shifts_per_day=1,
+                      seed=0, min_fractions=None, first_date=date(2026, 1, 5), friday_rotation=True):
+    """A random team shaped like the notebooks' ones (phone first, staffing tables keyed by headcount).
+
+    `leave_density` is the share of days off (in blocks of 1 to 5 days);
+    `min_fractions` the share of the available employees required on each
+    activity (MIN_FRACTIONS by default). The maxima are loose enough for every
+    available employee to be placed, so that the instances are feasible unless
+    the leave leaves too few people.
+    """
+    rng = np.random.default_rng(seed)
+    activities = (ACTIVITY_NAMES + [f"Act{a}" for a in range(len(ACTIVITY_NAMES), num_activities)])[:num_activities]
+    dates = working_dates(first_date, num_weeks)
+    days = _leave_days(rng, num_employees, len(dates), leave_density)
+    available = np.repeat(days, shifts_per_day, axis=1)
+
+    if min_fractions is None:
+        min_fractions = (MIN_FRACTIONS + [0.05] * num_activities)[:num_activities]
+    max_fractions = [min(1.0, 2 * f + 1 / num_activities) for f in min_fractions]
+    # Only the headcounts that occur are needed (lookups fall back on the key below otherwise)
+    headcounts = sorted({int(h) for h in available.sum(axis=0)})
+    min_staff, max_staff = _staffing_tables(headcounts, min_fractions, max_fractions, range(5))
+
+    # nb_min_act / nb_max_act style tables keyed by the number of worked shifts in the week
+    week_shifts = range(5 * shifts_per_day + 1)
+    min_per_week = {n: [1 if n >= 2 * shifts_per_day else 0] + [0] * (num_activities - 1) for n in week_shifts}
+    max_per_week = {n: [math.ceil(0.6 * n)] + [math.ceil(0.4 * n)] * (num_activities - 1) for n in week_shifts}
+
+    return RosterParams(
+        employees=[f"Emp{e}" for e in range(num_employees)],
+        activities=activities,
+        dates=dates,
+        available=available,
+        shifts_per_day=shifts_per_day,
+        min_staff=min_staff,
+        max_staff=max_staff,
+        min_per_week=min_per_week,
+        max_per_week=max_per_week,
+        max_consecutive={0: 3},
+        min_diff_activities={0: 0, 3 * shifts_per_day: min(3, num_activities)},
+        friday_activity=0 if friday_rotation else None,
+        same_activity_per_day=shifts_per_day == 2,
+    )
+
+
+# --------------
+#    Runner
+# --------------
+
+# Fields of the records describing the instance, with the `generate_instance` defaults
+INSTANCE_FIELDS = [("num_employees", 15), ("num_weeks", 4), ("num_activities", 5), ("leave_density", 0.05),
+                   ("shifts_per_day", 1), ("seed", 0)]
+
+
+def peak_rss_mb():
+    """Peak memory of the current process (MB), None when it cannot be measured.
+
+    psutil gives the peak working set on Windows; elsewhere the peak resident
+    set size comes from `resource` (Unix only), psutil's current RSS if not.
+    """
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+    try:
+        import psutil
+    except ImportError:
+        return None
+    memory = psutil.Process().memory_info()
+    return getattr(memory, "peak_wset", memory.rss) / 1024 ** 2
+
+
+def _case_record(instance, encoding, sequence_encoding):
+    """Start of a record: the instance size (with the generator defaults) and the encodings."""
+    record = {name: instance.get(name, default) for name, default in INSTANCE_FIELDS}
+    record["encoding"] = encoding
+    record["sequence_encoding"] = sequence_encoding
+    return record
+
+
+def benchmark_case(instance, encoding="channeled", sequence_encoding="window", time_limit=60.0, num_workers=8,
+                   random_seed=0):
+    """Builds and solves one generated instance (`instance` = `generate_instance` kwargs); returns a record."""
+    record = _case_record(instance, encoding, sequence_encoding)
+    params = generate_instance(**instance)
+    start = time.perf_counter()
+    builder = RosterModelBuilder(params, encoding, sequence_encoding)
+    model = builder.build()
+    record["build_time"] = time.perf_counter() - start
+    proto = model.Proto()
+    record["num_variables"] = len(proto.variables)
+    record["num_constraints"] = len(proto.constraints)
+
+    solver = new_solver(time_limit, num_workers, random_seed)
+    log = capture_log(solver)
+    status = solver.Solve(model)
+    record["status"] = solver.StatusName(status)
+    record["presolve_time"], record["first_solution_time"] = parse_solver_log(log)
+    record["wall_time"] = solver.WallTime()
+    found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    # A model without objective reports 0, which is no objective value
+    has_objective = found and bool(builder.objective_terms)
+    record["objective"] = solver.ObjectiveValue() if has_objective else None
+    record["bound"] = solver.BestObjectiveBound() if has_objective else None
+    record["peak_rss_mb"] = peak_rss_mb()
+    return record
+
+
+def run_benchmark(instances, encodings=ENCODINGS, sequence_encodings=("window",), time_limit=60.0, num_workers=8,
+                  random_seed=0, isolate=True):
+    """Runs every instance (dict of `generate_instance` kwargs) with every encoding; yields the records.
+
+    With `isolate=False` the cases run in this process and `peak_rss_mb` is the
+    peak of the process so far (it only grows).
+    """
+    context = multiprocessing.get_context("spawn")
+    for instance in instances:
+        for encoding in encodings:
+            for sequence_encoding in sequence_encodings:
+                args = (instance, encoding, sequence_encoding, time_limit, num_workers, random_seed)
+                if not isolate:
+                    yield benchmark_case(*args)
+                    continue
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    try:
+                        record = executor.submit(benchmark_case, *args).result()
+                    except Exception as error:
+                        # Typically the worker killed when out of memory
+                        record = dict(_case_record(instance, encoding, sequence_encoding),
+                                      status="ERROR", error=repr(error))
+                yield record
+
+
+def scaling_table(records, value="build_time", index=("num_employees", "num_weeks"), columns="encoding"):
+    """One measure of the records as a table (instance sizes x encodings), for the scaling curves."""
+    frame = pd.DataFrame(list(records))
+    if value not in frame:
+        # Only failed cases
+        frame[value] = np.nan
+    return frame.pivot_table(values=value, index=list(index), columns=columns, aggfunc="first")
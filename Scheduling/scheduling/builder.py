@@ -0,0 +1,412 @@
+"""CP-SAT roster model built once from `RosterParams`, with indexed variable lookups."""
+
+import time
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from .params import load_parameters, lookup_table
+from .rules import SequenceRule
+
+ACT_OFF = -1
+
+ENCODINGS = ("channeled", "reified")
+
+# "window": sliding-window sums over the activity literals, "automaton": AddAutomaton per employee
+SEQUENCE_ENCODINGS = ("window", "automaton")
+
+# Constraint families, in the order they are added to the model
+FAMILIES = (
+    "daily_staff",
+    "weekly_activity",
+    "max_consecutive",
+    "window_caps",
+    "distinct_activities",
+    "friday_rotation",
+    "sequence_rules",
+    "period_quotas",
+    "same_activity",
+)
+
+
+class RosterModelBuilder:
+    """Builds the roster CP-SAT model.
+
+    encoding:
+        "channeled": one exactly-one layer of Booleans per available cell, shared
+                     by every constraint family; `tasks[(s, e)]` is an integer view
+                     linked to it.
+        "reified":   the integer variable `tasks[(s, e)]` is the decision variable and
+                     each (cell, activity) Boolean is reified from it once, then cached.
+
+    sequence_encoding (max consecutive days, Friday rotation, `params.sequence_rules`):
+        "window":    sliding-window sums over the activity literals (fastest to solve
+                     on the notebooks' instances).
+        "automaton": one AddAutomaton per (employee, rule), size linear in the horizon.
+
+    explain: every constraint group (and every leave day) is guarded by an
+        enforcement literal, `guards[key]`, for `explain.explain_infeasibility`.
+        Leave cells then get literals too, all false while their guard holds,
+        and count in every rule; the tables keyed by headcount or by worked
+        shifts still read the availability of the parameters.
+
+    Lookups, available after `build()`:
+        tasks[(s, e)]       activity of employee e on shift s (constant ACT_OFF if not available)
+        cells[(e, s)]       literals of every activity for an available cell
+        assigned(e, s, a)   literal "employee e does activity a on shift s" (None if not available)
+
+    `family_stats[family]` gives the build time and the number of variables and
+    constraints added by "variables" and by every constraint family.
+    """
+
+    def __init__(self, params, encoding="channeled", sequence_encoding="window", explain=False):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown encoding {encoding!r}, expected one of {ENCODINGS}")
+        if sequence_encoding not in SEQUENCE_ENCODINGS:
+            raise ValueError(f"Unknown sequence encoding {sequence_encoding!r}, expected one of {SEQUENCE_ENCODINGS}")
+        self.params = load_parameters(params)
+        self.encoding = encoding
+        self.sequence_encoding = sequence_encoding
+        self.explain = explain
+        self.guards = {}
+        self.model = None
+        self.tasks = {}
+        self.cells = {}
+        self._task_list = []
+        self.objective_terms = []
+        self.family_stats = {}
+
+    # -----------------
+    #    Variables
+    # -----------------
+
+    def assigned(self, e, s, a):
+        cell = self.cells.get((e, s))
+        return None if cell is None else cell[a]
+
+    def activity_literals(self, e, shifts, a):
+        """Literals of activity a for employee e over the available cells of `shifts`."""
+        cells = self.cells
+        return [cells[e, s][a] for s in shifts if (e, s) in cells]
+
+    def cell_shifts(self, e, shifts):
+        """The shifts of `shifts` where employee e has a cell (leave cells included in explain mode)."""
+        cells = self.cells
+        return [s for s in shifts if (e, s) in cells]
+
+    def shift_literals(self, s, a):
+        """Literals of activity a for every available employee on shift s."""
+        cells = self.cells
+        return [cells[e, s][a] for e in range(self.params.num_employees) if (e, s) in cells]
+
+    def task_vars(self):
+        """The integer views in (shift, employee) row-major order."""
+        return self._task_list
+
+    def _enforce(self, constraint, *key):
+        """In explain mode, guards `constraint` by the enforcement literal of `key` (shared by its group)."""
+        if self.explain:
+            guard = self.guards.get(key)
+            if guard is None:
+                guard = self.guards[key] = self.model.NewBoolVar(f'guard_{len(self.guards)}')
+            constraint.OnlyEnforceIf(guard)
+        return constraint
+
+    def _add_leave_variables(self, s, e):
+        """Explain mode: a leave cell may work, unless its guard holds."""
+        model, num_activities = self.model, self.params.num_activities
+        task = model.NewIntVar(ACT_OFF, num_activities - 1, f'assign_s{s}_e{e}')
+        self.tasks[(s, e)] = task
+        bools = [model.NewBoolVar(f'x_s{s}_e{e}_a{a}') for a in range(num_activities)]
+        model.AddAtMostOne(bools)
+        model.Add(task == sum((a + 1) * b for a, b in enumerate(bools)) - 1)
+        self._enforce(model.Add(sum(bools) == 0), "leave", e, s)
+        self.cells[(e, s)] = bools
+
+    def _add_variables(self):
+        model, p = self.model, self.params
+        num_activities = p.num_activities
+        for s in range(p.num_shifts):
+            for e in range(p.num_employees):
+                if not p.available[e, s]:
+                    if self.explain:
+                        self._add_leave_variables(s, e)
+                    else:
+                        self.tasks[(s, e)] = model.NewConstant(ACT_OFF)
+                    continue
+                task = model.NewIntVar(0, num_activities - 1, f'assign_s{s}_e{e}')
+                self.tasks[(s, e)] = task
+                if self.encoding == "channeled":
+                    bools = [model.NewBoolVar(f'x_s{s}_e{e}_a{a}') for a in range(num_activities)]
+                    model.AddExactlyOne(bools)
+                    model.Add(task == sum(a * b for a, b in enumerate(bools)))
+                else:
+                    bools = []
+                    for a in range(num_activities):
+                        b = model.NewBoolVar(f'x_s{s}_e{e}_a{a}')
+                        model.Add(task == a).OnlyEnforceIf(b)
+                        model.Add(task != a).OnlyEnforceIf(b.Not())
+                        bools.append(b)
+                self.cells[(e, s)] = bools
+        self._task_list = [self.tasks[(s, e)] for s in range(p.num_shifts) for e in range(p.num_employees)]
+
+    # -------------------
+    #     Constraints
+    # -------------------
+
+    def _add_daily_staff(self):
+        """Min and max staff per activity on every shift, from the headcount-keyed tables."""
+        p = self.params
+        headcount = p.headcount()
+        for s in range(p.num_shifts):
+            if headcount[s] == 0 and not self.explain:
+                # i.e. bank holiday
+                continue
+            mins, maxs = p.staff_bounds(s, int(headcount[s]))
+            # Without a table the maximum is the headcount: no cap (leave cells would make it one)
+            capped = p.weekday_of_shift(s) in p.max_staff
+            for a in range(p.num_activities):
+                lits = self.shift_literals(s, a)
+                if mins[a] > 0 and headcount[s] > 0:
+                    self._enforce(self.model.Add(sum(lits) >= mins[a]), "daily_min", s, a)
+                if capped and maxs[a] < len(lits):
+                    self._enforce(self.model.Add(sum(lits) <= maxs[a]), "daily_max", s, a)
+
+    def _add_weekly_activity(self):
+        """Min and max number of shifts per activity per employee per week."""
+        p = self.params
+        if p.min_per_week is None and p.max_per_week is None:
+            return
+        for e in range(p.num_employees):
+            for w, week in enumerate(p.weeks()):
+                worked = sum(p.available[e, s] for s in week)
+                shifts = self.cell_shifts(e, week)
+                if not shifts:
+                    continue
+                mins = lookup_table(p.min_per_week, worked) if p.min_per_week is not None else None
+                maxs = lookup_table(p.max_per_week, worked) if p.max_per_week is not None else None
+                for a in range(p.num_activities):
+                    lits = self.activity_literals(e, shifts, a)
+                    if mins is not None and mins[a] > 0 and worked:
+                        self._enforce(self.model.Add(sum(lits) >= mins[a]), "weekly_min", e, w, a)
+                    if maxs is not None and maxs[a] < len(lits):
+                        self._enforce(self.model.Add(sum(lits) <= maxs[a]), "weekly_max", e, w, a)
+
+    def _sequence_literals(self, e, shifts, a):
+        """Literal of activity a for every position of `shifts` (constant 0 where not available)."""
+        cells = self.cells
+        return [cells[e, s][a] if (e, s) in cells else self._false for s in shifts]
+
+    def _add_sequence_rule(self, rule, initial_states=None, key=("sequence_rule",)):
+        """Adds a `SequenceRule` for every employee, as window sums or as automata.
+
+        `initial_states` ({employee: state}) carries the automaton state reached
+        before the horizon (run length, blocked positions, or 1 if the last
+        position was the rule's activity); default 0. `key` + (employee,) is the
+        guard key in explain mode, where window sums are always used (automata
+        take no enforcement literal).
+        """
+        p = self.params
+        a = p.activity_index(rule.activity)
+        then = p.activity_index(rule.then) if rule.then is not None else None
+        shifts = p.fridays() if rule.over == "fridays" else list(range(p.num_shifts))
+        initial_states = initial_states or {}
+        use_automaton = self.sequence_encoding == "automaton" and not self.explain
+        if use_automaton:
+            if rule.kind == "forbid":
+                # Two activities involved: the automaton reads the integer views
+                transitions = rule.automaton([ACT_OFF] + list(range(p.num_activities)), a, then)
+            else:
+                transitions = rule.automaton([0, 1], 1)
+            finals = list(range(rule.num_states()))
+        for e in range(p.num_employees):
+            if not any(p.available[e, s] for s in shifts):
+                continue
+            state = initial_states.get(e, 0)
+            guard = key + (e,)
+            if use_automaton:
+                if rule.kind == "forbid":
+                    variables = [self.tasks[(s, e)] for s in shifts]
+                else:
+                    variables = self._sequence_literals(e, shifts, a)
+                self.model.AddAutomaton(variables, state, finals, transitions)
+            elif rule.kind == "forbid":
+                lits = self._sequence_literals(e, shifts, a)
+                next_lits = self._sequence_literals(e, shifts, then)
+                if state:
+                    self._enforce(self.model.Add(next_lits[0] == 0), *guard)
+                for lit1, lit2 in zip(lits, next_lits[1:]):
+                    if lit1 is not self._false and lit2 is not self._false:
+                        self._enforce(self.model.AddBoolOr([lit1.Not(), lit2.Not()]), *guard)
+            else:
+                lits = self._sequence_literals(e, shifts, a)
+                if rule.kind == "max_run":
+                    # At most L in any L + 1 positions; the `state` positions before the horizon count as done
+                    width, cap, first = rule.value + 1, rule.value, -state
+                else:
+                    # At most 1 in any `gap` positions; the first `state` positions are blocked
+                    width, cap, first = rule.value, 1, 0
+                    for lit in lits[:state]:
+                        if lit is not self._false:
+                            self._enforce(self.model.Add(lit == 0), *guard)
+                for start in range(first, len(lits) - width + 1):
+                    window = [lit for lit in lits[max(start, 0):start + width] if lit is not self._false]
+                    bound = cap + min(start, 0)
+                    if len(window) > bound:
+                        self._enforce(self.model.Add(sum(window) <= bound), *guard)
+
+    def _add_max_consecutive(self):
+        """No more than `n` consecutive days (n * shifts_per_day shifts) with the same activity."""
+        p = self.params
+        states = p.initial_states.get("max_consecutive", {})
+        for a, days in p.max_consecutive.items():
+            self._add_sequence_rule(SequenceRule("max_run", a, days * p.shifts_per_day), states.get(a),
+                                    key=("max_consecutive", a))
+
+    def _add_window_caps(self):
+        """At most `cap` shifts of an activity within any window of `window` consecutive shifts."""
+        p = self.params
+        for i, (a, window, cap) in enumerate(p.window_caps):
+            for e in range(p.num_employees):
+                for start in range(p.num_shifts - window + 1):
+                    lits = self.activity_literals(e, range(start, start + window), a)
+                    if len(lits) > cap:
+                        self._enforce(self.model.Add(sum(lits) <= cap), "window_cap", i, e)
+
+    def _add_distinct_activities(self):
+        """Minimum number of different activities per employee per week."""
+        p = self.params
+        if not p.min_diff_activities:
+            return
+        for e in range(p.num_employees):
+            for w, week in enumerate(p.weeks()):
+                worked = sum(p.available[e, s] for s in week)
+                if not worked:
+                    continue
+                required = min(lookup_table(p.min_diff_activities, worked), worked, len(p.diff_activities))
+                if required <= 0:
+                    continue
+                shifts = self.cell_shifts(e, week)
+                has_activity = []
+                for a in p.diff_activities:
+                    b = self.model.NewBoolVar(f'has_act_e{e}_w{w}_a{a}')
+                    # b → the activity appears at least once (enough for a lower bound)
+                    self.model.AddBoolOr(self.activity_literals(e, shifts, a)).OnlyEnforceIf(b)
+                    has_activity.append(b)
+                self._enforce(self.model.Add(sum(has_activity) >= required), "distinct", e, w)
+
+    def _add_friday_rotation(self):
+        """Nobody does `friday_activity` on two consecutive Fridays."""
+        p = self.params
+        if p.friday_activity is None:
+            return
+        rule = SequenceRule("spacing", p.friday_activity, 2, over="fridays")
+        # Employees who did it on the last Friday of the previous planning start blocked
+        self._add_sequence_rule(rule, {e: 1 for e in p.last_friday_employees}, key=("friday_rotation",))
+
+    def _add_sequence_rules(self):
+        """Extra sequence rules of the parameters (max run, forbidden successions, spacing)."""
+        states = self.params.initial_states.get("sequence_rules", {})
+        for i, rule in enumerate(self.params.sequence_rules):
+            self._add_sequence_rule(rule, states.get(i), key=("sequence_rule", i))
+
+    def _add_period_quotas(self):
+        """Min and max number of shifts of an activity over the whole horizon (e.g. Impayés)."""
+        p = self.params
+        for a, (minimums, maximums, min_worked) in p.period_quotas.items():
+            for e in range(p.num_employees):
+                minimum = minimums[e] if isinstance(minimums, (list, tuple)) else minimums
+                maximum = maximums[e] if isinstance(maximums, (list, tuple)) else maximums
+                worked = int(p.available[e].sum())
+                lits = self.activity_literals(e, range(p.num_shifts), a)
+                if minimum > 0 and worked >= min_worked:
+                    self._enforce(self.model.Add(sum(lits) >= minimum), "quota_min", a, e)
+                if maximum < len(lits):
+                    self._enforce(self.model.Add(sum(lits) <= maximum), "quota_max", a, e)
+
+    def _add_same_activity(self):
+        """Soft rule: same activity in the morning and the afternoon (maximized)."""
+        p = self.params
+        if not p.same_activity_per_day or p.shifts_per_day != 2:
+            return
+        for e in range(p.num_employees):
+            for d in range(p.num_days):
+                am, pm = 2 * d, 2 * d + 1
+                if not (p.available[e, am] and p.available[e, pm]):
+                    continue
+                same = self.model.NewBoolVar(f'same_d{d}_e{e}')
+                for a in range(p.num_activities):
+                    self.model.Add(self.assigned(e, am, a) == self.assigned(e, pm, a)).OnlyEnforceIf(same)
+                self.objective_terms.append(same)
+
+    # -------------
+    #     Build
+    # -------------
+
+    def _timed(self, family, add):
+        """Runs one build step and records its wall time and the variables/constraints it added."""
+        proto = self.model.Proto()
+        num_variables, num_constraints = len(proto.variables), len(proto.constraints)
+        start = time.perf_counter()
+        add()
+        self.family_stats[family] = {
+            "time": time.perf_counter() - start,
+            "variables": len(proto.variables) - num_variables,
+            "constraints": len(proto.constraints) - num_constraints,
+        }
+
+    def build(self):
+        """Builds the model once; later calls return the same model."""
+        if self.model is not None:
+            return self.model
+        self.model = cp_model.CpModel()
+        self._false = self.model.NewConstant(0)
+        self._timed("variables", self._add_variables)
+        for family in FAMILIES:
+            self._timed(family, getattr(self, f'_add_{family}'))
+        if self.objective_terms:
+            self.model.Maximize(sum(self.objective_terms))
+        return self.model
+
+    def grid(self, solver):
+        """Returns the solution as a (shifts, employees) int8 array, ACT_OFF where not available."""
+        p = self.params
+        values = [solver.Value(v) for v in self._task_list]
+        return np.array(values, dtype=np.int8).reshape(p.num_shifts, p.num_employees)
+
+    # -----------------------
+    #    Proto index map
+    # -----------------------
+
+    def index_map(self):
+        """Proto indices of the lookups, JSON-compatible (see `from_model`)."""
+        self.build()
+        return {
+            "encoding": self.encoding,
+            "sequence_encoding": self.sequence_encoding,
+            "explain": self.explain,
+            "false": self._false.Index(),
+            "tasks": [v.Index() for v in self._task_list],
+            "cells": [[e, s, [lit.Index() for lit in cell]] for (e, s), cell in self.cells.items()],
+            "objective_terms": [lit.Index() for lit in self.objective_terms],
+            "guards": [[list(key), guard.Index()] for key, guard in self.guards.items()],
+            "family_stats": self.family_stats,
+        }
+
+    @classmethod
+    def from_model(cls, params, model, index_map):
+        """Builder around an already built model (e.g. loaded from a `ModelCache`)."""
+        builder = cls(params, index_map["encoding"], index_map["sequence_encoding"], index_map["explain"])
+        p = builder.params
+        builder.model = model
+        builder._false = model.GetIntVarFromProtoIndex(index_map["false"])
+        builder._task_list = [model.GetIntVarFromProtoIndex(i) for i in index_map["tasks"]]
+        builder.tasks = {(s, e): builder._task_list[s * p.num_employees + e]
+                         for s in range(p.num_shifts) for e in range(p.num_employees)}
+        builder.cells = {(e, s): [model.GetBoolVarFromProtoIndex(i) for i in indices]
+                         for e, s, indices in index_map["cells"]}
+        builder.objective_terms = [model.GetBoolVarFromProtoIndex(i) for i in index_map["objective_terms"]]
+        builder.guards = {tuple(key): model.GetBoolVarFromProtoIndex(i) for key, i in index_map["guards"]}
+        # Stats of the original build (the loaded builder built nothing)
+        builder.family_stats = index_map["family_stats"]
+        return builder
@@ -0,0 +1,117 @@
+"""Content-addressed on-disk cache of built roster models.
+
+The key is a hash of the canonical parameters (`RosterParams.to_dict`, so the
+Streamlit exports and the canonical JSON of the same team share an entry) and
+of the encodings (and of the explain mode). An entry is the model proto (text format, the only one the
+Python CpModel can load back) plus the proto indices of the builder lookups.
+
+    cache = ModelCache()
+    builder = cache.builder("parametres_planning.json")   # built once, then loaded
+"""
+
+import hashlib
+import json
+import os
+
+from ortools.sat.python import cp_model
+
+from .builder import RosterModelBuilder
+from .params import load_parameters
+
+# Bumped whenever the builder changes the models it produces
+CACHE_VERSION = 2
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "scheduling", "models")
+
+
+def params_key(params, encoding="channeled", sequence_encoding="window", explain=False):
+    """sha256 of the canonical parameters, encodings and explain mode."""
+    data = {
+        "version": CACHE_VERSION,
+        "params": load_parameters(params).to_dict(),
+        "encoding": encoding,
+        "sequence_encoding": sequence_encoding,
+        "explain": explain,
+    }
+    text = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ModelCache:
+    """Directory of built models, evicted least recently used beyond `max_entries`.
+
+    The last access of an entry is the modification time of its index file.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_entries=32):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, key):
+        return os.path.join(self.directory, f"{key}.pbtxt"), os.path.join(self.directory, f"{key}.json")
+
+    def __contains__(self, key):
+        return all(os.path.exists(path) for path in self._paths(key))
+
+    def get(self, params, encoding="channeled", sequence_encoding="window", explain=False):
+        """The cached builder (model already built), or None."""
+        params = load_parameters(params)
+        key = params_key(params, encoding, sequence_encoding, explain)
+        model_path, index_path = self._paths(key)
+        try:
+            with open(index_path, encoding="utf-8") as f:
+                index_map = json.load(f)
+            with open(model_path, encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return None
+        model = cp_model.CpModel()
+        model.Proto().parse_text_format(text)
+        os.utime(index_path)
+        return RosterModelBuilder.from_model(params, model, index_map)
+
+    def put(self, builder):
+        """Stores the builder's model; returns its key."""
+        key = params_key(builder.params, builder.encoding, builder.sequence_encoding, builder.explain)
+        model_path, index_path = self._paths(key)
+        model = builder.build()
+        # Written under temporary names first, so that a reader never sees half an entry
+        model.ExportToFile(f"{model_path}.tmp.txt")
+        with open(f"{index_path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(builder.index_map(), f)
+        os.replace(f"{model_path}.tmp.txt", model_path)
+        os.replace(f"{index_path}.tmp", index_path)
+        self.evict()
+        return key
+
+    def builder(self, params, encoding="channeled", sequence_encoding="window", explain=False):
+        """Cached builder for `params`, built and stored on a miss."""
+        builder = self.get(params, encoding, sequence_encoding, explain)
+        if builder is None:
+            builder = RosterModelBuilder(params, encoding, sequence_encoding, explain)
+            self.put(builder)
+        return builder
+
+    def keys(self):
+        """Keys of the entries, least recently used first."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                key = name[:-len(".json")]
+                if key in self:
+                    entries.append((os.path.getmtime(os.path.join(self.directory, name)), key))
+        return [key for _, key in sorted(entries)]
+
+    def evict(self):
+        """Removes the least recently used entries beyond `max_entries`."""
+        keys = self.keys()
+        for key in keys[:max(len(keys) - self.max_entries, 0)]:
+            for path in self._paths(key):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def clear(self):
+        for key in self.keys():
+            for path in self._paths(key):
+                os.remove(path)
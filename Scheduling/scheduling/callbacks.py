@@ -0,0 +1,133 @@
+"""Non-blocking solution callback: the solver thread only snapshots values into a bounded queue."""
+
+import queue
+import threading
+import time
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from .builder import ACT_OFF
+
+
+class SolutionSnapshot:
+    """Values of one intermediate solution, as handed over by `QueueSolutionCallback`."""
+
+    def __init__(self, index, values, wall_time, objective, bound):
+        self.index = index
+        self.values = values
+        self.wall_time = wall_time
+        self.objective = objective
+        self.bound = bound
+
+
+class QueueSolutionCallback(cp_model.CpSolverSolutionCallback):
+    """Snapshots the values of `variables` in bulk and puts them in a bounded queue.
+
+    No formatting happens in the solver thread. When the queue is full the
+    snapshot is dropped (and counted in `dropped`) rather than blocking the
+    search. `shape` reshapes the values (e.g. (shifts, employees) for a grid).
+    """
+
+    def __init__(self, variables, solution_queue=None, maxsize=16, limit=None, shape=None,
+                 dtype=np.int64):
+        cp_model.CpSolverSolutionCallback.__init__(self)
+        # Prebuilt proto indices: one SolutionIntegerValue call per variable, no expression handling.
+        # The response's `solution` field has no bulk (buffer) access in this binding: copying it
+        # whole costs 1.5 ms (15 x 4) and 103 ms (100 x 13) per solution, against 0.15 ms and
+        # 30 ms for the per-cell reads, the model having 6 to 7 times more variables than cells.
+        self._indices = [v.Index() for v in variables]
+        self._shape = shape
+        self._dtype = dtype
+        self.queue = solution_queue if solution_queue is not None else queue.Queue(maxsize=maxsize)
+        self._solution_limit = limit
+        self.solution_count = 0
+        self.dropped = 0
+        # Seconds spent in the callback (solver thread blocked)
+        self.callback_time = 0.0
+
+    @classmethod
+    def for_builder(cls, builder, **kwargs):
+        """Callback on the (shift, employee) grid of a `RosterModelBuilder` (built if needed)."""
+        builder.build()
+        p = builder.params
+        kwargs.setdefault("shape", (p.num_shifts, p.num_employees))
+        kwargs.setdefault("dtype", np.int8)
+        return cls(builder.task_vars(), **kwargs)
+
+    def on_solution_callback(self):
+        start = time.perf_counter()
+        self.solution_count += 1
+        values = np.array(list(map(self.SolutionIntegerValue, self._indices)), dtype=self._dtype)
+        if self._shape is not None:
+            values = values.reshape(self._shape)
+        snapshot = SolutionSnapshot(self.solution_count, values, self.WallTime(), self.ObjectiveValue(),
+                                    self.BestObjectiveBound())
+        try:
+            self.queue.put_nowait(snapshot)
+        except queue.Full:
+            self.dropped += 1
+        if self._solution_limit is not None and self.solution_count >= self._solution_limit:
+            self.StopSearch()
+        self.callback_time += time.perf_counter() - start
+
+
+class SolutionConsumer(threading.Thread):
+    """Background thread calling `handler(snapshot)` for every snapshot of the queue.
+
+    `stop()` is to be called once the solve returns: the snapshots still queued are
+    handled, then the thread ends. If `handler` raises, the exception is kept in
+    `error` and the next snapshots are discarded (the queue keeps draining).
+    """
+
+    _SENTINEL = object()
+
+    def __init__(self, solution_queue, handler):
+        super().__init__(daemon=True)
+        self.queue = solution_queue
+        self.handler = handler
+        self.error = None
+
+    def run(self):
+        while True:
+            snapshot = self.queue.get()
+            if snapshot is self._SENTINEL:
+                return
+            if self.error is not None:
+                continue
+            try:
+                self.handler(snapshot)
+            except Exception as error:
+                self.error = error
+
+    def stop(self):
+        self.queue.put(self._SENTINEL)
+        self.join()
+
+
+def solve_with_consumer(builder, solver, handler, maxsize=16, limit=None):
+    """Solves the builder's model, handing every solution grid to `handler` in a background thread.
+
+    Returns (status, callback). An exception raised by `handler` is raised again
+    once the solve is over.
+    """
+    callback = QueueSolutionCallback.for_builder(builder, maxsize=maxsize, limit=limit)
+    consumer = SolutionConsumer(callback.queue, handler)
+    consumer.start()
+    try:
+        status = solver.Solve(builder.build(), callback)
+    finally:
+        consumer.stop()
+    if consumer.error is not None:
+        raise consumer.error
+    return status, callback
+
+
+def format_planning(grid, employees, activities, width=5):
+    """Text table of a (shifts, employees) grid, one shift per line (as printed in the notebooks)."""
+    labels = {ACT_OFF: "*"}
+    labels.update(enumerate(activities))
+    lines = ["      " + " ".join(f"{str(e)[:width]:{width}}" for e in employees)]
+    for s, row in enumerate(grid):
+        lines.append(f"{s:4}  " + " ".join(f"{labels[int(a)][:width]:{width}}" for a in row))
+    return "\n".join(lines)
@@ -0,0 +1,218 @@
+"""Excel export of plannings (openpyxl write-only mode with shared named styles)."""
+
+from copy import copy
+
+import numpy as np
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import MultiCellRange
+
+from .builder import ACT_OFF
+from .params import DAY_NAMES
+from .stats import activity_counts, activity_ratios
+
+# Colors of the notebooks, by activity index (Tél, Rens, Dérog, Récla, Imp, Libre)
+DEFAULT_COLORS = ["FFFF00", "FFC901", "018CFF", "309C33", "FD1913", "FF66FF"]
+OFF_COLOR = "AAAAAA"
+HEADER_COLOR = "5AF4DA"
+OFF_LABEL = "Off"
+HALF_DAY_LABELS = ["M", "AM"]
+
+# First column of the employees (A: date, B: day, C: half-day)
+FIRST_EMPLOYEE_COLUMN = 4
+
+thin = Side(border_style="thin", color="000000")
+thick = Side(border_style="thick", color="000000")
+center = Alignment(horizontal='center', vertical='center')
+
+# Border of a cell according to its position in the week frame: (top, bottom, left, right) thick?
+BORDER_KINDS = {
+    "inner": (False, False, False, False),
+    "top": (True, False, False, False),
+    "bottom": (False, True, False, False),
+    "left": (False, False, True, False),
+    "right": (False, False, False, True),
+    "top_left": (True, False, True, False),
+    "top_right": (True, False, False, True),
+    "bottom_left": (False, True, True, False),
+    "bottom_right": (False, True, False, True),
+    "top_bottom": (True, True, False, False),
+    "top_bottom_left": (True, True, True, False),
+    "top_bottom_right": (True, True, False, True),
+}
+
+
+def _border(kind):
+    top, bottom, left, right = BORDER_KINDS[kind]
+    return Border(top=thick if top else thin, bottom=thick if bottom else thin,
+                  left=thick if left else thin, right=thick if right else thin)
+
+
+def _border_kind(first_row, last_row, left=False, right=False):
+    vertical = "top_bottom" if first_row and last_row else "top" if first_row else "bottom" if last_row else ""
+    horizontal = "left" if left else "right" if right else ""
+    kind = "_".join(k for k in (vertical, horizontal) if k)
+    return kind or "inner"
+
+
+class PlanningWriter:
+    """Streams plannings into a write-only workbook.
+
+    One named style is registered per (activity colour, border position) pair,
+    so writing a cell only attaches a style name instead of building Font /
+    PatternFill / Alignment / Border objects.
+
+        writer = PlanningWriter(params)
+        for grid in plannings:
+            writer.write_planning(grid)
+        writer.save("Planning.xlsx")
+    """
+
+    def __init__(self, params, colors=None, title="Planning"):
+        self.params = params
+        self.labels = list(params.activities)
+        self.colors = list(colors or DEFAULT_COLORS)
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet(title)
+        self.counter_planning = 0
+        self._row = 0
+        self._merged = []
+        self._style_arrays = {}
+        self._register_styles()
+        self.sheet.column_dimensions['A'].width = 14
+        self.sheet.column_dimensions['B'].width = 14
+
+    # --------------
+    #    Styles
+    # --------------
+
+    def _color(self, activity):
+        if activity == ACT_OFF:
+            return OFF_COLOR
+        return self.colors[activity % len(self.colors)]
+
+    def _register_styles(self):
+        wb = self.workbook
+        for activity in [ACT_OFF] + list(range(len(self.labels))):
+            fill = PatternFill(start_color=self._color(activity), end_color=self._color(activity), fill_type="solid")
+            for kind in BORDER_KINDS:
+                wb.add_named_style(NamedStyle(name=f"act{activity}_{kind}", fill=fill, alignment=center,
+                                              border=_border(kind)))
+        header_fill = PatternFill(start_color=HEADER_COLOR, end_color=HEADER_COLOR, fill_type="solid")
+        wb.add_named_style(NamedStyle(name="planning_title", font=Font(bold=True, size=16), fill=header_fill,
+                                      alignment=center))
+        wb.add_named_style(NamedStyle(name="label", font=Font(bold=True, size=14), alignment=center))
+        wb.add_named_style(NamedStyle(name="employee", font=Font(bold=True, size=10), alignment=center))
+        for kind in BORDER_KINDS:
+            wb.add_named_style(NamedStyle(name=f"label_{kind}", font=Font(bold=True, size=14), alignment=center,
+                                          border=_border(kind)))
+
+    def _cell(self, value, style=None):
+        cell = WriteOnlyCell(self.sheet, value=value)
+        if style is not None:
+            # Resolving a named style is slow: do it once per name, then copy the style ids
+            # (the same way openpyxl copies styles between cells)
+            style_array = self._style_arrays.get(style)
+            if style_array is None:
+                cell.style = style
+                self._style_arrays[style] = cell._style
+            else:
+                cell._style = copy(style_array)
+        return cell
+
+    def _append(self, cells, height=None):
+        self._row += 1
+        if height is not None:
+            self.sheet.row_dimensions[self._row].height = height
+        self.sheet.append(cells)
+
+    def _merge(self, first_row, first_column, last_row, last_column):
+        # Collected and set once in save(): MultiCellRange.add() is linear in the number of ranges
+        self._merged.append(f"{get_column_letter(first_column)}{first_row}:"
+                            f"{get_column_letter(last_column)}{last_row}")
+
+    def activity_label(self, activity):
+        return OFF_LABEL if activity == ACT_OFF else self.labels[activity]
+
+    # ----------------
+    #    Plannings
+    # ----------------
+
+    def write_planning(self, grid):
+        """Appends one planning block; `grid` is a (shifts, employees) array of activity indices."""
+        p = self.params
+        num_employees = p.num_employees
+        last_column = FIRST_EMPLOYEE_COLUMN + num_employees - 1
+        labels = [self.activity_label(a) for a in range(-1, len(self.labels))]
+        self.counter_planning += 1
+
+        # Header
+        self._append([None, self._cell(f"Planning {self.counter_planning}", "planning_title")])
+        self._merge(self._row, 2, self._row, last_column)
+        self._append([self._cell("Date", "label"), None, None]
+                     + [self._cell(employee, "employee") for employee in p.employees])
+
+        spd = p.shifts_per_day
+        for week in p.weeks():
+            days = sorted({p.day_of_shift(s) for s in week})
+            last_shift = len(days) * spd - 1
+            for i, d in enumerate(days):
+                day = p.dates[d]
+                first_row = self._row + 1
+                for h in range(spd):
+                    s = d * spd + h
+                    k = i * spd + h
+                    row_top, row_bottom = k == 0, k == last_shift
+                    kind = _border_kind(row_top, row_bottom)
+                    kind_day = _border_kind(row_top, row_bottom, left=True)
+                    cells = [
+                        self._cell(day.strftime("%d/%m/%y"), "label") if h == 0 else None,
+                        self._cell(DAY_NAMES[day.weekday()] if h == 0 else None, f"label_{kind_day}"),
+                        self._cell(HALF_DAY_LABELS[h] if spd == 2 else None, f"label_{kind}"),
+                    ]
+                    row = grid[s]
+                    for e in range(num_employees):
+                        a = int(row[e])
+                        kind_e = _border_kind(row_top, row_bottom, right=e == num_employees - 1)
+                        cells.append(self._cell(labels[a + 1], f"act{a}_{kind_e}"))
+                    self._append(cells, height=14)
+                if spd > 1:
+                    self._merge(first_row, 1, self._row, 1)
+                    self._merge(first_row, 2, self._row, 2)
+            # Blank row between weeks
+            self._append([])
+        # Blank row between plannings
+        self._append([])
+
+    # ------------------
+    #    Statistics
+    # ------------------
+
+    def write_table(self, title, row_labels, values):
+        """Appends a titled table: one row per label, one column per employee."""
+        for i, (label, row) in enumerate(zip(row_labels, values)):
+            cells = [None, self._cell(title, "label") if i == 0 else None, self._cell(label, "label")]
+            cells.extend(row)
+            self._append(cells)
+        self._append([])
+
+    def write_statistics(self, plannings):
+        """Writes the "Statistiques" and "Ratio" blocks, summed over all plannings.
+
+        `plannings` is the (plannings, shifts, employees) array (or list of grids)
+        already written; nothing is read back from the worksheet.
+        """
+        num_activities = len(self.labels)
+        counts = activity_counts(np.asarray(plannings), num_activities).sum(axis=0)
+        rows = [counts[:, a].tolist() for a in range(num_activities)]
+        rows.append(counts[:, -1].tolist())
+        rows.append(counts.sum(axis=1).tolist())
+        self.write_table("Statistiques", self.labels + [OFF_LABEL, "Total"], rows)
+        ratios = activity_ratios(counts)
+        self.write_table("Ratio", self.labels, [ratios[:, a].round(1).tolist() for a in range(num_activities)])
+
+    def save(self, filename):
+        self.sheet.merged_cells = MultiCellRange(self._merged)
+        self.workbook.save(filename)
@@ -0,0 +1,118 @@
+"""Infeasibility explanation: which rules (and leave days) conflict, in one solve.
+
+The model is built in explain mode (every constraint group guarded by an
+enforcement literal), every guard is assumed, and CP-SAT returns a subset of
+assumptions that is enough for the infeasibility. The guards are mapped back to
+rule names and dates:
+
+    conflict = explain_infeasibility(params)
+    for key, label in conflict or []:
+        print(label)
+"""
+
+from ortools.sat.python import cp_model
+
+from .builder import RosterModelBuilder
+from .params import DAY_NAMES, HALF_DAYS
+from .solve import new_solver
+
+
+def _shift_label(params, s):
+    p = params
+    day = p.dates[p.day_of_shift(s)]
+    label = f"{DAY_NAMES[day.weekday()].lower()} {day.strftime('%d/%m/%Y')}"
+    if p.shifts_per_day == 2:
+        label += f" ({HALF_DAYS[s % 2].lower()})"
+    return label
+
+
+def _week_label(params, w):
+    p = params
+    first_day = p.dates[p.day_of_shift(p.weeks()[w][0])]
+    return f"semaine du {first_day.strftime('%d/%m/%Y')}"
+
+
+def describe_guard(params, key):
+    """Human readable (French) name of a guard key of `RosterModelBuilder(explain=True)`."""
+    p = params
+    family, args = key[0], key[1:]
+
+    def activity(a):
+        return p.activities[p.activity_index(a)]
+
+    def employee(e):
+        return p.employees[e]
+
+    if family in ("daily_min", "daily_max"):
+        s, a = args
+        bound = "minimum" if family == "daily_min" else "maximum"
+        return f"Effectif {bound} {activity(a)} le {_shift_label(p, s)}"
+    if family in ("weekly_min", "weekly_max"):
+        e, w, a = args
+        bound = "Minimum" if family == "weekly_min" else "Maximum"
+        return f"{bound} {activity(a)} par semaine pour {employee(e)} ({_week_label(p, w)})"
+    if family == "max_consecutive":
+        a, e = args
+        return f"Jours consécutifs maximum en {activity(a)} ({p.max_consecutive[a]}) pour {employee(e)}"
+    if family == "window_cap":
+        i, e = args
+        a, window, cap = p.window_caps[i]
+        return f"Au plus {cap} {activity(a)} sur {window} créneaux consécutifs pour {employee(e)}"
+    if family == "distinct":
+        e, w = args
+        return f"Activités différentes par semaine pour {employee(e)} ({_week_label(p, w)})"
+    if family == "friday_rotation":
+        e, = args
+        return f"Pas de {activity(p.friday_activity)} deux vendredis de suite pour {employee(e)}"
+    if family == "sequence_rule":
+        i, e = args
+        return f"Règle « {p.sequence_rules[i].to_text()} » pour {employee(e)}"
+    if family in ("quota_min", "quota_max"):
+        a, e = args
+        bound = "minimum" if family == "quota_min" else "maximum"
+        return f"Quota {bound} {activity(a)} sur la période pour {employee(e)}"
+    if family == "leave":
+        e, s = args
+        return f"Congé de {employee(e)} le {_shift_label(p, s)}"
+    return " ".join(str(k) for k in key)
+
+
+def _solve_with_assumptions(builder, keys, time_limit, num_workers):
+    model = builder.build()
+    # Only feasibility matters here
+    model.ClearObjective()
+    model.ClearAssumptions()
+    model.AddAssumptions([builder.guards[key] for key in keys])
+    solver = new_solver(time_limit, num_workers)
+    status = solver.Solve(model)
+    return status, solver
+
+
+def explain_infeasibility(params, time_limit=30.0, num_workers=8, minimize=False, encoding="channeled"):
+    """Returns the conflicting rules as [(guard key, label)], or None if no conflict was proven.
+
+    One solve with every guard assumed gives a sufficient set of rules. With
+    `minimize=True`, rules are then dropped one by one while the rest stays
+    infeasible (one extra solve per rule of the set), leaving a minimal set.
+    """
+    builder = RosterModelBuilder(params, encoding, explain=True)
+    builder.build()
+    keys = list(builder.guards)
+    status, solver = _solve_with_assumptions(builder, keys, time_limit, num_workers)
+    if status != cp_model.INFEASIBLE:
+        return None
+    key_of = {builder.guards[key].Index(): key for key in keys}
+    core = [key_of[i] for i in solver.SufficientAssumptionsForInfeasibility()]
+
+    if minimize:
+        i = 0
+        while i < len(core):
+            candidate = core[:i] + core[i + 1:]
+            status, solver = _solve_with_assumptions(builder, candidate, time_limit, num_workers)
+            if status == cp_model.INFEASIBLE:
+                # Not needed; the new core may even be smaller than the candidate
+                kept = {key_of[j] for j in solver.SufficientAssumptionsForInfeasibility()}
+                core = [key for key in candidate if key in kept] or candidate
+            else:
+                i += 1
+    return [(key, describe_guard(builder.params, key)) for key in core]
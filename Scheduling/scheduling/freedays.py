@@ -0,0 +1,155 @@
+"""Post-processing stage placing the "free" shifts of a solved planning with a min cost flow.
+
+Replaces the second CP-SAT model of the one-shift notebook (`model_2`): at most
+one free shift per employee per week, for employees working enough that week,
+at most `max_per_shift` employees free per shift (`weekday_caps` for some
+weekdays, e.g. 2 on Monday), never on a protected activity nor below the
+minimum staff of the activity that is given up.
+
+Network (one unit of flow = one free shift):
+
+    source -> employee -> (employee, week) -> (shift, activity) -> shift -> sink
+
+With `fairness=True`, the k-th free shift of an employee costs k (plus what the
+employee already got, see `previous`), so free shifts are spread evenly.
+"""
+
+import numpy as np
+from ortools.graph.python import min_cost_flow
+
+from .solution import RosterSolution
+
+SOURCE = 0
+SINK = 1
+
+
+def _free_shift_arcs(params, grid, free, protected, min_worked, max_per_shift, weekday_caps, fairness, previous):
+    p = params
+    num_shifts, num_employees = grid.shape
+    num_activities = p.num_activities
+    weeks = p.weeks()
+    num_weeks = len(weeks)
+    week_of_shift = np.empty(num_shifts, dtype=np.int64)
+    for w, week in enumerate(weeks):
+        week_of_shift[week] = w
+
+    # Nodes
+    employee_node = 2 + np.arange(num_employees)
+    first_employee_week = 2 + num_employees
+    first_shift_activity = first_employee_week + num_employees * num_weeks
+    first_shift = first_shift_activity + num_shifts * num_activities
+
+    # Cells that may become free
+    worked = np.zeros((num_employees, num_weeks), dtype=np.int64)
+    np.add.at(worked, (slice(None), week_of_shift), (grid >= 0).T)
+    eligible_week = worked >= min_worked
+    eligible = (grid >= 0) & ~np.isin(grid, list(protected) + [free])
+    eligible &= eligible_week[np.arange(num_employees), week_of_shift[:, None]]
+    cell_shifts, cell_employees = np.nonzero(eligible)
+    cell_activities = grid[cell_shifts, cell_employees].astype(np.int64)
+
+    # Surplus of every (shift, activity) over its minimum staff
+    counts = np.zeros((num_shifts, num_activities), dtype=np.int64)
+    np.add.at(counts, (np.nonzero(grid >= 0)[0], grid[grid >= 0].astype(np.int64)), 1)
+    headcount = p.headcount()
+    minimums = np.array([p.staff_bounds(s, int(headcount[s]))[0] for s in range(num_shifts)], dtype=np.int64)
+    surplus = counts - minimums
+    surplus[:, free] = 0
+    shift_activities = np.flatnonzero(surplus > 0)
+
+    caps = np.full(num_shifts, max_per_shift, dtype=np.int64)
+    for s in range(num_shifts):
+        caps[s] = weekday_caps.get(p.weekday_of_shift(s), max_per_shift)
+
+    tails, heads, capacities, costs = [], [], [], []
+    # source -> employee, one arc per possible free shift (increasing cost) or a single one
+    if fairness:
+        already = np.zeros(num_employees, dtype=np.int64) if previous is None else np.asarray(previous)
+        tails.append(np.repeat(SOURCE, num_employees * num_weeks))
+        heads.append(np.repeat(employee_node, num_weeks))
+        capacities.append(np.ones(num_employees * num_weeks, dtype=np.int64))
+        costs.append((already[:, None] + np.arange(num_weeks)).ravel())
+    else:
+        tails.append(np.repeat(SOURCE, num_employees))
+        heads.append(employee_node)
+        capacities.append(np.full(num_employees, num_weeks, dtype=np.int64))
+        costs.append(np.zeros(num_employees, dtype=np.int64))
+    # employee -> (employee, week), at most one free shift a week
+    week_employees, week_numbers = np.nonzero(eligible_week)
+    tails.append(employee_node[week_employees])
+    heads.append(first_employee_week + week_employees * num_weeks + week_numbers)
+    capacities.append(np.ones(len(week_employees), dtype=np.int64))
+    costs.append(np.zeros(len(week_employees), dtype=np.int64))
+    # (employee, week) -> (shift, activity) given up, one arc per eligible cell
+    first_cell_arc = sum(len(t) for t in tails)
+    tails.append(first_employee_week + cell_employees * num_weeks + week_of_shift[cell_shifts])
+    heads.append(first_shift_activity + cell_shifts * num_activities + cell_activities)
+    capacities.append(np.ones(len(cell_shifts), dtype=np.int64))
+    costs.append(np.zeros(len(cell_shifts), dtype=np.int64))
+    # (shift, activity) -> shift, no more than the surplus over the minimum staff
+    tails.append(first_shift_activity + shift_activities)
+    heads.append(first_shift + shift_activities // num_activities)
+    capacities.append(surplus.ravel()[shift_activities])
+    costs.append(np.zeros(len(shift_activities), dtype=np.int64))
+    # shift -> sink, cap per shift
+    tails.append(first_shift + np.arange(num_shifts))
+    heads.append(np.repeat(SINK, num_shifts))
+    capacities.append(caps)
+    costs.append(np.zeros(num_shifts, dtype=np.int64))
+
+    arcs = [np.concatenate(a).astype(np.int64) for a in (tails, heads, capacities, costs)]
+    cell_arcs = first_cell_arc + np.arange(len(cell_shifts))
+    return arcs, cell_arcs, cell_shifts, cell_employees
+
+
+def place_free_shifts(params, grid, free_activity, protected=(0,), min_worked=None, max_per_shift=1,
+                      weekday_caps=None, fairness=False, previous=None):
+    """Returns a copy of `grid` where as many shifts as possible are turned into `free_activity`.
+
+    `protected` activities (by default 0, the phone) are never given up, and
+    employees working fewer than `min_worked` shifts in a week (3 days by
+    default) get no free shift that week. `weekday_caps` overrides
+    `max_per_shift` by weekday ({0: 2} allows two free employees on Monday).
+    `previous` is the number of free shifts each employee already got (used
+    with `fairness`).
+    """
+    p = params
+    grid = np.array(grid.grid if isinstance(grid, RosterSolution) else grid, dtype=np.int8)
+    free = p.activity_index(free_activity)
+    protected = [p.activity_index(a) for a in protected]
+    if min_worked is None:
+        min_worked = 3 * p.shifts_per_day
+    (tails, heads, capacities, costs), cell_arcs, cell_shifts, cell_employees = _free_shift_arcs(
+        p, grid, free, protected, min_worked, max_per_shift, weekday_caps or {}, fairness, previous)
+    if len(cell_arcs) == 0:
+        return grid
+
+    smcf = min_cost_flow.SimpleMinCostFlow()
+    smcf.add_arcs_with_capacity_and_unit_cost(tails, heads, capacities, costs)
+    # Max flow between the nodes with a supply and those with a demand, at min cost
+    bound = int(capacities[tails == SOURCE].sum())
+    smcf.set_node_supply(SOURCE, bound)
+    smcf.set_node_supply(SINK, -bound)
+    status = smcf.solve_max_flow_with_min_cost()
+    if status != smcf.OPTIMAL:
+        raise RuntimeError(f"Min cost flow failed with status {status}")
+    chosen = smcf.flows(cell_arcs) > 0
+    grid[cell_shifts[chosen], cell_employees[chosen]] = free
+    return grid
+
+
+def place_free_shifts_batch(params, plannings, free_activity, fairness=False, carry=False, **kwargs):
+    """`place_free_shifts` on every planning of a (plannings, shifts, employees) array or list of grids.
+
+    With `carry=True` (and `fairness`), the free shifts given in a planning count
+    in the fairness cost of the next one.
+    """
+    free = params.activity_index(free_activity)
+    previous = np.zeros(params.num_employees, dtype=np.int64)
+    results = []
+    for grid in plannings:
+        result = place_free_shifts(params, grid, free, fairness=fairness,
+                                   previous=previous if carry else None, **kwargs)
+        previous += np.count_nonzero(result == free, axis=0)
+        results.append(result)
+    return np.stack(results) if results else np.empty((0, params.num_shifts, params.num_employees), np.int8)
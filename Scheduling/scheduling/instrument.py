@@ -0,0 +1,148 @@
+"""Phase-level timing and model-size records of roster solves, as JSON lines.
+
+    result, records = profile_solve(RosterModelBuilder(params), time_limit=30, output="solves.jsonl")
+
+One run gives one "family" record per build step (variables, then every
+constraint family: build time, variables and constraints added) and one
+"solve" record (presolve and search times, solver counters, presolve log,
+callback overhead), all sharing the same "run" id. The file is read back with
+`pandas.read_json(path, lines=True)` to compare runs.
+"""
+
+import json
+import re
+import uuid
+from datetime import datetime
+
+from ortools.sat.python import cp_model
+
+from .callbacks import QueueSolutionCallback
+from .solve import RosterResult, new_solver
+
+_PRESOLVE_START = re.compile(r"^Starting presolve at ([0-9.]+)s")
+_SEARCH_START = re.compile(r"^Starting search at ([0-9.]+)s")
+_SOLUTION = re.compile(r"^#1\s+([0-9.]+)s")
+
+# Counters of the solver response copied into the "solve" record
+RESPONSE_STATS = (
+    "wall_time",
+    "user_time",
+    "deterministic_time",
+    "num_conflicts",
+    "num_branches",
+    "num_booleans",
+    "num_restarts",
+    "num_binary_propagations",
+    "num_integer_propagations",
+    "num_lp_iterations",
+)
+
+
+def parse_solver_log(lines):
+    """Presolve time and time to the first solution (seconds, None if absent) from a CP-SAT search log."""
+    found = {}
+    for line in lines:
+        for name, pattern in (("presolve", _PRESOLVE_START), ("search", _SEARCH_START), ("first", _SOLUTION)):
+            match = pattern.match(line)
+            if match and name not in found:
+                found[name] = float(match.group(1))
+    presolve_time = None
+    if "presolve" in found and "search" in found:
+        presolve_time = found["search"] - found["presolve"]
+    return presolve_time, found.get("first")
+
+
+def presolve_log(lines):
+    """The presolve part of a CP-SAT search log (from "Starting presolve" to "Starting search")."""
+    section = []
+    for line in lines:
+        if _SEARCH_START.match(line):
+            break
+        if section or _PRESOLVE_START.match(line):
+            section.append(line)
+    return section
+
+
+def capture_log(solver):
+    """Turns on the search log of `solver`, collected in the returned list instead of stdout."""
+    lines = []
+    solver.parameters.log_search_progress = True
+    solver.parameters.log_to_stdout = False
+    solver.log_callback = lines.append
+    return lines
+
+
+def family_records(builder, run=None):
+    """One "family" record per build step of a built `RosterModelBuilder`."""
+    common = _common(builder, run)
+    return [dict(common, event="family", family=family, build_time=stats["time"], variables=stats["variables"],
+                 constraints=stats["constraints"])
+            for family, stats in builder.family_stats.items()]
+
+
+def _common(builder, run):
+    p = builder.params
+    return {
+        "run": run,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "employees": p.num_employees,
+        "shifts": p.num_shifts,
+        "activities": p.num_activities,
+        "encoding": builder.encoding,
+        "sequence_encoding": builder.sequence_encoding,
+    }
+
+
+def write_json_lines(records, output):
+    """Appends the records to `output` (path or text file), one JSON object per line."""
+    if hasattr(output, "write"):
+        for record in records:
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return
+    with open(output, "a", encoding="utf-8") as f:
+        write_json_lines(records, f)
+
+
+def profile_solve(builder, time_limit=30.0, num_workers=8, random_seed=None, solver_parameters=None, run=None,
+                  output=None):
+    """Builds (if needed) and solves with the search log and a snapshot callback; returns (RosterResult, records).
+
+    The records are also appended to `output` (path or text file) when given.
+    Build times are those of the builder's own build, even if it happened earlier
+    (those of the original build for a builder loaded from a `ModelCache`).
+    """
+    run = run or uuid.uuid4().hex[:12]
+    model = builder.build()
+
+    solver = new_solver(time_limit, num_workers, random_seed, solver_parameters)
+    log = capture_log(solver)
+    # Snapshots are taken as in the apps; only the first ones are queued, the others dropped
+    callback = QueueSolutionCallback.for_builder(builder, maxsize=1)
+    status = solver.Solve(model, callback)
+    found = status in (cp_model.FEASIBLE, cp_model.OPTIMAL)
+    result = RosterResult(status, solver, [], builder.grid(solver) if found else None)
+
+    response = solver.ResponseProto()
+    proto = model.Proto()
+    presolve_time, first_solution_time = parse_solver_log(log)
+    record = dict(_common(builder, run), event="solve", status=result.status_name)
+    record.update({
+        "build_time": sum(stats["time"] for stats in builder.family_stats.values()),
+        "variables": len(proto.variables),
+        "constraints": len(proto.constraints),
+        "presolve_time": presolve_time,
+        "first_solution_time": first_solution_time,
+        "objective": result.objective,
+        "bound": solver.BestObjectiveBound() if found else None,
+        "solutions": callback.solution_count,
+        "callback_time": callback.callback_time,
+        "callback_share": callback.callback_time / response.wall_time if response.wall_time > 0 else 0.0,
+        "dropped": callback.dropped,
+    })
+    record.update({name: getattr(response, name) for name in RESPONSE_STATS})
+    record["presolve_log"] = presolve_log(log)
+
+    records = family_records(builder, run) + [record]
+    if output is not None:
+        write_json_lines(records, output)
+    return result, records
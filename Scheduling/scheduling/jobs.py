@@ -0,0 +1,113 @@
+"""Background solve jobs for interactive front-ends (Streamlit apps).
+
+`submit_solve` returns at once; the solve runs in a worker thread (CP-SAT
+releases the GIL) and the caller polls the progress whenever it reruns:
+
+    job = submit_solve(parameters, time_limit=30)
+    ...
+    job.poll()
+    job.history      # [(wall time, objective, bound)] of the solutions so far
+    job.latest       # last solution grid (or None)
+    job.has_objective  # False for models without objective: their history has no meaning
+    job.done()
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ortools.sat.python import cp_model
+
+from .builder import RosterModelBuilder
+from .callbacks import QueueSolutionCallback
+from .params import load_parameters
+from .solve import RosterResult, new_solver
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _default_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="roster-solve")
+        return _executor
+
+
+class SolveJob:
+    """A solve running in an executor, with its progress collected by `poll()`."""
+
+    def __init__(self, params, time_limit=30.0, num_workers=8, random_seed=None, solver_parameters=None,
+                 cache=None, maxsize=64):
+        self.params = load_parameters(params)
+        self.time_limit = time_limit
+        self.history = []
+        self.latest = None
+        self.solution_count = 0
+        self.has_objective = False
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._solver = new_solver(time_limit, num_workers, random_seed, solver_parameters)
+        self._cache = cache
+        self._callback = None
+        self._cancelled = False
+        self._started = None
+        self.future = None
+
+    def _run(self):
+        self._started = time.monotonic()
+        # The model is built in the worker too, so that submitting never blocks the caller
+        if self._cache is not None:
+            builder = self._cache.builder(self.params)
+        else:
+            builder = RosterModelBuilder(self.params)
+        self._callback = QueueSolutionCallback.for_builder(builder, solution_queue=self._queue)
+        self.has_objective = bool(builder.objective_terms)
+        if self._cancelled:
+            return RosterResult(cp_model.UNKNOWN, self._solver, [], None)
+        status = self._solver.Solve(builder.build(), self._callback)
+        best = builder.grid(self._solver) if status in (cp_model.FEASIBLE, cp_model.OPTIMAL) else None
+        return RosterResult(status, self._solver, [], best)
+
+    def poll(self):
+        """Collects the solutions found since the last call; returns how many."""
+        count = 0
+        while True:
+            try:
+                snapshot = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self.history.append((snapshot.wall_time, snapshot.objective, snapshot.bound))
+            self.latest = snapshot.values
+            self.solution_count = snapshot.index
+            count += 1
+        return count
+
+    def elapsed(self):
+        """Seconds since the job started running (0 while it waits for a worker)."""
+        return 0.0 if self._started is None else time.monotonic() - self._started
+
+    def done(self):
+        return self.future is not None and self.future.done()
+
+    def result(self, timeout=None):
+        """The final `RosterResult` (waits for the end of the solve)."""
+        result = self.future.result(timeout)
+        self.poll()
+        if result.best is not None:
+            self.latest = result.best
+        return result
+
+    def cancel(self):
+        """Stops the search; the best solution found so far is kept."""
+        self._cancelled = True
+        if self._callback is not None:
+            self._callback.StopSearch()
+
+
+def submit_solve(params, executor=None, **kwargs):
+    """Starts a `SolveJob` on `executor` (a shared two-thread pool by default) and returns it."""
+    job = SolveJob(params, **kwargs)
+    job.future = (executor or _default_executor()).submit(job._run)
+    return job
@@ -0,0 +1,343 @@
+"""Roster parameters: team, horizon, staffing tables and per-employee rules."""
+
+import json
+import re
+from datetime import date, timedelta
+
+import numpy as np
+
+from .rules import parse_rules
+
+DAY_NAMES = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche"]
+HALF_DAYS = ["Matin", "Après-midi"]
+WORK = "Travail"
+LEAVE = "Congé"
+DAY_FRIDAY = 4
+
+
+def working_dates(first_date, num_weeks, weekdays=(0, 1, 2, 3, 4)):
+    """Returns the worked dates of the horizon (Monday to Friday by default)."""
+    first_monday = first_date - timedelta(days=first_date.weekday())
+    dates = []
+    for i in range(7 * num_weeks):
+        d = first_monday + timedelta(days=i)
+        if d >= first_date and d.weekday() in weekdays:
+            dates.append(d)
+    return dates
+
+
+def lookup_table(table, key):
+    """Returns table[key] for a table keyed by a count (headcount, worked shifts).
+
+    Flat values (list or int) are returned as is. Missing keys fall back on the
+    largest key below, or on the smallest key when `key` is below every key.
+    """
+    if not isinstance(table, dict):
+        return table
+    if key in table:
+        return table[key]
+    keys = sorted(table)
+    below = [k for k in keys if k <= key]
+    return table[below[-1] if below else keys[0]]
+
+
+class RosterParams:
+    """All the inputs of a roster model.
+
+    Cells are indexed by (employee, shift) where shift = day * shifts_per_day + half.
+    Activities are the assignable ones; a cell where the employee is not
+    available is "Off" and gets no activity.
+
+    Staffing tables (`min_staff`, `max_staff`) are keyed by weekday, then either
+    give one list of bounds per activity or a dict {headcount: list} as in the
+    notebooks (nb_min_staff / nb_max_staff). Weekly tables (`min_per_week`,
+    `max_per_week`, `min_diff_activities`) are either flat or keyed by the
+    number of worked shifts in the week (nb_min_act / nb_max_act).
+    """
+
+    def __init__(self, employees, activities, dates, available=None, shifts_per_day=1,
+                 min_staff=None, max_staff=None, min_per_week=None, max_per_week=None,
+                 max_consecutive=None, window_caps=None, min_diff_activities=0,
+                 diff_activities=None, friday_activity=None, last_friday_employees=(),
+                 period_quotas=None, same_activity_per_day=False, sequence_rules=None, initial_states=None):
+        self.employees = list(employees)
+        self.activities = list(activities)
+        self.dates = list(dates)
+        self.shifts_per_day = shifts_per_day
+        if available is None:
+            available = np.ones((len(self.employees), self.num_shifts), dtype=bool)
+        self.available = np.asarray(available, dtype=bool)
+        if self.available.shape != (self.num_employees, self.num_shifts):
+            raise ValueError(f"available must have shape {(self.num_employees, self.num_shifts)}, "
+                             f"got {self.available.shape}")
+        self.min_staff = min_staff or {}
+        self.max_staff = max_staff or {}
+        self.min_per_week = min_per_week
+        self.max_per_week = max_per_week
+        # {activity: max consecutive days}
+        self.max_consecutive = max_consecutive or {}
+        # [(activity, window in shifts, max count within the window)]
+        self.window_caps = list(window_caps or [])
+        self.min_diff_activities = min_diff_activities
+        self.diff_activities = list(range(self.num_activities)) if diff_activities is None else list(diff_activities)
+        # Activity that nobody may do two Fridays in a row (e.g. phone)
+        self.friday_activity = friday_activity
+        self.last_friday_employees = list(last_friday_employees)
+        # {activity: (min, max, min worked shifts for the min to apply)} over the whole horizon;
+        # min and max may also be lists with one bound per employee
+        self.period_quotas = period_quotas or {}
+        self.same_activity_per_day = same_activity_per_day
+        # Extra sequence rules (see rules.py), as `SequenceRule`s or DSL lines
+        self.sequence_rules = parse_rules(sequence_rules)
+        # Sequence states reached before the horizon (see SequenceRule.state_after):
+        # {"max_consecutive": {activity: {employee: state}}, "sequence_rules": {rule index: {employee: state}}}
+        self.initial_states = initial_states or {}
+
+    # -----------------
+    #    Dimensions
+    # -----------------
+
+    @property
+    def num_employees(self):
+        return len(self.employees)
+
+    @property
+    def num_activities(self):
+        return len(self.activities)
+
+    @property
+    def num_days(self):
+        return len(self.dates)
+
+    @property
+    def num_shifts(self):
+        return self.num_days * self.shifts_per_day
+
+    def activity_index(self, activity):
+        """Returns the index of an activity given by name or index."""
+        if isinstance(activity, str):
+            return self.activities.index(activity)
+        return activity
+
+    def day_of_shift(self, s):
+        return s // self.shifts_per_day
+
+    def weekday_of_shift(self, s):
+        return self.dates[self.day_of_shift(s)].weekday()
+
+    def weeks(self):
+        """Returns the list of shifts of every (ISO) week of the horizon."""
+        weeks = {}
+        for d, day in enumerate(self.dates):
+            key = day.isocalendar()[:2]
+            weeks.setdefault(key, []).extend(range(d * self.shifts_per_day, (d + 1) * self.shifts_per_day))
+        return [weeks[key] for key in sorted(weeks)]
+
+    def fridays(self):
+        """Returns the last shift of every Friday of the horizon, in order."""
+        return [(d + 1) * self.shifts_per_day - 1 for d, day in enumerate(self.dates) if day.weekday() == DAY_FRIDAY]
+
+    def headcount(self):
+        """Number of available employees per shift."""
+        return self.available.sum(axis=0)
+
+    def staff_bounds(self, s, headcount):
+        """Returns the (min, max) lists of staff per activity for shift s."""
+        weekday = self.weekday_of_shift(s)
+        mins = lookup_table(self.min_staff.get(weekday, [0] * self.num_activities), headcount)
+        maxs = lookup_table(self.max_staff.get(weekday, [headcount] * self.num_activities), headcount)
+        return list(mins), list(maxs)
+
+    # --------------------
+    #    Serialization
+    # --------------------
+
+    def to_dict(self):
+        """Canonical JSON-compatible form (see `from_dict`)."""
+        def table(t):
+            if isinstance(t, dict):
+                return {str(k): table(v) for k, v in t.items()}
+            return t
+
+        return {
+            "employees": self.employees,
+            "activities": self.activities,
+            "dates": [d.isoformat() for d in self.dates],
+            "shifts_per_day": self.shifts_per_day,
+            "unavailable": [np.flatnonzero(~row).tolist() for row in self.available],
+            "min_staff": table(self.min_staff),
+            "max_staff": table(self.max_staff),
+            "min_per_week": table(self.min_per_week),
+            "max_per_week": table(self.max_per_week),
+            "max_consecutive": table(self.max_consecutive),
+            "window_caps": [list(c) for c in self.window_caps],
+            "min_diff_activities": table(self.min_diff_activities),
+            "diff_activities": self.diff_activities,
+            "friday_activity": self.friday_activity,
+            "last_friday_employees": self.last_friday_employees,
+            "period_quotas": {str(a): list(q) for a, q in self.period_quotas.items()},
+            "same_activity_per_day": self.same_activity_per_day,
+            "sequence_rules": [rule.to_text() for rule in self.sequence_rules],
+            "initial_states": {family: table(states) for family, states in self.initial_states.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds parameters from `to_dict` output."""
+        def table(t):
+            if isinstance(t, dict):
+                return {int(k): table(v) for k, v in t.items()}
+            return t
+
+        employees = data["employees"]
+        dates = [date.fromisoformat(d) for d in data["dates"]]
+        shifts_per_day = data.get("shifts_per_day", 1)
+        available = np.ones((len(employees), len(dates) * shifts_per_day), dtype=bool)
+        for e, shifts in enumerate(data.get("unavailable", [])):
+            available[e, shifts] = False
+        return cls(
+            employees, data["activities"], dates, available, shifts_per_day,
+            min_staff=table(data.get("min_staff")),
+            max_staff=table(data.get("max_staff")),
+            min_per_week=table(data.get("min_per_week")),
+            max_per_week=table(data.get("max_per_week")),
+            max_consecutive=table(data.get("max_consecutive")),
+            window_caps=[tuple(c) for c in data.get("window_caps", [])],
+            min_diff_activities=table(data.get("min_diff_activities", 0)),
+            diff_activities=data.get("diff_activities"),
+            friday_activity=data.get("friday_activity"),
+            last_friday_employees=data.get("last_friday_employees", ()),
+            period_quotas={int(a): tuple(q) for a, q in data.get("period_quotas", {}).items()},
+            same_activity_per_day=data.get("same_activity_per_day", False),
+            sequence_rules=data.get("sequence_rules"),
+            initial_states={family: table(states) for family, states in data.get("initial_states", {}).items()},
+        )
+
+    @classmethod
+    def from_app_json(cls, data, weekdays=(0, 1, 2, 3, 4), year=None):
+        """Builds parameters from the JSON exported by the Streamlit apps.
+
+        Understands `effectifs_journaliers` either per day ({"Min": {day: n}, "Max": ...},
+        app2/app3/app4) or flat ({"min": n, "max": n}, app.py), `jours_consecutifs_max`,
+        `activites_par_employe` and `disponibilites` per day ("Travail" / "Congé") or
+        per half-day ({"Matin": ..., "Après-midi": ...}, app8/app9), in either orientation
+        ({employee: {date: ...}} or {date: {employee: ...}}).
+        Raises ValueError if the staffing or the availability is missing.
+        """
+        missing = [key for key in ("effectifs_journaliers", "disponibilites") if key not in data]
+        if missing:
+            raise ValueError(f"Not an app export: missing {', '.join(missing)}")
+        staffing = data["effectifs_journaliers"]
+        activities = list(staffing)
+        if not activities:
+            activities = list(data.get("jours_consecutifs_max", {}))
+
+        min_staff, max_staff = {}, {}
+        for weekday in weekdays:
+            day_name = DAY_NAMES[weekday]
+            mins, maxs = [], []
+            for activity in activities:
+                bounds = staffing[activity]
+                if "Min" in bounds:
+                    mins.append(int(bounds["Min"].get(day_name, 0)))
+                    maxs.append(int(bounds["Max"].get(day_name, 0)))
+                else:
+                    mins.append(int(bounds.get("min", 0)))
+                    maxs.append(int(bounds.get("max", 0)))
+            min_staff[weekday] = mins
+            max_staff[weekday] = maxs
+
+        max_consecutive = {activities.index(a): int(n) for a, n in data.get("jours_consecutifs_max", {}).items()
+                           if a in activities}
+
+        availability = _parse_availability(data["disponibilites"], year)
+        employees = list(availability)
+        all_dates = sorted({d for days in availability.values() for d in days})
+        dates = [d for d in all_dates if d.weekday() in weekdays]
+        half_day = any(isinstance(v, dict) for days in availability.values() for v in days.values())
+        shifts_per_day = 2 if half_day else 1
+
+        available = np.ones((len(employees), len(dates) * shifts_per_day), dtype=bool)
+        for e, employee in enumerate(employees):
+            for d, day in enumerate(dates):
+                value = availability[employee].get(day, WORK)
+                if half_day:
+                    for h, half in enumerate(HALF_DAYS):
+                        available[e, d * 2 + h] = value.get(half, WORK) == WORK
+                else:
+                    available[e, d] = value == WORK
+
+        return cls(
+            employees, activities, dates, available, shifts_per_day,
+            min_staff=min_staff, max_staff=max_staff,
+            max_consecutive=max_consecutive,
+            min_diff_activities=int(data.get("activites_par_employe", 0)),
+        )
+
+
+def _parse_date(label, year=None, previous=None):
+    """Parses an ISO date or a "Lun 20/10"-like label exported by st.data_editor."""
+    try:
+        return date.fromisoformat(label)
+    except ValueError:
+        pass
+    match = re.search(r"(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?", label)
+    if match is None:
+        raise ValueError(f"Date non reconnue : {label!r}")
+    day, month = int(match.group(1)), int(match.group(2))
+    if match.group(3):
+        y = int(match.group(3))
+        return date(y + 2000 if y < 100 else y, month, day)
+    y = year or (previous.year if previous else date.today().year)
+    parsed = date(y, month, day)
+    if previous is not None and parsed < previous:
+        # The horizon goes over new year
+        parsed = date(y + 1, month, day)
+    return parsed
+
+
+def _parse_availability(raw, year=None):
+    """Returns {employee: {date: value}} whatever the orientation of the export."""
+    if not raw:
+        return {}
+    first_key = next(iter(raw))
+    try:
+        _parse_date(first_key, year)
+        by_date = True
+    except ValueError:
+        by_date = False
+
+    availability = {}
+    previous = None
+    if by_date:
+        for label, employees in raw.items():
+            day = _parse_date(label, year, previous)
+            previous = day
+            for employee, value in employees.items():
+                availability.setdefault(employee, {})[day] = value
+    else:
+        for employee, days in raw.items():
+            availability[employee] = {}
+            previous = None
+            for label, value in days.items():
+                day = _parse_date(label, year, previous)
+                previous = day
+                availability[employee][day] = value
+    return availability
+
+
+def load_parameters(path_or_data, **kwargs):
+    """Loads roster parameters from a JSON file (or an already loaded dict).
+
+    Both the canonical form (`RosterParams.to_dict`) and the Streamlit app
+    exports are accepted.
+    """
+    if isinstance(path_or_data, RosterParams):
+        return path_or_data
+    data = path_or_data
+    if not isinstance(data, dict):
+        with open(path_or_data, encoding="utf-8") as f:
+            data = json.load(f)
+    if "employees" in data:
+        return RosterParams.from_dict(data)
+    return RosterParams.from_app_json(data, **kwargs)
@@ -0,0 +1,205 @@
+"""Rolling-horizon solve of long plannings: overlapping week windows, committed prefix frozen.
+
+    result = solve_rolling(params, window_weeks=4, overlap_weeks=1, time_limit=20)
+    result.grid        # (shifts, employees) planning of the whole horizon
+
+Each window is an ordinary model over a few weeks. Once solved, its weeks
+but the overlap are committed and never solved again; the next window starts
+at the first uncommitted week and gets the state reached at the boundary:
+
+    - sequence rules and max consecutive days: the automaton state (run length,
+      blocked positions) after the committed cells (`initial_states`),
+    - Friday rotation: who did the Friday activity on the last committed Friday,
+    - period quotas (Impayés): the count already done, turned into bounds for
+      the window (exact on the last window, pro rata of the worked shifts before).
+
+Windows start on a Monday, so the weekly rules stay exact. Window caps
+(`window_caps`) are not carried across the boundary. The overlap weeks of a
+window hint the next one. Only one window model is alive at a time, so the
+memory is bounded by the window size and the time grows linearly with the
+horizon.
+"""
+
+import math
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from .builder import ACT_OFF, RosterModelBuilder
+from .params import RosterParams, load_parameters
+from .rules import SequenceRule
+from .solve import add_hint_from_grid, new_solver
+
+
+class RollingResult:
+    """Planning of the whole horizon plus one summary dict per solved window.
+
+    If a window has no solution, the planning stops there: the shifts not
+    committed are ACT_OFF and `found` is False.
+    """
+
+    def __init__(self, grid, windows, committed):
+        self.grid = grid
+        self.windows = windows
+        self.committed = committed
+
+    @property
+    def found(self):
+        return self.committed == self.grid.shape[0]
+
+    @property
+    def wall_time(self):
+        return sum(window["wall_time"] for window in self.windows)
+
+
+def _bound(value, e):
+    return value[e] if isinstance(value, (list, tuple)) else value
+
+
+class Boundary:
+    """State of the cross-window rules at shift `shift` (see `boundary_states`)."""
+
+    def __init__(self, shift, initial_states, last_friday_employees, done):
+        self.shift = shift
+        self.initial_states = initial_states
+        self.last_friday_employees = last_friday_employees
+        # {quota activity: shifts already done per employee}
+        self.done = done
+
+
+def boundary_states(params, grid, first_shift, previous=None):
+    """State of the cross-window rules after the cells of `grid` before `first_shift`, as a `Boundary`.
+
+    From a `previous` boundary (at an earlier shift), only the cells between the
+    two are read, so that a whole horizon is scanned once.
+    """
+    p = params
+    if previous is None:
+        previous = Boundary(0, p.initial_states, list(p.last_friday_employees),
+                            {a: np.zeros(p.num_employees, dtype=np.int64) for a in p.period_quotas})
+    shifts = slice(previous.shift, first_shift)
+    fridays = [s for s in p.fridays() if previous.shift <= s < first_shift]
+    sequences = {"shifts": shifts, "fridays": fridays}
+
+    def states(rule, before):
+        a = p.activity_index(rule.activity)
+        then = p.activity_index(rule.then) if rule.then is not None else None
+        cells = sequences[rule.over]
+        return {e: rule.state_after(grid[cells, e], a, then, before.get(e, 0)) for e in range(p.num_employees)}
+
+    before = previous.initial_states.get("max_consecutive", {})
+    max_consecutive = {a: states(SequenceRule("max_run", a, days * p.shifts_per_day), before.get(a, {}))
+                       for a, days in p.max_consecutive.items()}
+    before = previous.initial_states.get("sequence_rules", {})
+    sequence_rules = {i: states(rule, before.get(i, {})) for i, rule in enumerate(p.sequence_rules)}
+    initial_states = {"max_consecutive": max_consecutive, "sequence_rules": sequence_rules}
+
+    last_friday_employees = list(previous.last_friday_employees)
+    if p.friday_activity is not None and fridays:
+        friday_activity = p.activity_index(p.friday_activity)
+        last_friday_employees = np.flatnonzero(grid[fridays[-1]] == friday_activity).tolist()
+
+    done = {a: previous.done[a] + np.count_nonzero(grid[shifts] == p.activity_index(a), axis=0)
+            for a in p.period_quotas}
+    return Boundary(first_shift, initial_states, last_friday_employees, done)
+
+
+def window_params(params, first_week, last_week, grid, boundary=None):
+    """Parameters of the weeks [first_week, last_week) of `params`, continuing the cells of `grid` before them.
+
+    `boundary` is the `Boundary` at the first shift of the window, computed if not given.
+    """
+    p = params
+    weeks = p.weeks()
+    first_shift, end_shift = weeks[first_week][0], weeks[last_week - 1][-1] + 1
+    first_day, end_day = p.day_of_shift(first_shift), p.day_of_shift(end_shift - 1) + 1
+    if boundary is None:
+        boundary = boundary_states(p, grid, first_shift)
+    done = boundary.done
+
+    # Quotas left for the window: what remains on the last window; before it, the share of the
+    # quota due (min) or allowed (max) by the end of the window, and never so little a minimum
+    # that the rest cannot be caught up
+    period_quotas = {}
+    last = last_week == len(weeks)
+    for a, (minimums, maximums, min_worked) in p.period_quotas.items():
+        mins, maxs = [], []
+        for e in range(p.num_employees):
+            worked = int(p.available[e].sum())
+            in_window = int(p.available[e, first_shift:end_shift].sum())
+            after = int(p.available[e, end_shift:].sum())
+            minimum = _bound(minimums, e) if worked >= min_worked else 0
+            maximum = _bound(maximums, e)
+            if not last and worked:
+                share = (worked - after) / worked
+                minimum = max(math.floor(minimum * share), minimum - after)
+                maximum = max(math.ceil(maximum * share), minimum)
+            mins.append(min(max(minimum - int(done[a][e]), 0), in_window))
+            maxs.append(max(maximum - int(done[a][e]), 0))
+        period_quotas[a] = (mins, maxs, 0)
+
+    return RosterParams(
+        p.employees, p.activities, p.dates[first_day:end_day], p.available[:, first_shift:end_shift],
+        p.shifts_per_day,
+        min_staff=p.min_staff,
+        max_staff=p.max_staff,
+        min_per_week=p.min_per_week,
+        max_per_week=p.max_per_week,
+        max_consecutive=p.max_consecutive,
+        window_caps=p.window_caps,
+        min_diff_activities=p.min_diff_activities,
+        diff_activities=p.diff_activities,
+        friday_activity=p.friday_activity,
+        last_friday_employees=boundary.last_friday_employees,
+        period_quotas=period_quotas,
+        same_activity_per_day=p.same_activity_per_day,
+        sequence_rules=p.sequence_rules,
+        initial_states=boundary.initial_states,
+    )
+
+
+def solve_rolling(params, window_weeks=4, overlap_weeks=1, time_limit=30.0, num_workers=8, random_seed=None,
+                  solver_parameters=None, encoding="channeled", sequence_encoding="window"):
+    """Solves the horizon window by window; `time_limit` is per window. Returns a `RollingResult`."""
+    if not 0 <= overlap_weeks < window_weeks:
+        raise ValueError("overlap_weeks must be in [0, window_weeks)")
+    p = load_parameters(params)
+    weeks = p.weeks()
+    grid = np.full((p.num_shifts, p.num_employees), ACT_OFF, dtype=np.int8)
+    # Cells of the last window beyond the committed ones, used as hints
+    hint = grid.copy()
+    windows = []
+    first_week = 0
+    # State at the start of the window, carried forward from one window to the next
+    boundary = None
+    while first_week < len(weeks):
+        last_week = min(first_week + window_weeks, len(weeks))
+        committed_week = last_week if last_week == len(weeks) else last_week - overlap_weeks
+        first_shift, end_shift = weeks[first_week][0], weeks[last_week - 1][-1] + 1
+
+        boundary = boundary_states(p, grid, first_shift, boundary)
+        builder = RosterModelBuilder(window_params(p, first_week, last_week, grid, boundary), encoding,
+                                     sequence_encoding)
+        model = builder.build()
+        add_hint_from_grid(builder, hint[first_shift:end_shift], model)
+        solver = new_solver(time_limit, num_workers, random_seed, solver_parameters)
+        status = solver.Solve(model)
+        found = status in (cp_model.FEASIBLE, cp_model.OPTIMAL)
+        windows.append({
+            "first_week": first_week,
+            "last_week": last_week,
+            "status": solver.StatusName(status),
+            "wall_time": solver.WallTime(),
+            "objective": solver.ObjectiveValue() if found else None,
+        })
+        if not found:
+            break
+
+        window_grid = builder.grid(solver)
+        hint[first_shift:end_shift] = window_grid
+        commit_end = weeks[committed_week - 1][-1] + 1
+        grid[first_shift:commit_end] = window_grid[:commit_end - first_shift]
+        first_week = committed_week
+
+    committed = weeks[first_week][0] if first_week < len(weeks) else p.num_shifts
+    return RollingResult(grid, windows, committed)
@@ -0,0 +1,132 @@
+"""Sequence rules (max run, forbidden successions, rotation spacing) compiled to CP-SAT automata.
+
+Rules are written one per line:
+
+    max_run Téléphone 6             at most 6 consecutive positions of the activity
+    forbid Impayés -> Réclamation   Réclamation never right after Impayés
+    spacing Téléphone 2 on fridays  two Téléphone at least 2 positions apart, Fridays only
+
+A position is a shift (or a Friday with "on fridays"); an "Off" position breaks
+runs and successions, and counts as a position for the spacing.
+"""
+
+import shlex
+
+RULE_KINDS = ("max_run", "forbid", "spacing")
+SEQUENCES = ("shifts", "fridays")
+
+
+class SequenceRule:
+    """One sequence rule on the activity sequence of every employee.
+
+    kind:
+        "max_run":  at most `value` consecutive positions of `activity`.
+        "forbid":   `then` never directly follows `activity`.
+        "spacing":  two positions of `activity` are at least `value` apart.
+    `over` is the sequence: every shift ("shifts") or the last shift of every
+    Friday ("fridays").
+    """
+
+    def __init__(self, kind, activity, value=None, then=None, over="shifts"):
+        if kind not in RULE_KINDS:
+            raise ValueError(f"Unknown rule {kind!r}, expected one of {RULE_KINDS}")
+        if over not in SEQUENCES:
+            raise ValueError(f"Unknown sequence {over!r}, expected one of {SEQUENCES}")
+        if kind == "forbid" and then is None:
+            raise ValueError("A forbid rule needs the activity that may not follow")
+        if kind != "forbid" and (value is None or value < 1):
+            raise ValueError(f"A {kind} rule needs a positive value")
+        self.kind = kind
+        self.activity = activity
+        self.value = value
+        self.then = then
+        self.over = over
+
+    def __repr__(self):
+        return f"SequenceRule({self.to_text()!r})"
+
+    def to_text(self):
+        """The DSL line of the rule (see `parse_rule`)."""
+        if self.kind == "forbid":
+            text = f"forbid {shlex.quote(str(self.activity))} -> {shlex.quote(str(self.then))}"
+        else:
+            text = f"{self.kind} {shlex.quote(str(self.activity))} {self.value}"
+        return text if self.over == "shifts" else f"{text} on {self.over}"
+
+    def num_states(self):
+        if self.kind == "max_run":
+            return self.value + 1
+        if self.kind == "spacing":
+            return self.value
+        return 2
+
+    def automaton(self, labels, activity, then=None):
+        """Transitions [(state, label, next state)] over `labels` (the values of the cells).
+
+        States: run length so far ("max_run"), positions still blocked
+        ("spacing"), 1 if the last position was `activity` ("forbid"). Every
+        state is final; a missing transition is a forbidden label.
+        """
+        transitions = []
+        for state in range(self.num_states()):
+            for label in labels:
+                if self.kind == "max_run":
+                    target = 0 if label != activity else state + 1 if state < self.value else None
+                elif self.kind == "spacing":
+                    if label == activity:
+                        target = self.value - 1 if state == 0 else None
+                    else:
+                        target = max(state - 1, 0)
+                else:
+                    target = None if state == 1 and label == then else int(label == activity)
+                if target is not None:
+                    transitions.append((state, label, target))
+        return transitions
+
+    def state_after(self, values, activity, then=None, state=0):
+        """Automaton state (see `automaton`) reached after the cell values `values`, from `state`.
+
+        Used to carry a rule across the boundary of two plannings. A violation
+        in `values` is not reported: the state is clamped.
+        """
+        for value in values:
+            if self.kind == "max_run":
+                state = min(state + 1, self.value) if value == activity else 0
+            elif self.kind == "spacing":
+                state = self.value - 1 if value == activity else max(state - 1, 0)
+            else:
+                state = int(value == activity)
+        return state
+
+
+def parse_rule(line):
+    """Parses one DSL line into a `SequenceRule` (activities by name or index)."""
+    words = shlex.split(line)
+    over = "shifts"
+    if len(words) > 2 and words[-2] == "on":
+        over = words[-1]
+        words = words[:-2]
+
+    def activity(word):
+        return int(word) if word.lstrip("-").isdigit() else word
+
+    if len(words) == 4 and words[0] == "forbid" and words[2] == "->":
+        return SequenceRule("forbid", activity(words[1]), then=activity(words[3]), over=over)
+    if len(words) == 3 and words[0] in ("max_run", "spacing"):
+        return SequenceRule(words[0], activity(words[1]), int(words[2]), over=over)
+    raise ValueError(f"Cannot parse rule {line!r}")
+
+
+def parse_rules(rules):
+    """Rules from DSL text (one per line, '#' comments), DSL lines or `SequenceRule`s."""
+    if isinstance(rules, str):
+        rules = rules.splitlines()
+    parsed = []
+    for rule in rules or ():
+        if isinstance(rule, str):
+            rule = rule.split("#", 1)[0].strip()
+            if not rule:
+                continue
+            rule = parse_rule(rule)
+        parsed.append(rule)
+    return parsed
@@ -0,0 +1,173 @@
+"""Compact planning solutions and their on-disk archive."""
+
+import json
+from datetime import datetime
+
+import numpy as np
+
+from .builder import ACT_OFF
+
+
+class RosterSolution:
+    """One planning: a contiguous (shifts, employees) int8 grid plus metadata.
+
+    Grid values are activity indices, ACT_OFF (-1) where the employee is not available.
+    `meta` holds anything JSON-compatible (status, objective, seed, team, ...).
+    """
+
+    def __init__(self, grid, employees=None, activities=None, meta=None):
+        self.grid = np.ascontiguousarray(grid, dtype=np.int8)
+        if self.grid.ndim != 2:
+            raise ValueError(f"grid must be (shifts, employees), got shape {self.grid.shape}")
+        self.employees = list(employees) if employees is not None else [str(e) for e in range(self.grid.shape[1])]
+        self.activities = list(activities) if activities is not None else []
+        self.meta = dict(meta or {})
+
+    @classmethod
+    def from_builder(cls, builder, solver, **meta):
+        """Snapshots the current solution of `solver` on the builder's model."""
+        p = builder.params
+        meta.setdefault("created", datetime.now().isoformat(timespec="seconds"))
+        meta.setdefault("objective", solver.ObjectiveValue() if builder.objective_terms else None)
+        return cls(builder.grid(solver), p.employees, p.activities, meta)
+
+    @property
+    def num_shifts(self):
+        return self.grid.shape[0]
+
+    @property
+    def num_employees(self):
+        return self.grid.shape[1]
+
+    def __eq__(self, other):
+        return isinstance(other, RosterSolution) and np.array_equal(self.grid, other.grid)
+
+    def __hash__(self):
+        return hash(self.grid.tobytes())
+
+    def distance(self, other):
+        """Number of cells where the two plannings differ (Hamming distance)."""
+        return int(np.count_nonzero(self.grid != np.asarray(other.grid if isinstance(other, RosterSolution) else other)))
+
+    def diff(self, other):
+        """Returns the differing cells as a list of (shift, employee, activity here, activity there)."""
+        other_grid = np.asarray(other.grid if isinstance(other, RosterSolution) else other)
+        shifts, employees = np.nonzero(self.grid != other_grid)
+        return [(int(s), int(e), int(self.grid[s, e]), int(other_grid[s, e])) for s, e in zip(shifts, employees)]
+
+    def label(self, activity):
+        return "Off" if activity == ACT_OFF else self.activities[activity]
+
+
+def save_archive(filename, solutions):
+    """Saves solutions of the same team in one compressed `.npz` archive.
+
+    Grids are stored as a single (plannings, shifts, employees) int8 array;
+    names, activities and per-solution metadata go in a JSON header.
+    """
+    solutions = list(solutions)
+    if not solutions:
+        raise ValueError("Nothing to archive")
+    first = solutions[0]
+    header = {
+        "employees": first.employees,
+        "activities": first.activities,
+        "meta": [s.meta for s in solutions],
+    }
+    grids = np.stack([s.grid for s in solutions])
+    np.savez_compressed(filename, grids=grids, header=np.array(json.dumps(header, ensure_ascii=False)))
+
+
+def load_archive(filename, mmap=False):
+    """Loads the solutions of an archive written by `save_archive` or `save_raw`.
+
+    With `mmap=True` the archive must be a raw one (see `save_raw`) and the grids
+    are memory-mapped instead of read.
+    """
+    if mmap:
+        with open(f"{filename}.json", encoding="utf-8") as f:
+            header = json.load(f)
+        grids = np.memmap(f"{filename}.grids", dtype=np.int8, mode="r", shape=tuple(header["shape"]))
+    else:
+        with np.load(filename) as archive:
+            header = json.loads(str(archive["header"]))
+            grids = archive["grids"]
+    return [RosterSolution(grids[i], header["employees"], header["activities"], meta)
+            for i, meta in enumerate(header["meta"])]
+
+
+def save_raw(filename, solutions):
+    """Saves the grids as a raw int8 file (`<filename>.grids`) plus a JSON header (`<filename>.json`).
+
+    The raw layout can be memory-mapped by `load_archive(filename, mmap=True)`, which
+    keeps thousands of plannings on disk until they are actually read.
+    """
+    solutions = list(solutions)
+    if not solutions:
+        raise ValueError("Nothing to archive")
+    grids = np.stack([s.grid for s in solutions])
+    grids.tofile(f"{filename}.grids")
+    header = {
+        "shape": list(grids.shape),
+        "employees": solutions[0].employees,
+        "activities": solutions[0].activities,
+        "meta": [s.meta for s in solutions],
+    }
+    with open(f"{filename}.json", "w", encoding="utf-8") as f:
+        json.dump(header, f, ensure_ascii=False)
+
+
+def save_planning_done(filename, grid, shifts=None, employees=None, activities=None):
+    """Exports the published shifts of a planning as JSON, in the notebooks' `planning_done` layout.
+
+    `planning_done` maps each shift to the list of activities of the employees
+    (ACT_OFF where the employee is off); `shifts` selects the published shifts
+    (all of them by default).
+    """
+    grid = np.asarray(grid.grid if isinstance(grid, RosterSolution) else grid)
+    shifts = range(grid.shape[0]) if shifts is None else shifts
+    data = {
+        "employees": list(employees) if employees is not None else None,
+        "activities": list(activities) if activities is not None else None,
+        "planning_done": {str(s): grid[s].tolist() for s in shifts},
+    }
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+
+
+def load_planning_done(source, params, index=0, frozen_shifts=None, published_until=None):
+    """Loads a previous or partial planning as (grid, frozen_shifts).
+
+    `source` is a `planning_done` dict ({shift: [activity per employee]}, as in
+    the two-shift notebook), a JSON file holding one, an `.npz` archive (solution
+    `index`), a `RosterSolution` or a full grid. Codes outside the activity range
+    (the notebooks' "off" code) become ACT_OFF.
+
+    `frozen_shifts` lists the published shifts, to be fixed by
+    `warm_start_model`; `published_until` is the same as the shifts before that
+    one. By default, the shifts of a `planning_done` dict are the published
+    ones and no shift of a full planning (archive, solution, grid) is: it is
+    only a hint. For every source, the shifts not frozen are only hinted.
+    """
+    if isinstance(source, str):
+        if source.endswith(".npz"):
+            source = load_archive(source)[index]
+        else:
+            with open(source, encoding="utf-8") as f:
+                source = json.load(f)
+            source = source.get("planning_done", source)
+    grid = np.full((params.num_shifts, params.num_employees), ACT_OFF, dtype=np.int8)
+    if isinstance(source, dict):
+        found = sorted(int(s) for s in source)
+        for s in found:
+            row = np.asarray(source[s] if s in source else source[str(s)])
+            grid[s] = np.where((row >= 0) & (row < params.num_activities), row, ACT_OFF)
+    else:
+        values = np.asarray(source.grid if isinstance(source, RosterSolution) else source)
+        grid[:] = np.where((values >= 0) & (values < params.num_activities), values, ACT_OFF)
+        found = []
+    if published_until is not None:
+        frozen_shifts = range(min(published_until, params.num_shifts))
+    if frozen_shifts is None:
+        frozen_shifts = found
+    return grid, sorted(int(s) for s in frozen_shifts)
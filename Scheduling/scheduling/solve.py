@@ -0,0 +1,146 @@
+"""Solving helpers on top of `RosterModelBuilder`."""
+
+import queue
+
+from ortools.sat.python import cp_model
+
+from .builder import ACT_OFF
+from .callbacks import QueueSolutionCallback
+
+
+def new_solver(time_limit=30.0, num_workers=8, random_seed=None, solver_parameters=None):
+    """CpSolver with the parameters used by the notebooks, plus optional extra `solver_parameters`."""
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    solver.parameters.num_search_workers = num_workers
+    if random_seed is not None:
+        solver.parameters.random_seed = random_seed
+    for name, value in (solver_parameters or {}).items():
+        setattr(solver.parameters, name, value)
+    return solver
+
+
+def add_hint_from_grid(builder, grid, model=None):
+    """Hints every available cell of the model (or of a clone of it) with the activity found in `grid`."""
+    model = model or builder.build()
+    model.ClearHints()
+    for (e, s), cell in builder.cells.items():
+        found = int(grid[s, e])
+        for a, lit in enumerate(cell):
+            model.AddHint(lit, a == found)
+
+
+def add_distance_cut(builder, grid, min_distance=1, model=None):
+    """Forbids every planning closer than `min_distance` cells (Hamming distance) to `grid`.
+
+    With min_distance=1 this is a plain no-good cut on the solution.
+    """
+    model = model or builder.build()
+    same = [cell[int(grid[s, e])] for (e, s), cell in builder.cells.items()]
+    model.Add(sum(same) <= len(same) - min_distance)
+
+
+def warm_start_model(builder, grid, frozen_shifts=(), model=None):
+    """Clone of the model continuing a published planning.
+
+    Cells of `frozen_shifts` are fixed to their activity in `grid`, off
+    included: an employee off in a published shift stays off, so a cell
+    available again there makes the model infeasible (mark it unavailable in
+    the parameters instead). Every other cell is hinted with `grid`, where it
+    has an activity. Cells that are no longer available (e.g. a sick day) are
+    simply off.
+    """
+    model = model or builder.build().clone()
+    model.ClearHints()
+    frozen = set(frozen_shifts)
+    for (e, s), cell in builder.cells.items():
+        found = int(grid[s, e])
+        if s in frozen:
+            if found == ACT_OFF:
+                model.Add(sum(cell) == 0)
+            else:
+                model.Add(builder.tasks[(s, e)] == found)
+        elif found != ACT_OFF:
+            for a, lit in enumerate(cell):
+                model.AddHint(lit, a == found)
+    return model
+
+
+def find_diverse_plannings(builder, num_plannings, min_distance=1, time_limit=30.0, num_workers=8,
+                           random_seed=None, solver_parameters=None):
+    """Returns up to `num_plannings` plannings, pairwise at least `min_distance` cells apart.
+
+    The model is built once. After each solve, a distance cut against the new
+    grid is added and the next solve is hinted from it, instead of re-solving
+    from scratch with a random seed. Fewer plannings are returned when the
+    model runs out of distinct solutions (or of time). Cuts and hints go to a
+    clone of the model, so `builder.model` is left untouched.
+    """
+    # clone() keeps the variable indices, so the builder lookups stay valid on it
+    model = builder.build().clone()
+    plannings = []
+    while len(plannings) < num_plannings:
+        solver = new_solver(time_limit, num_workers, random_seed, solver_parameters)
+        status = solver.Solve(model)
+        if status not in (cp_model.FEASIBLE, cp_model.OPTIMAL):
+            break
+        grid = builder.grid(solver)
+        plannings.append(grid)
+        add_distance_cut(builder, grid, min_distance, model)
+        add_hint_from_grid(builder, grid, model)
+    return plannings
+
+
+class RosterResult:
+    """Outcome of `solve_roster`: the first solutions met during the search plus the final one."""
+
+    def __init__(self, status, solver, solutions, best):
+        self.status = status
+        self.solver = solver
+        self.solutions = solutions
+        self.best = best
+
+    @property
+    def found(self):
+        return self.status in (cp_model.FEASIBLE, cp_model.OPTIMAL)
+
+    @property
+    def status_name(self):
+        return self.solver.StatusName(self.status)
+
+    @property
+    def objective(self):
+        return self.solver.ObjectiveValue() if self.found else None
+
+    @property
+    def wall_time(self):
+        return self.solver.WallTime()
+
+
+def solve_roster(builder, num_solutions=5, time_limit=30.0, num_workers=8, random_seed=None,
+                 solver_parameters=None, model=None):
+    """Single search returning the first `num_solutions` grids and the final (best) one.
+
+    The time limit is shared by the whole search. With an objective, the
+    search goes on to the optimum (or the limit) and the first grids are the
+    intermediate solutions. Without one, the search enumerates solutions and
+    stops after `num_solutions` of them. `model` is a clone to solve instead of
+    the builder's model (see `warm_start_model`).
+    """
+    if num_solutions < 1:
+        raise ValueError("num_solutions must be at least 1")
+    model = model or builder.build()
+    solver = new_solver(time_limit, num_workers, random_seed, solver_parameters)
+    limit = None
+    if not builder.objective_terms and num_solutions > 1:
+        solver.parameters.enumerate_all_solutions = True
+        limit = num_solutions
+    # The queue only keeps the first solutions, later ones are dropped without slowing the search
+    callback = QueueSolutionCallback.for_builder(builder, solution_queue=queue.Queue(maxsize=num_solutions),
+                                                 limit=limit)
+    status = solver.Solve(model, callback)
+    solutions = []
+    while not callback.queue.empty():
+        solutions.append(callback.queue.get_nowait().values)
+    best = builder.grid(solver) if status in (cp_model.FEASIBLE, cp_model.OPTIMAL) else None
+    return RosterResult(status, solver, solutions, best)
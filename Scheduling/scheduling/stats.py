@@ -0,0 +1,50 @@
+"""Activity statistics computed on the in-memory plannings (no worksheet re-reading)."""
+
+import numpy as np
+
+
+def stack_plannings(grids):
+    """Stacks (shifts, employees) grids into one (plannings, shifts, employees) int8 array."""
+    return np.ascontiguousarray(np.stack([np.asarray(g, dtype=np.int8) for g in grids]))
+
+
+def activity_counts(plannings, num_activities):
+    """Number of shifts per activity for every planning and employee.
+
+    `plannings` is a (plannings, shifts, employees) array (a single grid is accepted).
+    Returns a (plannings, employees, num_activities + 1) array whose last column
+    counts the "Off" shifts (ACT_OFF = -1).
+    """
+    plannings = np.asarray(plannings)
+    if plannings.ndim == 2:
+        plannings = plannings[np.newaxis]
+    num_plannings, _, num_employees = plannings.shape
+    width = num_activities + 1
+    # ACT_OFF (-1) goes to the last column, then one bincount over (planning, employee, activity)
+    codes = np.where(plannings < 0, num_activities, plannings).astype(np.intp)
+    offsets = (np.arange(num_plannings)[:, None, None] * num_employees + np.arange(num_employees)) * width
+    counts = np.bincount((codes + offsets).ravel(), minlength=num_plannings * num_employees * width)
+    return counts.reshape(num_plannings, num_employees, width)
+
+
+def activity_ratios(counts):
+    """Share (in %) of each activity among the worked shifts, "Off" excluded."""
+    worked = counts[..., :-1]
+    total = worked.sum(axis=-1, keepdims=True)
+    return np.divide(100.0 * worked, total, out=np.zeros(worked.shape), where=total > 0)
+
+
+def fairness(counts):
+    """Cross-planning fairness of the activity shares.
+
+    Returns (spread, std), each of shape (plannings, activities): the max - min
+    and the standard deviation over employees of the activity ratios. Employees
+    who never work are left out.
+    """
+    ratios = activity_ratios(counts)
+    working = counts[..., :-1].sum(axis=-1) > 0
+    masked = np.ma.masked_array(ratios, mask=np.broadcast_to(~working[..., None], ratios.shape))
+    spread = (masked.max(axis=1) - masked.min(axis=1)).filled(0.0)
+    std = masked.std(axis=1).filled(0.0)
+    return spread, std
+
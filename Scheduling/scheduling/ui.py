@@ -0,0 +1,75 @@
+"""Streamlit widgets shared by the apps (not imported by the package: streamlit is only needed here)."""
+
+import pandas as pd
+import streamlit as st
+
+from .builder import ACT_OFF
+from .jobs import submit_solve
+
+
+def planning_frame(params, grid):
+    """(shifts, employees) grid as a DataFrame of activity names, one row per shift."""
+    labels = {ACT_OFF: "Congé"}
+    labels.update(enumerate(params.activities))
+    rows = [params.dates[params.day_of_shift(s)].strftime("%a %d/%m") for s in range(params.num_shifts)]
+    return pd.DataFrame([[labels[int(a)] for a in row] for row in grid], index=rows, columns=params.employees)
+
+
+def render_job_progress(parameters, key="solve_job"):
+    """"Génération du planning" section: starts a background solve of `parameters` and shows its progress.
+
+    The job lives in `st.session_state[key]`. The progress fragment reruns every
+    second only while the job is running; when it ends, one full rerun shows
+    the result and stops the polling.
+    """
+    st.divider()
+    st.header("🗓️ Génération du planning")
+
+    time_limit = st.number_input("Temps de calcul maximum (secondes)", min_value=5, max_value=600, value=30, step=5)
+
+    if st.button("🚀 Générer le planning"):
+        previous_job = st.session_state.get(key)
+        if previous_job is not None and not previous_job.done():
+            previous_job.cancel()
+        # Le calcul tourne dans un thread : le script continue et les autres widgets restent utilisables
+        st.session_state[key] = submit_solve(parameters, time_limit=float(time_limit))
+
+    job = st.session_state.get(key)
+    running = job is not None and not job.done()
+
+    @st.fragment(run_every=1.0 if running else None)
+    def show_solve_progress():
+        job = st.session_state.get(key)
+        if job is None:
+            return
+        job.poll()
+        if not job.done():
+            st.progress(min(job.elapsed() / job.time_limit, 1.0), text="Recherche en cours…")
+            if st.button("⏹️ Arrêter la recherche"):
+                job.cancel()
+        elif running:
+            # Fin de la recherche : la page est relancée une fois, sans rafraîchissement périodique
+            st.rerun()
+        else:
+            try:
+                result = job.result()
+            except Exception as error:
+                st.error(f"❌ Le calcul a échoué : {error}")
+                return
+            if result.found:
+                st.success(f"Planning trouvé ({result.status_name}) en {result.wall_time:.1f} s ✅")
+            else:
+                st.error("❌ Aucune solution. Le modèle est trop contraint.")
+
+        cols = st.columns(3)
+        cols[0].metric("Solutions trouvées", job.solution_count)
+        # Sans objectif (pas de contrainte « même activité dans la journée »), objectif et borne valent 0
+        if job.history and job.has_objective:
+            _, objective, bound = job.history[-1]
+            cols[1].metric("Objectif", f"{objective:g}")
+            cols[2].metric("Borne", f"{bound:g}")
+
+        if job.latest is not None:
+            st.dataframe(planning_frame(job.params, job.latest), use_container_width=True)
+
+    show_solve_progress()
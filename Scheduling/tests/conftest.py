@@ -0,0 +1,39 @@
+import sys
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# The library is imported from the Scheduling directory, as by the scripts
+SCHEDULING_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SCHEDULING_DIR))
+
+from scheduling import ENCODINGS, SEQUENCE_ENCODINGS, RosterParams, working_dates  # noqa: E402
+
+# Monday: 2 weeks of 5 days, Fridays on days 4 and 9
+FIRST_DATE = date(2026, 1, 5)
+
+
+def make_params(num_employees=3, num_weeks=2, shifts_per_day=1, available=None, **constraints):
+    """Small team with 3 activities and no constraint but the given ones."""
+    dates = working_dates(FIRST_DATE, num_weeks)
+    if available is None:
+        available = np.ones((num_employees, len(dates) * shifts_per_day), dtype=bool)
+    return RosterParams([f"Emp{e}" for e in range(num_employees)], ["Tél", "Rens", "Imp"], dates, available,
+                        shifts_per_day, **constraints)
+
+
+@pytest.fixture(params=ENCODINGS)
+def encoding(request):
+    return request.param
+
+
+@pytest.fixture(params=SEQUENCE_ENCODINGS)
+def sequence_encoding(request):
+    return request.param
+
+
+@pytest.fixture
+def planning_json():
+    return SCHEDULING_DIR / "parametres_planning.json"
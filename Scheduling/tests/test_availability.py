@@ -0,0 +1,74 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from scheduling import AvailabilityStore
+from scheduling.availability import LEAVE_MARK, WORK_MARK
+
+DATES = [date(2026, 1, 5) + timedelta(days=d) for d in range(3)]
+
+
+@pytest.fixture
+def store():
+    store = AvailabilityStore(["Ana", "Bob"], DATES)
+    store.available[1, 2, 0] = False
+    return store
+
+
+def test_shape():
+    with pytest.raises(ValueError):
+        AvailabilityStore(["Ana"], DATES, np.ones((1, 3), dtype=bool))
+
+
+def test_json_round_trip(store):
+    data = store.to_json()
+    assert data["Bob"]["2026-01-07"] == {"Matin": "Congé", "Après-midi": "Travail"}
+    assert data["Ana"]["2026-01-05"] == {"Matin": "Travail", "Après-midi": "Travail"}
+    loaded = AvailabilityStore.from_json(data)
+    assert loaded.employees == store.employees
+    assert loaded.dates == DATES
+    assert (loaded.available == store.available).all()
+
+
+def test_shift_availability(store):
+    shifts = store.shift_availability()
+    assert shifts.shape == (2, 6)
+    assert shifts[1].tolist() == [True] * 4 + [False, True]
+    assert store.bitmasks() == [0b111111, 0b101111]
+
+
+def test_to_frame(store):
+    frame = store.to_frame()
+    assert frame.columns.tolist() == ["Jour", "Ana - Matin", "Ana - Après-midi", "Bob - Matin", "Bob - Après-midi"]
+    assert frame["Jour"].tolist() == store.day_labels
+    assert frame.loc[2, "Bob - Matin"] == LEAVE_MARK
+    assert frame.loc[2, "Bob - Après-midi"] == WORK_MARK
+    assert frame.drop(columns="Jour").to_numpy().dtype == object
+    assert store.to_frame(marks=False)["Bob - Matin"].tolist() == [True, True, False]
+
+
+def test_apply_edits(store):
+    changed = store.apply_edits({0: {"Ana - Matin": LEAVE_MARK, "Ana - Après-midi": WORK_MARK},
+                                 "2": {"Bob - Matin": True, "Inconnu": False}})
+    # Ana's afternoon was already worked
+    assert changed == 2
+    assert not store.available[0, 0, 0]
+    assert store.available[1, 2, 0]
+    store.toggle(0, 0, 0)
+    assert store.available.all()
+
+
+def test_apply_frame(store):
+    frame = store.to_frame()
+    frame.loc[1, "Ana - Après-midi"] = LEAVE_MARK
+    frame.loc[2, "Bob - Matin"] = WORK_MARK
+    changed = store.apply_frame(frame)
+    assert sorted(map(tuple, changed.tolist())) == [(0, 1, 1), (1, 2, 0)]
+    assert not store.available[0, 1, 1]
+    assert store.available[1].all()
+    # Checkbox tables too
+    frame = store.to_frame(marks=False)
+    frame["Bob - Matin"] = False
+    assert len(store.apply_frame(frame)) == 3
+    assert not store.available[1, :, 0].any()
@@ -0,0 +1,45 @@
+import numpy as np
+from conftest import make_params
+
+from scheduling import RosterJob, generate_plannings, grid_hash, workers_per_job
+
+
+def test_workers_per_job():
+    assert workers_per_job(2, total_workers=8) == 4
+    assert workers_per_job(3, total_workers=8) == 2
+    assert workers_per_job(16, total_workers=8) == 1
+
+
+def test_grid_hash():
+    grid = np.zeros((4, 3), dtype=np.int8)
+    assert grid_hash(grid) == grid_hash(grid.copy())
+    assert grid_hash(grid) != grid_hash(grid.reshape(3, 4))
+    assert grid_hash(grid) != grid_hash(np.ones_like(grid))
+
+
+def test_generate_plannings():
+    params = make_params(min_staff={d: [1, 1, 0] for d in range(5)})
+    jobs = [
+        RosterJob("A", params, seed=1, num_plannings=2),
+        RosterJob("A", params, seed=2),
+        RosterJob("B", params.to_dict(), encoding="reified"),
+        # Not roster parameters: the job fails, the others go on
+        RosterJob("C", {"bad": 1}),
+    ]
+    records = list(generate_plannings(jobs, max_processes=2, total_workers=2, time_limit=10.0))
+    failed = [record for record in records if "error" in record]
+    assert [(record["team"], record["grid"], record["hash"]) for record in failed] == [("C", None, None)]
+    assert isinstance(failed[0]["error"], ValueError)
+
+    plannings = [record for record in records if "error" not in record]
+    assert {record["team"] for record in plannings} == {"A", "B"}
+    # Team A: 2 distinct plannings at least, never the same one twice
+    hashes = [record["hash"] for record in plannings if record["team"] == "A"]
+    assert len(hashes) >= 2 and len(set(hashes)) == len(hashes)
+    for record in plannings:
+        assert record["hash"] == grid_hash(record["grid"])
+        assert ((record["grid"] == 0).sum(axis=1) >= 1).all()
+
+
+def test_generate_plannings_without_jobs():
+    assert list(generate_plannings([])) == []
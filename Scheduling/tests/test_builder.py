@@ -0,0 +1,163 @@
+import numpy as np
+import pytest
+from conftest import make_params
+from ortools.sat.python import cp_model
+
+from scheduling import ACT_OFF, RosterModelBuilder
+
+SOLVED = (cp_model.FEASIBLE, cp_model.OPTIMAL)
+
+
+def solve(builder, forced=()):
+    """Solves a clone of the model with the cells `forced` [(employee, shift, activity)]; (status, grid, solver)."""
+    model = builder.build().clone()
+    for e, s, a in forced:
+        model.Add(builder.tasks[(s, e)] == a)
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = 10.0
+    solver.parameters.num_search_workers = 1
+    status = solver.Solve(model)
+    grid = builder.grid(solver) if status in SOLVED else None
+    return status, grid, solver
+
+
+def test_unknown_encoding():
+    with pytest.raises(ValueError):
+        RosterModelBuilder(make_params(), encoding="dense")
+    with pytest.raises(ValueError):
+        RosterModelBuilder(make_params(), sequence_encoding="regular")
+
+
+def test_variables(encoding):
+    available = np.ones((3, 10), dtype=bool)
+    available[0, 3] = False
+    builder = RosterModelBuilder(make_params(available=available), encoding)
+    status, grid, _ = solve(builder, [(1, 0, 2)])
+    assert status in SOLVED
+    assert grid.shape == (10, 3)
+    assert grid[3, 0] == ACT_OFF
+    assert grid[0, 1] == 2
+    assert (grid[available.T] >= 0).all()
+    assert builder.assigned(0, 3, 0) is None
+    assert len(builder.cells) == available.sum()
+    assert builder.build() is builder.model
+
+
+def test_daily_staff(encoding):
+    params = make_params(min_staff={d: [1, 1, 0] for d in range(5)}, max_staff={d: [1, 3, 3] for d in range(5)})
+    builder = RosterModelBuilder(params, encoding)
+    status, grid, _ = solve(builder)
+    assert status in SOLVED
+    assert ((grid == 0).sum(axis=1) == 1).all()
+    assert ((grid == 1).sum(axis=1) >= 1).all()
+    status, _, _ = solve(builder, [(0, 0, 0), (1, 0, 0)])
+    assert status == cp_model.INFEASIBLE
+
+
+def test_daily_staff_by_headcount(encoding):
+    # Two phones with the whole team, one when someone is on leave
+    available = np.ones((3, 10), dtype=bool)
+    available[0, 1] = False
+    params = make_params(available=available, min_staff={d: {2: [1, 0, 0], 3: [2, 0, 0]} for d in range(5)})
+    status, grid, _ = solve(RosterModelBuilder(params, encoding))
+    assert status in SOLVED
+    assert (grid[1] == 0).sum() >= 1
+    assert ((np.delete(grid, 1, axis=0) == 0).sum(axis=1) >= 2).all()
+
+
+def test_weekly_activity(encoding):
+    builder = RosterModelBuilder(make_params(min_per_week=[0, 0, 1], max_per_week=[5, 5, 1]), encoding)
+    status, grid, _ = solve(builder)
+    assert status in SOLVED
+    for week in builder.params.weeks():
+        assert ((grid[week] == 2).sum(axis=0) == 1).all()
+    status, _, _ = solve(builder, [(0, 0, 2), (0, 1, 2)])
+    assert status == cp_model.INFEASIBLE
+
+
+def test_max_consecutive(encoding, sequence_encoding):
+    builder = RosterModelBuilder(make_params(max_consecutive={0: 2}), encoding, sequence_encoding)
+    assert solve(builder, [(0, s, 0) for s in (0, 1, 3, 4)])[0] in SOLVED
+    assert solve(builder, [(0, s, 0) for s in (0, 1, 2)])[0] == cp_model.INFEASIBLE
+
+
+def test_max_consecutive_initial_state(encoding, sequence_encoding):
+    # Employee 0 ends the previous planning with 2 days of phone
+    params = make_params(max_consecutive={0: 2}, initial_states={"max_consecutive": {0: {0: 2}}})
+    builder = RosterModelBuilder(params, encoding, sequence_encoding)
+    assert solve(builder, [(0, 0, 0)])[0] == cp_model.INFEASIBLE
+    assert solve(builder, [(1, 0, 0), (1, 1, 0)])[0] in SOLVED
+
+
+def test_window_caps(encoding):
+    builder = RosterModelBuilder(make_params(window_caps=[(0, 4, 1)]), encoding)
+    assert solve(builder, [(0, 0, 0), (0, 4, 0)])[0] in SOLVED
+    assert solve(builder, [(0, 0, 0), (0, 3, 0)])[0] == cp_model.INFEASIBLE
+
+
+def test_distinct_activities(encoding):
+    builder = RosterModelBuilder(make_params(min_diff_activities=3), encoding)
+    status, grid, _ = solve(builder)
+    assert status in SOLVED
+    for week in builder.params.weeks():
+        for e in range(3):
+            assert len(set(grid[week, e].tolist())) == 3
+    # 4 days of phone leave a single day for the two other activities
+    assert solve(builder, [(0, s, 0) for s in range(3)])[0] in SOLVED
+    assert solve(builder, [(0, s, 0) for s in range(4)])[0] == cp_model.INFEASIBLE
+
+
+def test_friday_rotation(encoding, sequence_encoding):
+    builder = RosterModelBuilder(make_params(friday_activity=0), encoding, sequence_encoding)
+    assert builder.params.fridays() == [4, 9]
+    assert solve(builder, [(0, 4, 0), (1, 9, 0)])[0] in SOLVED
+    assert solve(builder, [(0, 4, 0), (0, 9, 0)])[0] == cp_model.INFEASIBLE
+
+    builder = RosterModelBuilder(make_params(friday_activity=0, last_friday_employees=[0]), encoding,
+                                 sequence_encoding)
+    assert solve(builder, [(0, 4, 0)])[0] == cp_model.INFEASIBLE
+    assert solve(builder, [(1, 4, 0)])[0] in SOLVED
+
+
+@pytest.mark.parametrize("rule, allowed, forbidden", [
+    ("forbid Rens -> Imp", [(0, 0, 2), (0, 1, 1)], [(0, 0, 1), (0, 1, 2)]),
+    ("max_run Imp 1", [(0, 0, 2), (0, 2, 2)], [(0, 0, 2), (0, 1, 2)]),
+    ("spacing Imp 3", [(0, 0, 2), (0, 3, 2)], [(0, 0, 2), (0, 2, 2)]),
+    ("spacing Tél 2 on fridays", [(0, 4, 0), (1, 9, 0)], [(0, 4, 0), (0, 9, 0)]),
+])
+def test_sequence_rules(encoding, sequence_encoding, rule, allowed, forbidden):
+    builder = RosterModelBuilder(make_params(sequence_rules=[rule]), encoding, sequence_encoding)
+    assert solve(builder, allowed)[0] in SOLVED
+    assert solve(builder, forbidden)[0] == cp_model.INFEASIBLE
+
+
+@pytest.mark.parametrize("rule, state, forbidden", [
+    ("forbid Rens -> Imp", 1, [(0, 0, 2)]),
+    ("spacing Imp 3", 2, [(0, 1, 2)]),
+])
+def test_sequence_rules_initial_state(encoding, sequence_encoding, rule, state, forbidden):
+    params = make_params(sequence_rules=[rule], initial_states={"sequence_rules": {0: {0: state}}})
+    builder = RosterModelBuilder(params, encoding, sequence_encoding)
+    assert solve(builder, forbidden)[0] == cp_model.INFEASIBLE
+    assert solve(builder, [(1, s, a) for _, s, a in forbidden])[0] in SOLVED
+
+
+def test_period_quotas(encoding):
+    builder = RosterModelBuilder(make_params(period_quotas={2: (2, 3, 0)}), encoding)
+    status, grid, _ = solve(builder)
+    assert status in SOLVED
+    counts = (grid == 2).sum(axis=0)
+    assert ((counts >= 2) & (counts <= 3)).all()
+    assert solve(builder, [(0, s, 2) for s in range(4)])[0] == cp_model.INFEASIBLE
+
+
+def test_same_activity(encoding):
+    builder = RosterModelBuilder(make_params(shifts_per_day=2, same_activity_per_day=True), encoding)
+    status, grid, solver = solve(builder)
+    assert status == cp_model.OPTIMAL
+    assert solver.ObjectiveValue() == 3 * 10
+    assert (grid[0::2] == grid[1::2]).all()
+    # A split day costs exactly one point
+    status, _, solver = solve(builder, [(0, 0, 0), (0, 1, 1)])
+    assert status == cp_model.OPTIMAL
+    assert solver.ObjectiveValue() == 3 * 10 - 1
@@ -0,0 +1,98 @@
+import json
+import os
+import time
+
+import numpy as np
+import pytest
+from conftest import make_params
+from ortools.sat.python import cp_model
+
+from scheduling import ModelCache, RosterModelBuilder, load_parameters, new_solver, params_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ModelCache(str(tmp_path / "models"), max_entries=2)
+
+
+def staffed(**constraints):
+    return make_params(min_staff={d: [1, 1, 0] for d in range(5)}, **constraints)
+
+
+def test_params_key(planning_json):
+    params = load_parameters(planning_json)
+    with open(planning_json, encoding="utf-8") as f:
+        data = json.load(f)
+    # The app export and its canonical form share the key
+    assert params_key(data) == params_key(params.to_dict()) == params_key(params)
+    assert params_key(params, "reified") != params_key(params)
+    assert params_key(params, sequence_encoding="automaton") != params_key(params)
+    assert params_key(staffed()) != params_key(staffed(max_consecutive={0: 2}))
+
+
+def test_round_trip(cache, encoding, sequence_encoding):
+    params = staffed(max_consecutive={0: 2}, friday_activity=0)
+    built = RosterModelBuilder(params, encoding, sequence_encoding)
+    key = cache.put(built)
+    assert key in cache
+
+    loaded = cache.get(params, encoding, sequence_encoding)
+    assert (loaded.encoding, loaded.sequence_encoding) == (encoding, sequence_encoding)
+    assert str(loaded.build().Proto()) == str(built.build().Proto())
+    assert [v.Index() for v in loaded.task_vars()] == [v.Index() for v in built.task_vars()]
+    assert loaded.cells.keys() == built.cells.keys()
+    solver = new_solver(10.0, 1)
+    assert solver.Solve(loaded.model) in (cp_model.FEASIBLE, cp_model.OPTIMAL)
+    grid = loaded.grid(solver)
+    assert ((grid == 0).sum(axis=1) >= 1).all()
+    assert loaded.assigned(0, 0, int(grid[0, 0])) is not None
+
+
+def test_hits_and_misses(cache):
+    params = staffed()
+    assert cache.get(params) is None
+    first = cache.builder(params)
+    assert cache.keys() == [params_key(params)]
+    # Same parameters: loaded, not rebuilt
+    again = cache.builder(params.to_dict())
+    assert again is not first and str(again.build().Proto()) == str(first.build().Proto())
+    # Another encoding is another entry
+    assert cache.get(params, "reified") is None
+    reified = cache.builder(params, "reified")
+    assert reified.encoding == "reified"
+    assert set(cache.keys()) == {params_key(params), params_key(params, "reified")}
+
+
+def test_lru_eviction(cache):
+    a, b, c = staffed(), staffed(max_consecutive={0: 2}), staffed(friday_activity=0)
+    now = time.time()
+    for params, age in ((a, 100), (b, 50)):
+        key = cache.put(RosterModelBuilder(params))
+        os.utime(os.path.join(cache.directory, f"{key}.json"), (now - age, now - age))
+    assert cache.keys() == [params_key(a), params_key(b)]
+    # Reading a makes b the least recently used one
+    assert cache.get(a) is not None
+    cache.put(RosterModelBuilder(c))
+    assert set(cache.keys()) == {params_key(a), params_key(c)}
+    assert cache.get(b) is None
+    cache.clear()
+    assert cache.keys() == []
+
+
+def test_explain_entries(cache):
+    available = np.ones((3, 10), dtype=bool)
+    available[0, 2] = False
+    params = make_params(available=available, min_staff={d: [1, 1, 0] for d in range(5)})
+    explained = RosterModelBuilder(params, explain=True)
+    cache.put(explained)
+    # The guarded model is not the model
+    assert cache.get(params) is None
+    assert cache.builder(params).guards == {}
+
+    loaded = cache.get(params, explain=True)
+    assert loaded.explain
+    assert {key: guard.Index() for key, guard in loaded.guards.items()} == \
+        {key: guard.Index() for key, guard in explained.guards.items()}
+    assert ("leave", 0, 2) in loaded.guards
+    assert loaded.family_stats.keys() == explained.family_stats.keys()
+    assert loaded.family_stats["daily_staff"]["constraints"] == explained.family_stats["daily_staff"]["constraints"]
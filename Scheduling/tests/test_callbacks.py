@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from conftest import make_params
+from ortools.sat.python import cp_model
+
+from scheduling import (ACT_OFF, QueueSolutionCallback, RosterModelBuilder, format_planning, new_solver,
+                        solve_with_consumer)
+
+
+def enumerating_solver():
+    solver = new_solver(time_limit=10.0, num_workers=1)
+    solver.parameters.enumerate_all_solutions = True
+    return solver
+
+
+def small_builder():
+    """One employee, one week: 3^5 plannings."""
+    return RosterModelBuilder(make_params(num_employees=1, num_weeks=1))
+
+
+def test_queue_callback_snapshots():
+    builder = small_builder()
+    callback = QueueSolutionCallback.for_builder(builder, maxsize=10, limit=4)
+    enumerating_solver().Solve(builder.model, callback)
+    assert callback.solution_count == 4
+    assert callback.dropped == 0
+    snapshots = [callback.queue.get_nowait() for _ in range(4)]
+    assert [s.index for s in snapshots] == [1, 2, 3, 4]
+    assert len({s.values.tobytes() for s in snapshots}) == 4
+    for snapshot in snapshots:
+        assert snapshot.values.shape == (5, 1)
+        assert snapshot.values.dtype == np.int8
+        assert ((snapshot.values >= 0) & (snapshot.values < 3)).all()
+    assert callback.callback_time > 0
+
+
+def test_queue_callback_drops_when_full():
+    builder = small_builder()
+    callback = QueueSolutionCallback.for_builder(builder, maxsize=2, limit=6)
+    enumerating_solver().Solve(builder.model, callback)
+    assert callback.solution_count == 6
+    assert callback.dropped == 4
+    # The first snapshots are kept
+    assert [callback.queue.get_nowait().index for _ in range(2)] == [1, 2]
+
+
+def test_solve_with_consumer():
+    builder = small_builder()
+    grids = []
+    status, callback = solve_with_consumer(builder, enumerating_solver(), grids.append, maxsize=100, limit=5)
+    assert status in (cp_model.FEASIBLE, cp_model.OPTIMAL)
+    assert callback.solution_count == 5
+    assert len(grids) == 5
+    assert callback.queue.empty()
+
+
+def test_solve_with_consumer_raises_handler_errors():
+    handled = []
+
+    def handler(snapshot):
+        handled.append(snapshot.index)
+        raise RuntimeError("disk full")
+
+    with pytest.raises(RuntimeError, match="disk full"):
+        solve_with_consumer(small_builder(), enumerating_solver(), handler, maxsize=100, limit=5)
+    # The next snapshots are discarded, the solve is not blocked
+    assert handled == [1]
+
+
+def test_format_planning():
+    grid = np.array([[0, ACT_OFF], [1, 0]])
+    text = format_planning(grid, ["Alice", "Bob"], ["Téléphone", "Rens"], width=3)
+    assert text.splitlines() == [
+        "      Ali Bob",
+        "   0  Tél *  ",
+        "   1  Ren Tél",
+    ]
@@ -0,0 +1,55 @@
+import numpy as np
+from conftest import make_params
+from openpyxl import load_workbook
+
+from scheduling import ACT_OFF, PlanningWriter
+
+
+def planning():
+    """Two weeks of half-days: phone, information desk, and phone with one half-day off."""
+    grid = np.zeros((20, 3), dtype=np.int8)
+    grid[:, 1] = 1
+    grid[3, 2] = ACT_OFF
+    return grid
+
+
+def test_write_plannings(tmp_path):
+    params = make_params(shifts_per_day=2)
+    writer = PlanningWriter(params)
+    writer.write_planning(planning())
+    writer.write_planning(planning())
+    path = tmp_path / "Planning.xlsx"
+    writer.save(path)
+
+    sheet = load_workbook(path)["Planning"]
+    rows = list(sheet.iter_rows(values_only=True))
+    assert rows[0][:2] == (None, "Planning 1")
+    assert rows[1] == ("Date", None, None, "Emp0", "Emp1", "Emp2")
+    assert rows[2] == ("05/01/26", "Lundi", "M", "Tél", "Rens", "Tél")
+    assert rows[5] == (None, None, "AM", "Tél", "Rens", "Off")
+    # 2 header rows, 20 half-days, a blank row after every week and after the planning
+    assert rows[25][:2] == (None, "Planning 2")
+
+    assert sheet["D3"].style == "act0_top"
+    assert sheet["D3"].fill.start_color.rgb.endswith("FFFF00")
+    assert sheet["F6"].style == "act-1_right"
+    merged = {str(cells) for cells in sheet.merged_cells.ranges}
+    assert {"B1:F1", "A3:A4", "B3:B4", "B26:F26"} <= merged
+
+
+
+def test_write_statistics(tmp_path):
+    writer = PlanningWriter(make_params(shifts_per_day=2))
+    grids = [planning(), planning()]
+    for grid in grids:
+        writer.write_planning(grid)
+    writer.write_statistics(grids)
+    path = tmp_path / "Planning.xlsx"
+    writer.save(path)
+
+    rows = [row for row in load_workbook(path)["Planning"].iter_rows(values_only=True)]
+    first = next(i for i, row in enumerate(rows) if row[1] == "Statistiques")
+    assert rows[first] == (None, "Statistiques", "Tél", 40, 0, 38)
+    assert rows[first + 3] == (None, None, "Off", 0, 0, 2)
+    assert rows[first + 4] == (None, None, "Total", 40, 40, 40)
+    assert rows[first + 6] == (None, "Ratio", "Tél", 100, 0, 100)
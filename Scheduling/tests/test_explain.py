@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from conftest import make_params
+from ortools.sat.python import cp_model
+
+from scheduling import RosterModelBuilder, describe_guard, explain_infeasibility
+
+SOLVED = (cp_model.FEASIBLE, cp_model.OPTIMAL)
+
+
+def solve_relaxed(builder, relaxed, forced):
+    """Solves with every guard assumed but `relaxed`, and the cells `forced` [(employee, shift, activity)]."""
+    model = builder.build().clone()
+    model.AddAssumptions([guard for key, guard in builder.guards.items() if key not in relaxed])
+    for e, s, a in forced:
+        model.Add(builder.tasks[(s, e)] == a)
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = 10.0
+    solver.parameters.num_search_workers = 1
+    return solver.Solve(model), solver
+
+
+def test_guarded_model_is_the_model(encoding):
+    available = np.ones((3, 10), dtype=bool)
+    available[0, 2] = False
+    params = make_params(available=available, min_staff={d: [1, 1, 0] for d in range(5)})
+    builder = RosterModelBuilder(params, encoding, explain=True)
+    status, solver = solve_relaxed(builder, (), ())
+    assert status in SOLVED
+    grid = builder.grid(solver)
+    assert grid[2, 0] == -1
+    assert ((grid == 0).sum(axis=1) >= 1).all()
+    assert solve_relaxed(builder, (), [(0, 2, 1)])[0] == cp_model.INFEASIBLE
+    assert solve_relaxed(builder, [("leave", 0, 2)], [(0, 2, 1)])[0] in SOLVED
+
+
+@pytest.mark.parametrize("rules, family", [
+    ({"max_per_week": [5, 5, 0]}, "weekly_max"),
+    ({"period_quotas": {2: (0, 0, 0)}}, "quota_max"),
+    ({"max_staff": {d: [1, 1, 0] for d in range(5)}}, "daily_max"),
+])
+def test_relaxed_leave_counts_in_the_caps(encoding, rules, family):
+    # Employee 0 is on leave on Monday; a single employee: Monday is a bank holiday for the headcount
+    available = np.ones((1, 5), dtype=bool)
+    available[0, 0] = False
+    params = make_params(num_employees=1, num_weeks=1, available=available, **rules)
+    builder = RosterModelBuilder(params, encoding, explain=True)
+    builder.build()
+    caps = [key for key in builder.guards if key[0] == family]
+    assert solve_relaxed(builder, [("leave", 0, 0)], [(0, 0, 2)])[0] == cp_model.INFEASIBLE
+    assert solve_relaxed(builder, [("leave", 0, 0)] + caps, [(0, 0, 2)])[0] in SOLVED
+    assert solve_relaxed(builder, [("leave", 0, 0)], [(0, 0, 1)])[0] in SOLVED
+
+
+def test_explain_infeasibility():
+    # Two phones on Monday, Emp1 on leave
+    available = np.ones((2, 5), dtype=bool)
+    available[1, 0] = False
+    params = make_params(num_employees=2, num_weeks=1, available=available, min_staff={0: [2, 0, 0]})
+    conflict = explain_infeasibility(params, time_limit=10.0, num_workers=1, minimize=True)
+    assert sorted(key for key, _ in conflict) == [("daily_min", 0, 0), ("leave", 1, 0)]
+    assert dict(conflict)[("leave", 1, 0)] == "Congé de Emp1 le lundi 05/01/2026"
+    assert describe_guard(params, ("daily_min", 0, 0)) == "Effectif minimum Tél le lundi 05/01/2026"
+
+    assert explain_infeasibility(make_params(num_weeks=1), time_limit=10.0, num_workers=1) is None
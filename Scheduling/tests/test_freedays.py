@@ -0,0 +1,62 @@
+import numpy as np
+from conftest import make_params
+
+from scheduling import ACT_OFF, place_free_shifts, place_free_shifts_batch
+
+# Activity 2 ("Imp" in the test team) plays the free shift
+FREE = 2
+
+
+def check_rules(params, grid, result, max_per_shift=1):
+    free = (result == FREE) & (grid != FREE)
+    # Only worked, unprotected cells change, and only to the free activity
+    assert ((result == grid) | free).all()
+    assert not free[grid == 0].any() and not free[grid == ACT_OFF].any()
+    for week in params.weeks():
+        assert (free[week].sum(axis=0) <= 1).all()
+    assert (free.sum(axis=1) <= max_per_shift).all()
+
+
+def test_place_free_shifts():
+    params = make_params()
+    grid = np.ones((10, 3), dtype=np.int8)
+    grid[:, 0] = 0
+    grid[3, 1] = ACT_OFF
+    result = place_free_shifts(params, grid, FREE)
+    check_rules(params, grid, result)
+    # Employees 1 and 2 get one free shift a week; employee 0 is always on the phone
+    assert (result == FREE).sum(axis=0).tolist() == [0, 2, 2]
+
+
+def test_place_free_shifts_limits():
+    params = make_params(min_staff={d: [0, 3, 0] for d in range(5)})
+    grid = np.ones((10, 3), dtype=np.int8)
+    # The whole team on the information desk, its minimum: nobody can leave
+    assert (place_free_shifts(params, grid, FREE, protected=()) == grid).all()
+
+    # Working 2 days in week 1 only: no free shift that week for employee 0
+    params = make_params()
+    grid[2:5, 0] = ACT_OFF
+    result = place_free_shifts(params, grid, FREE, protected=(), weekday_caps={0: 3})
+    check_rules(params, grid, result, max_per_shift=3)
+    assert (result[:5, 0] != FREE).all()
+    assert (result == FREE).sum() == 5
+
+
+def test_fairness():
+    params = make_params(num_weeks=1)
+    # A single shift can be given up (the others are phone)
+    grid = np.zeros((5, 3), dtype=np.int8)
+    grid[0] = 1
+    result = place_free_shifts(params, grid, FREE, fairness=True, previous=[1, 0, 1])
+    assert result[0].tolist() == [1, FREE, 1]
+
+    plannings = place_free_shifts_batch(params, [grid] * 3, FREE, fairness=True, carry=True)
+    assert plannings.shape == (3, 5, 3)
+    # One free shift per planning, a different employee each time
+    assert sorted(np.flatnonzero(planning[0] == FREE)[0] for planning in plannings) == [0, 1, 2]
+
+
+def test_batch_without_plannings():
+    params = make_params()
+    assert place_free_shifts_batch(params, [], FREE).shape == (0, 10, 3)
@@ -0,0 +1,67 @@
+import io
+import json
+
+import pandas as pd
+from conftest import make_params
+
+from scheduling import FAMILIES, ModelCache, RosterModelBuilder, family_records, parse_solver_log, profile_solve
+from scheduling.instrument import presolve_log
+
+LOG = [
+    "Starting CP-SAT solver v9.10",
+    "Starting presolve at 0.01s",
+    "  1.2e-04s  0.00e+00d  [DetectDominanceRelations]",
+    "Starting search at 0.25s",
+    "#1       0.40s best:30 next:[31,40] fixed_bools",
+    "#2       0.55s best:31 next:[32,40]",
+]
+
+
+def test_parse_solver_log():
+    presolve_time, first_solution_time = parse_solver_log(LOG)
+    assert abs(presolve_time - 0.24) < 1e-9
+    assert first_solution_time == 0.40
+    assert presolve_log(LOG) == LOG[1:3]
+    assert parse_solver_log(LOG[:1]) == (None, None)
+
+
+def test_family_records():
+    builder = RosterModelBuilder(make_params(max_consecutive={0: 2}))
+    builder.build()
+    records = family_records(builder, run="r1")
+    assert [r["family"] for r in records] == ["variables"] + list(FAMILIES)
+    assert all(r["run"] == "r1" and r["event"] == "family" and r["employees"] == 3 for r in records)
+    # 3 x 10 cells of 3 literals and an integer view
+    assert records[0]["variables"] == 3 * 10 * 4
+    assert sum(r["constraints"] for r in records) == len(builder.model.Proto().constraints)
+
+
+def test_profile_solve(tmp_path):
+    output = tmp_path / "solves.jsonl"
+    builder = RosterModelBuilder(make_params(shifts_per_day=2, same_activity_per_day=True))
+    result, records = profile_solve(builder, time_limit=10.0, num_workers=1, output=str(output))
+    assert result.found
+    solve = records[-1]
+    assert solve["event"] == "solve" and solve["status"] == result.status_name
+    assert solve["objective"] == 3 * 10
+    assert solve["variables"] == len(builder.model.Proto().variables)
+    assert solve["solutions"] >= 1
+    assert solve["presolve_time"] is not None and solve["presolve_log"]
+    assert len({r["run"] for r in records}) == 1
+
+    # Appended, one run after the other
+    profile_solve(builder, time_limit=10.0, num_workers=1, output=str(output))
+    frame = pd.read_json(output, lines=True)
+    assert len(frame) == 2 * len(records)
+    assert (frame["event"] == "solve").sum() == 2
+
+
+def test_profile_cached_builder(tmp_path):
+    params = make_params()
+    cache = ModelCache(str(tmp_path / "models"))
+    cache.put(RosterModelBuilder(params))
+    buffer = io.StringIO()
+    _, records = profile_solve(cache.get(params), time_limit=10.0, num_workers=1, output=buffer)
+    # The build stats of the cached entry
+    assert [r["family"] for r in records[:-1]] == ["variables"] + list(FAMILIES)
+    assert [json.loads(line)["event"] for line in buffer.getvalue().splitlines()] == [r["event"] for r in records]
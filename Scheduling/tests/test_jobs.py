@@ -0,0 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from conftest import make_params
+
+from scheduling import submit_solve
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        yield executor
+
+
+def test_submit_solve(executor):
+    job = submit_solve(make_params(min_staff={d: [1, 1, 0] for d in range(5)}), executor, time_limit=10.0,
+                       num_workers=1)
+    result = job.result()
+    assert job.done()
+    assert result.found
+    assert job.solution_count == len(job.history) >= 1
+    assert (job.latest == result.best).all()
+    # No objective: the history's objective and bound mean nothing
+    assert not job.has_objective
+
+
+def test_objective(executor):
+    job = submit_solve(make_params(shifts_per_day=2, same_activity_per_day=True), executor, time_limit=10.0,
+                       num_workers=1)
+    assert job.result().found
+    assert job.has_objective
+    assert job.history[-1][1] == 3 * 10
+
+
+def test_failed_job(executor):
+    class BrokenCache:
+        def builder(self, params):
+            raise OSError("disk full")
+
+    job = submit_solve(make_params(), executor, cache=BrokenCache())
+    with pytest.raises(OSError):
+        job.result()
@@ -0,0 +1,61 @@
+import json
+from datetime import date
+
+import pytest
+from conftest import make_params
+
+from scheduling import RosterParams, load_parameters
+
+
+def test_load_app_json(planning_json):
+    params = load_parameters(planning_json)
+    assert params.employees == [f"Employé {i}" for i in range(1, 15)]
+    assert params.activities == ["Téléphone", "Renseignement", "Dérogation", "Impayés", "Libre"]
+    # Four weeks from Monday 20/10/2025, weekends dropped
+    assert params.num_days == 20
+    assert params.dates[0] == date(2025, 10, 20)
+    assert all(day.weekday() < 5 for day in params.dates)
+    assert params.shifts_per_day == 1
+    assert params.available.shape == (14, 20)
+    assert params.max_consecutive == {a: 5 for a in range(5)}
+    assert params.min_diff_activities == 3
+    assert params.staff_bounds(0, 14) == ([1] * 5, [5] * 5)
+    assert len(params.weeks()) == 4
+    assert params.fridays() == [4, 9, 14, 19]
+
+
+def test_load_dict_and_params(planning_json):
+    with open(planning_json, encoding="utf-8") as f:
+        data = json.load(f)
+    params = load_parameters(data)
+    assert params.to_dict() == load_parameters(planning_json).to_dict()
+    assert load_parameters(params) is params
+
+
+def test_canonical_round_trip(planning_json, tmp_path):
+    params = load_parameters(planning_json)
+    path = tmp_path / "params.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(params.to_dict(), f)
+    loaded = load_parameters(path)
+    assert isinstance(loaded, RosterParams)
+    assert loaded.to_dict() == params.to_dict()
+    assert (loaded.available == params.available).all()
+
+
+def test_canonical_round_trip_of_every_field():
+    params = make_params(shifts_per_day=2, min_staff={d: [1, 1, 0] for d in range(5)}, max_consecutive={0: 2},
+                         window_caps=[(0, 4, 1)], friday_activity=0, last_friday_employees=[1],
+                         period_quotas={2: (1, 3, 0)}, same_activity_per_day=True,
+                         sequence_rules=["forbid Rens -> Imp"], initial_states={"max_consecutive": {0: {1: 2}}})
+    assert load_parameters(params.to_dict()).to_dict() == params.to_dict()
+
+
+@pytest.mark.parametrize("data", [
+    {"bad": 1},
+    {"effectifs_journaliers": {}},
+    {"disponibilites": {"Employé 1": {"2025-10-20": "Travail"}}},
+])
+def test_load_not_an_export(data):
+    with pytest.raises(ValueError):
+        load_parameters(data)
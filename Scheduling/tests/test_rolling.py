@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from conftest import make_params
+
+from scheduling import ACT_OFF, solve_rolling
+from scheduling.rolling import boundary_states, window_params
+
+RULES = dict(min_staff={d: [1, 0, 0] for d in range(5)}, max_consecutive={0: 1}, friday_activity=1,
+             period_quotas={2: (2, 4, 0)}, sequence_rules=["spacing Imp 3"])
+
+
+def check_rules(params, grid):
+    assert (grid != ACT_OFF).all()
+    assert ((grid == 0).sum(axis=1) >= 1).all()
+    for e in range(params.num_employees):
+        column = grid[:, e]
+        assert not ((column[:-1] == 0) & (column[1:] == 0)).any()
+        fridays = column[params.fridays()]
+        assert not ((fridays[:-1] == 1) & (fridays[1:] == 1)).any()
+        imp = np.flatnonzero(column == 2)
+        assert 2 <= len(imp) <= 4
+        assert (np.diff(imp) >= 3).all()
+
+
+def test_boundary_states():
+    params = make_params(**RULES)
+    grid = np.full((10, 3), ACT_OFF, dtype=np.int8)
+    grid[:5] = [[0, 1, 2], [1, 0, 1], [2, 1, 0], [1, 2, 0], [0, 1, 1]]
+    boundary = boundary_states(params, grid, 5)
+    assert boundary.shift == 5
+    # Phone runs at the end of the week, shifts since the last Impayés
+    assert boundary.initial_states["max_consecutive"] == {0: {0: 1, 1: 0, 2: 0}}
+    assert boundary.initial_states["sequence_rules"] == {0: {0: 0, 1: 1, 2: 0}}
+    assert boundary.last_friday_employees == [1, 2]
+    assert boundary.done[2].tolist() == [1, 1, 1]
+
+    # Carried forward from an earlier boundary: same state
+    carried = boundary_states(params, grid, 5, boundary_states(params, grid, 3))
+    assert carried.initial_states == boundary.initial_states
+    assert carried.last_friday_employees == boundary.last_friday_employees
+    assert carried.done[2].tolist() == boundary.done[2].tolist()
+
+    boundary = boundary_states(params, grid, 4)
+    assert boundary.initial_states["sequence_rules"] == {0: {0: 1, 1: 2, 2: 0}}
+    assert boundary.last_friday_employees == []
+
+
+def test_window_params():
+    params = make_params(num_weeks=4, **RULES)
+    grid = np.full((20, 3), ACT_OFF, dtype=np.int8)
+    grid[:5] = [[0, 1, 2], [1, 0, 1], [2, 1, 0], [1, 2, 0], [0, 1, 1]]
+    window = window_params(params, 1, 3, grid)
+    assert window.dates == params.dates[5:15]
+    assert (window.available == params.available[:, 5:15]).all()
+    assert window.last_friday_employees == [1, 2]
+    assert window.initial_states["max_consecutive"] == {0: {0: 1, 1: 0, 2: 0}}
+    # 15 of the 20 shifts worked by the end of the window: 1 (of 2) to 3 (of 4) Impayés by then, 1 already done
+    assert window.period_quotas == {2: ([0, 0, 0], [2, 2, 2], 0)}
+
+    # The last window gets the rest of the quotas
+    grid[5:15] = 1
+    window = window_params(params, 3, 4, grid)
+    assert window.period_quotas == {2: ([1, 1, 1], [3, 3, 3], 0)}
+
+
+@pytest.mark.parametrize("window_weeks, overlap_weeks, num_windows", [(2, 1, 3), (2, 0, 2), (4, 1, 1)])
+def test_solve_rolling(window_weeks, overlap_weeks, num_windows):
+    params = make_params(num_weeks=4, **RULES)
+    result = solve_rolling(params, window_weeks, overlap_weeks, time_limit=10.0, num_workers=1)
+    assert result.found
+    assert result.committed == 20
+    assert len(result.windows) == num_windows
+    assert result.windows[-1]["last_week"] == 4
+    check_rules(params, result.grid)
+
+
+def test_solve_rolling_stops():
+    # The first window cannot be solved: two phones a day with a single employee
+    params = make_params(num_employees=1, num_weeks=2, min_staff={d: [2, 0, 0] for d in range(5)})
+    result = solve_rolling(params, window_weeks=1, overlap_weeks=0, time_limit=10.0, num_workers=1)
+    assert not result.found
+    assert result.committed == 0
+    assert len(result.windows) == 1 and result.windows[0]["status"] == "INFEASIBLE"
+    assert (result.grid == ACT_OFF).all()
+
+    with pytest.raises(ValueError):
+        solve_rolling(params, window_weeks=2, overlap_weeks=2)
@@ -0,0 +1,121 @@
+import itertools
+
+import pytest
+
+from scheduling import ACT_OFF, SequenceRule, parse_rule, parse_rules
+
+
+@pytest.mark.parametrize("line, kind, activity, value, then, over", [
+    ("max_run Téléphone 6", "max_run", "Téléphone", 6, None, "shifts"),
+    ("forbid Impayés -> Réclamation", "forbid", "Impayés", None, "Réclamation", "shifts"),
+    ("spacing Téléphone 2 on fridays", "spacing", "Téléphone", 2, None, "fridays"),
+    ("max_run 0 3", "max_run", 0, 3, None, "shifts"),
+    ("forbid 3 -> 1 on fridays", "forbid", 3, None, 1, "fridays"),
+    ("max_run 'Appels sortants' 2", "max_run", "Appels sortants", 2, None, "shifts"),
+])
+def test_parse_rule(line, kind, activity, value, then, over):
+    rule = parse_rule(line)
+    assert (rule.kind, rule.activity, rule.value, rule.then, rule.over) == (kind, activity, value, then, over)
+    assert parse_rule(rule.to_text()).to_text() == rule.to_text()
+
+
+@pytest.mark.parametrize("line", [
+    "max_run Téléphone",
+    "forbid Impayés Réclamation",
+    "spacing Téléphone 2 on mondays",
+    "max_run Téléphone 0",
+    "ban Téléphone 2",
+    "",
+])
+def test_parse_rule_errors(line):
+    with pytest.raises(ValueError):
+        parse_rule(line)
+
+
+def test_rule_errors():
+    with pytest.raises(ValueError):
+        SequenceRule("forbid", 0)
+    with pytest.raises(ValueError):
+        SequenceRule("spacing", 0, value=-1)
+
+
+def test_parse_rules():
+    text = """
+    # Rotation
+    max_run 0 3      # three days at most
+    forbid 1 -> 2
+    """
+    rules = parse_rules(text)
+    assert [rule.to_text() for rule in rules] == ["max_run 0 3", "forbid 1 -> 2"]
+    rule = SequenceRule("spacing", 0, 2)
+    assert parse_rules(["spacing 0 2", rule])[1] is rule
+    assert parse_rules(None) == []
+
+
+def walk(rule, values, activity, then):
+    """States of the automaton of `rule` along `values`, None from the first forbidden label."""
+    transitions = {(state, label): target for state, label, target in
+                   rule.automaton([ACT_OFF, 0, 1, 2], activity, then)}
+    state, states = 0, []
+    for value in values:
+        state = transitions.get((state, value))
+        if state is None:
+            return None
+        states.append(state)
+    return states
+
+
+def violates(rule, values, activity, then):
+    """The rule checked directly on the sequence."""
+    if rule.kind == "forbid":
+        return any(a == activity and b == then for a, b in zip(values, values[1:]))
+    positions = [i for i, value in enumerate(values) if value == activity]
+    if rule.kind == "spacing":
+        return any(j - i < rule.value for i, j in zip(positions, positions[1:]))
+    run = 0
+    for value in values:
+        run = run + 1 if value == activity else 0
+        if run > rule.value:
+            return True
+    return False
+
+
+@pytest.mark.parametrize("rule", [
+    SequenceRule("max_run", 0, 2),
+    SequenceRule("spacing", 0, 3),
+    SequenceRule("forbid", 0, then=1),
+])
+def test_automaton(rule):
+    then = 1 if rule.kind == "forbid" else None
+    assert rule.num_states() == {"max_run": 3, "spacing": 3, "forbid": 2}[rule.kind]
+    for values in itertools.product([ACT_OFF, 0, 1, 2], repeat=5):
+        assert (walk(rule, values, 0, then) is not None) != violates(rule, values, 0, then)
+
+
+@pytest.mark.parametrize("rule", [
+    SequenceRule("max_run", 0, 2),
+    SequenceRule("spacing", 0, 3),
+    SequenceRule("forbid", 0, then=1),
+])
+def test_state_after_follows_the_automaton(rule):
+    then = 1 if rule.kind == "forbid" else None
+    for values in itertools.product([ACT_OFF, 0, 1, 2], repeat=4):
+        states = walk(rule, values, 0, then)
+        if states is None:
+            continue
+        for i, state in enumerate(states):
+            assert rule.state_after(values[:i + 1], 0, then) == state
+
+
+def test_state_after():
+    max_run = SequenceRule("max_run", 0, 3)
+    assert max_run.state_after([0, 0, 1, 0, 0], 0) == 2
+    assert max_run.state_after([0, 0], 0, state=1) == 3
+    # A violation is clamped
+    assert max_run.state_after([0] * 5, 0) == 3
+    spacing = SequenceRule("spacing", 0, 3)
+    assert spacing.state_after([1, 0], 0) == 2
+    assert spacing.state_after([0, 1, 1, 1], 0) == 0
+    forbid = SequenceRule("forbid", 2, then=1)
+    assert forbid.state_after([2], 2, 1) == 1
+    assert forbid.state_after([2, ACT_OFF], 2, 1) == 0
@@ -0,0 +1,103 @@
+import json
+
+import numpy as np
+import pytest
+from conftest import make_params
+from ortools.sat.python import cp_model
+
+from scheduling import (ACT_OFF, RosterModelBuilder, RosterSolution, load_archive, load_planning_done, save_archive,
+                        save_planning_done, save_raw)
+
+
+def solutions():
+    grid = np.zeros((10, 3), dtype=np.int8)
+    grid[:, 1] = 1
+    grid[2, 2] = ACT_OFF
+    other = grid.copy()
+    other[0, 0], other[5, 1] = 2, 0
+    return [RosterSolution(g, ["A", "B", "C"], ["Tél", "Rens", "Imp"], {"seed": i}) for i, g in enumerate((grid, other))]
+
+
+def test_solution():
+    first, second = solutions()
+    assert first.grid.dtype == np.int8 and first.grid.flags.c_contiguous
+    assert (first.num_shifts, first.num_employees) == (10, 3)
+    assert first.distance(second) == 2
+    assert first.distance(second.grid) == 2
+    assert first.diff(second) == [(0, 0, 0, 2), (5, 1, 1, 0)]
+    assert first.label(ACT_OFF) == "Off" and first.label(1) == "Rens"
+    assert first == RosterSolution(first.grid.copy()) and first != second
+    assert len({first, RosterSolution(first.grid.copy()), second}) == 2
+    assert RosterSolution(np.zeros((2, 4))).employees == ["0", "1", "2", "3"]
+    with pytest.raises(ValueError):
+        RosterSolution(np.zeros(5))
+
+
+def test_from_builder():
+    builder = RosterModelBuilder(make_params(shifts_per_day=2, same_activity_per_day=True))
+    solver = cp_model.CpSolver()
+    assert solver.Solve(builder.build()) == cp_model.OPTIMAL
+    solution = RosterSolution.from_builder(builder, solver, team="A")
+    assert (solution.grid == builder.grid(solver)).all()
+    assert solution.employees == ["Emp0", "Emp1", "Emp2"]
+    assert solution.meta["team"] == "A"
+    assert solution.meta["objective"] == 30
+    assert "created" in solution.meta
+
+
+def test_archive_round_trip(tmp_path):
+    path = str(tmp_path / "plannings.npz")
+    save_archive(path, solutions())
+    loaded = load_archive(path)
+    assert loaded == solutions()
+    assert [s.meta for s in loaded] == [{"seed": 0}, {"seed": 1}]
+    assert loaded[1].employees == ["A", "B", "C"]
+    assert loaded[1].activities == ["Tél", "Rens", "Imp"]
+    with pytest.raises(ValueError):
+        save_archive(path, [])
+
+
+def test_raw_archive_is_memory_mapped(tmp_path):
+    path = str(tmp_path / "plannings")
+    save_raw(path, solutions())
+    loaded = load_archive(path, mmap=True)
+    assert loaded == solutions()
+    # Views on the mapped file, not copies
+    assert isinstance(loaded[0].grid.base, np.memmap)
+    assert loaded[1].meta == {"seed": 1}
+
+
+def test_planning_done_round_trip(tmp_path):
+    params = make_params()
+    grid = solutions()[0].grid
+    path = str(tmp_path / "planning_done.json")
+    save_planning_done(path, grid, shifts=range(3), employees=params.employees, activities=params.activities)
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["planning_done"]["2"] == [0, 1, ACT_OFF]
+    loaded, frozen = load_planning_done(path, params)
+    # The shifts of a planning_done are the published ones
+    assert frozen == [0, 1, 2]
+    assert (loaded[:3] == grid[:3]).all()
+    assert (loaded[3:] == ACT_OFF).all()
+
+
+def test_load_planning_done_sources(tmp_path):
+    params = make_params()
+    # Notebook layout: int keys, 9 for "off"
+    grid, frozen = load_planning_done({0: [0, 1, 9], 1: [2, 2, 2]}, params)
+    assert frozen == [0, 1]
+    assert grid[0].tolist() == [0, 1, ACT_OFF]
+    assert grid[1].tolist() == [2, 2, 2]
+    assert load_planning_done({"0": [0, 1, 2]}, params, frozen_shifts=[])[1] == []
+
+    # A full planning is only a hint, unless published up to a shift
+    solution = solutions()[1]
+    grid, frozen = load_planning_done(solution, params)
+    assert (grid == solution.grid).all() and frozen == []
+    assert load_planning_done(solution.grid, params, published_until=4)[1] == [0, 1, 2, 3]
+    assert load_planning_done(solution.grid, params, published_until=50)[1] == list(range(10))
+
+    path = str(tmp_path / "plannings.npz")
+    save_archive(path, solutions())
+    grid, frozen = load_planning_done(path, params, index=1, frozen_shifts=[5])
+    assert (grid == solution.grid).all() and frozen == [5]
@@ -0,0 +1,138 @@
+import numpy as np
+import pytest
+from conftest import make_params
+from ortools.sat.python import cp_model
+
+from scheduling import (ACT_OFF, RosterModelBuilder, add_distance_cut, add_hint_from_grid, find_diverse_plannings,
+                        load_parameters, new_solver, solve_roster, warm_start_model)
+
+SOLVED = (cp_model.FEASIBLE, cp_model.OPTIMAL)
+
+
+def staffed_builder(encoding="channeled"):
+    """At least one phone and one information desk every day."""
+    return RosterModelBuilder(make_params(min_staff={d: [1, 1, 0] for d in range(5)}), encoding)
+
+
+def test_new_solver():
+    solver = new_solver(time_limit=3.0, num_workers=2, random_seed=7, solver_parameters={"log_search_progress": True})
+    assert solver.parameters.max_time_in_seconds == 3.0
+    assert solver.parameters.num_search_workers == 2
+    assert solver.parameters.random_seed == 7
+    assert solver.parameters.log_search_progress
+
+
+def test_distance_cut_and_hint(encoding):
+    builder = staffed_builder(encoding)
+    model = builder.build().clone()
+    solver = new_solver(10.0, 1)
+    assert solver.Solve(model) in SOLVED
+    first = builder.grid(solver)
+
+    add_distance_cut(builder, first, min_distance=4, model=model)
+    add_hint_from_grid(builder, first, model)
+    assert len(model.Proto().solution_hint.vars) == 3 * len(builder.cells)
+    assert solver.Solve(model) in SOLVED
+    assert (builder.grid(solver) != first).sum() >= 4
+    # The builder's model is left untouched
+    assert not builder.model.Proto().solution_hint.vars
+
+
+def test_find_diverse_plannings(encoding):
+    builder = staffed_builder(encoding)
+    num_constraints = len(builder.build().Proto().constraints)
+    plannings = find_diverse_plannings(builder, 3, min_distance=5, time_limit=10.0, num_workers=1)
+    assert len(plannings) == 3
+    for i, grid in enumerate(plannings):
+        assert ((grid == 0).sum(axis=1) >= 1).all()
+        for other in plannings[:i]:
+            assert (grid != other).sum() >= 5
+    # Cuts and hints go to a clone
+    assert len(builder.model.Proto().constraints) == num_constraints
+
+
+def test_find_diverse_plannings_runs_out():
+    # A single available cell: only 3 distinct plannings
+    available = np.zeros((1, 5), dtype=bool)
+    available[0, 2] = True
+    builder = RosterModelBuilder(make_params(num_employees=1, num_weeks=1, available=available))
+    plannings = find_diverse_plannings(builder, 5, time_limit=10.0, num_workers=1)
+    assert sorted(int(grid[2, 0]) for grid in plannings) == [0, 1, 2]
+
+
+def test_solve_roster_enumerates(encoding):
+    result = solve_roster(staffed_builder(encoding), num_solutions=3, time_limit=10.0, num_workers=1)
+    assert result.found
+    assert len(result.solutions) == 3
+    assert len({grid.tobytes() for grid in result.solutions}) == 3
+    assert result.best.shape == (10, 3)
+    for grid in result.solutions:
+        assert ((grid == 0).sum(axis=1) >= 1).all()
+
+
+def test_solve_roster_optimizes(encoding):
+    builder = RosterModelBuilder(make_params(shifts_per_day=2, same_activity_per_day=True), encoding)
+    result = solve_roster(builder, num_solutions=2, time_limit=10.0, num_workers=1)
+    assert result.status == cp_model.OPTIMAL
+    assert result.objective == 3 * 10
+    assert 1 <= len(result.solutions) <= 2
+    assert (result.best[0::2] == result.best[1::2]).all()
+
+
+def test_solve_roster_infeasible():
+    # Two phones a day with a single employee
+    builder = RosterModelBuilder(make_params(num_employees=1, min_staff={d: [2, 0, 0] for d in range(5)}))
+    result = solve_roster(builder, num_solutions=1, time_limit=10.0, num_workers=1)
+    assert not result.found
+    assert result.best is None
+    assert result.objective is None
+
+
+def test_solve_roster_needs_a_solution():
+    with pytest.raises(ValueError):
+        solve_roster(staffed_builder(), num_solutions=0)
+
+
+def test_solve_roster_on_app_parameters(planning_json):
+    builder = RosterModelBuilder(load_parameters(planning_json))
+    result = solve_roster(builder, num_solutions=1, time_limit=30.0, num_workers=1)
+    assert result.found
+    assert result.best.shape == (20, 14)
+    assert (result.best != ACT_OFF).all()
+
+
+def test_warm_start_model(encoding):
+    builder = staffed_builder(encoding)
+    published = find_diverse_plannings(builder, 1, time_limit=10.0, num_workers=1)[0]
+    grid = published.copy()
+    grid[7:] = ACT_OFF
+    model = warm_start_model(builder, grid, frozen_shifts=range(5))
+    # Hints for the shifts that are not frozen and have an activity, nothing for the others
+    assert len(model.Proto().solution_hint.vars) == 3 * 3 * 2
+    # Cut: the first 5 shifts must change
+    same = [builder.assigned(e, s, int(published[s, e])) for e in range(3) for s in range(5)]
+    model.Add(sum(same) <= len(same) - 1)
+    assert new_solver(10.0, 1).Solve(model) == cp_model.INFEASIBLE
+
+    solver = new_solver(10.0, 1)
+    assert solver.Solve(warm_start_model(builder, grid, frozen_shifts=range(5))) in SOLVED
+    assert (builder.grid(solver)[:5] == published[:5]).all()
+    assert not builder.model.Proto().solution_hint.vars
+
+
+def test_warm_start_keeps_published_days_off(encoding):
+    builder = staffed_builder(encoding)
+    grid = np.full((10, 3), ACT_OFF, dtype=np.int8)
+    grid[0] = [0, 1, 2]
+    # Employee 2 was off on the published shift 1, and is available now
+    grid[1] = [0, 1, ACT_OFF]
+    solver = new_solver(10.0, 1)
+    assert solver.Solve(warm_start_model(builder, grid, frozen_shifts=[0])) in SOLVED
+    assert solver.Solve(warm_start_model(builder, grid, frozen_shifts=[0, 1])) == cp_model.INFEASIBLE
+
+    available = np.ones((3, 10), dtype=bool)
+    available[2, 1] = False
+    builder = RosterModelBuilder(make_params(available=available, min_staff={d: [1, 1, 0] for d in range(5)}),
+                                 encoding)
+    assert solver.Solve(warm_start_model(builder, grid, frozen_shifts=[0, 1])) in SOLVED
+    assert (builder.grid(solver)[:2] == grid[:2]).all()
@@ -0,0 +1,44 @@
+import numpy as np
+
+from scheduling import ACT_OFF, activity_counts, activity_ratios, fairness, stack_plannings
+
+
+def test_stack_plannings():
+    grids = [[[0, 1], [ACT_OFF, 2]], np.array([[1, 1], [0, 0]])]
+    stacked = stack_plannings(grids)
+    assert stacked.dtype == np.int8
+    assert stacked.shape == (2, 2, 2)
+    assert stacked.flags.c_contiguous
+    assert stacked[0, 1, 0] == ACT_OFF
+
+
+def test_activity_counts():
+    # 2 plannings, 4 shifts, 3 employees, 2 activities
+    plannings = np.array([
+        [[0, 1, ACT_OFF], [0, 1, 0], [1, 1, ACT_OFF], [0, 0, 1]],
+        [[1, 1, 1], [1, 0, 1], [ACT_OFF, ACT_OFF, 1], [1, 0, 1]],
+    ], dtype=np.int8)
+    counts = activity_counts(plannings, 2)
+    assert counts.shape == (2, 3, 3)
+    assert counts[0].tolist() == [[3, 1, 0], [1, 3, 0], [1, 1, 2]]
+    assert counts[1].tolist() == [[0, 3, 1], [2, 1, 1], [0, 4, 0]]
+    # A single grid is one planning
+    assert (activity_counts(plannings[0], 2) == counts[:1]).all()
+    # Same as counting cell by cell
+    for a, column in ((0, 0), (1, 1), (ACT_OFF, 2)):
+        assert ((plannings == a).sum(axis=1) == counts[..., column]).all()
+
+
+def test_activity_ratios():
+    counts = np.array([[[3, 1, 0], [0, 0, 4], [1, 1, 2]]])
+    ratios = activity_ratios(counts)
+    assert ratios.shape == (1, 3, 2)
+    assert ratios[0].tolist() == [[75.0, 25.0], [0.0, 0.0], [50.0, 50.0]]
+
+
+def test_fairness():
+    # Employee 2 never works: left out of the spread and the deviation
+    counts = np.array([[[3, 1, 0], [1, 3, 0], [0, 0, 4]]])
+    spread, std = fairness(counts)
+    assert spread.tolist() == [[50.0, 50.0]]
+    assert std.tolist() == [[25.0, 25.0]]